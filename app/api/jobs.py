@@ -1,45 +1,157 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
-from app.db.crud import search_jobs
-from app.schemas.job import JobSchema
+import asyncio
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
+from app.db.crud import LISTING_COLUMNS, search_jobs_page_async
+from app.db.facets import FACETS, count_jobs_async, get_facets_async
+from app.db.pagination import InvalidCursorError
+from app.db.search import tokenize_query
+from app.schemas.job import JobFacetsSchema, JobSchema, dump_job_rows
+from app.services.cache import CACHE_ENABLED, CachedResponse, jobs_cache, make_cache_key_async, make_etag
+from app.services.hot_index import hot_index
+from app.services.normalization import normalize_job_type, normalize_location, split_tags
 from typing import List, Optional
 
-from app.tasks.scrape_tasks import scrape_and_store_jobs
+from app.celery_client import start_scrape, task_result
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def _jobs_cache_params(query, location, job_type, tags, min_salary, cursor, sort, limit, skip) -> dict:
+    # Requests that differ only in case, whitespace or tag order share an entry.
+    return {
+        "query": " ".join(tokenize_query(query)) if query else None,
+        "location": normalize_location(location),
+        "job_type": normalize_job_type(job_type),
+        "tags": sorted(split_tags(tags)),
+        "min_salary": min_salary,
+        "cursor": cursor,
+        "sort": sort,
+        "limit": limit,
+        "skip": skip,
+        # Responses answered by a since-refreshed index must not be reused.
+        "hot_index": hot_index.version if hot_index.ready else None,
+    }
+
 
-@router.get("/jobs", response_model=List[JobSchema])
-def read_jobs(
+def _cached_response(entry: CachedResponse, if_none_match: Optional[str]) -> Response:
+    headers = {"ETag": entry.etag, **entry.headers}
+    if if_none_match and entry.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+@router.get("/jobs", response_model=List[JobSchema], response_class=ORJSONResponse)
+async def read_jobs(
     query: Optional[str] = Query(None),
     location: Optional[str] = Query(None),
     job_type: Optional[str] = Query(None),
     tags: Optional[str] = Query(None),
+    min_salary: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous X-Next-Cursor header"),
+    sort: Optional[str] = Query(None, pattern="^(relevance|date)$"),
     limit: int = 100,
     skip: int = 0,
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return search_jobs(
-        db,
-        query=query,
-        location=location,
-        job_type=job_type,
-        tags=tags,
-        skip=skip,
-        limit=limit
+    cache_key = None
+    if CACHE_ENABLED:
+        cache_key = await make_cache_key_async(
+            "jobs", _jobs_cache_params(query, location, job_type, tags, min_salary, cursor, sort, limit, skip)
+        )
+        entry = await jobs_cache.get_async(cache_key)
+        if entry is not None:
+            return _cached_response(entry, if_none_match)
+
+    try:
+        page = None
+        if hot_index.ready:
+            # Off the event loop: the index lock may be held by a refresh.
+            page = await asyncio.to_thread(
+                hot_index.search,
+                query=query,
+                location=location,
+                job_type=job_type,
+                tags=tags,
+                min_salary=min_salary,
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
+                sort=sort,
+            )
+        rows, next_cursor = page if page is not None else await search_jobs_page_async(
+            db,
+            query=query,
+            location=location,
+            job_type=job_type,
+            tags=tags,
+            min_salary=min_salary,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            columns=LISTING_COLUMNS,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    body = dump_job_rows(rows)
+    entry = CachedResponse(
+        body=body,
+        etag=make_etag(body),
+        headers={"X-Next-Cursor": next_cursor} if next_cursor else {},
     )
+    if cache_key is not None:
+        await jobs_cache.set_async(cache_key, entry)
+    return _cached_response(entry, if_none_match)
+
+@router.get("/jobs/facets", response_model=JobFacetsSchema)
+async def read_job_facets(
+    facets: str = Query(",".join(FACETS), description="Comma-separated: " + ", ".join(FACETS)),
+    limit: int = Query(20, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Job counts per source, job type, location and tag, most frequent first.
+    Read from the job_facets summary, which every save and cleanup keeps
+    current, so this never scans the jobs table.
+    """
+    requested = list(dict.fromkeys(name.strip() for name in facets.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in FACETS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown facets: {', '.join(unknown)}")
+    counts = await get_facets_async(db, requested, limit)
+    return {
+        "total": await count_jobs_async(db),
+        "facets": {
+            name: [{"value": value, "count": count} for value, count in values]
+            for name, values in counts.items()
+        },
+    }
 
 @router.post("/scrape")
 def trigger_scrape(query: str = "job"):
-    scrape_and_store_jobs.delay(query)
-    return {"message": f"Scraping task started for query '{query}'"}
+    task_id, joined = start_scrape(query)
+    if joined:
+        message = f"Scraping task already running for query '{query}'"
+    else:
+        message = f"Scraping task started for query '{query}'"
+    return {"message": message, "task_id": task_id, "status_url": f"/api/scrape/{task_id}"}
+
+@router.get("/scrape/{task_id}")
+def scrape_status(task_id: str):
+    """
+    Polls a scrape started by POST /scrape. Unknown ids report PENDING.
+    """
+    result = task_result(task_id)
+    body = {"task_id": task_id, "status": result.status}
+    if result.successful():
+        body["result"] = result.result
+    elif result.failed():
+        body["error"] = str(result.result)
+    return body
 
 @router.get("/health")
 def health():
@@ -0,0 +1,110 @@
+import asyncio
+import os
+from typing import AsyncIterator, List, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.crud import LISTING_COLUMNS
+from app.db.database import AsyncSessionLocal, get_async_db
+from app.db.saved_searches import (
+    create_saved_search_async,
+    delete_saved_search_async,
+    get_matches_async,
+    get_saved_search_async,
+    list_saved_searches_async,
+)
+from app.schemas.job import JobSchema, dump_job_rows, job_row_item
+from app.schemas.saved_search import SavedSearchCreate, SavedSearchSchema
+
+# How often an event stream checks for new matches, and the most it sends at once.
+SAVED_SEARCH_POLL_SECONDS = float(os.getenv("SAVED_SEARCH_POLL_SECONDS", "5"))
+SAVED_SEARCH_STREAM_BATCH = int(os.getenv("SAVED_SEARCH_STREAM_BATCH", "100"))
+
+router = APIRouter()
+
+
+async def _require_search(db: AsyncSession, search_id: int) -> None:
+    if await get_saved_search_async(db, search_id) is None:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+
+
+@router.post("/saved-searches", response_model=SavedSearchSchema, status_code=201)
+async def create_saved_search(search: SavedSearchCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Saves search criteria. Jobs stored from now on that match them are
+    listed by /matches and pushed by /stream.
+    """
+    return await create_saved_search_async(db, **search.model_dump())
+
+@router.get("/saved-searches", response_model=List[SavedSearchSchema])
+async def read_saved_searches(db: AsyncSession = Depends(get_async_db)):
+    return await list_saved_searches_async(db)
+
+@router.get("/saved-searches/{search_id}", response_model=SavedSearchSchema)
+async def read_saved_search(search_id: int, db: AsyncSession = Depends(get_async_db)):
+    search = await get_saved_search_async(db, search_id)
+    if search is None:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    return search
+
+@router.delete("/saved-searches/{search_id}", status_code=204)
+async def remove_saved_search(search_id: int, db: AsyncSession = Depends(get_async_db)):
+    if not await delete_saved_search_async(db, search_id):
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    return Response(status_code=204)
+
+@router.get("/saved-searches/{search_id}/matches", response_model=List[JobSchema])
+async def read_saved_search_matches(
+    search_id: int,
+    since: int = Query(0, ge=0, description="X-Since header of the previous response; 0 for all matches"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Jobs matched since the last poll, oldest first. Pass the X-Since header
+    of each response as `since` of the next to receive only new matches.
+    """
+    await _require_search(db, search_id)
+    rows = await get_matches_async(db, search_id, LISTING_COLUMNS, since, limit)
+    next_since = rows[-1][0] if rows else since
+    return Response(
+        content=dump_job_rows(row[1:] for row in rows),
+        media_type="application/json",
+        headers={"X-Since": str(next_since)},
+    )
+
+@router.get("/saved-searches/{search_id}/stream")
+async def stream_saved_search_matches(
+    request: Request,
+    search_id: int,
+    since: int = Query(0, ge=0),
+    last_event_id: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Server-sent events: one "job" event per new match, its id being the
+    match id, so a reconnecting client resumes through Last-Event-ID.
+    """
+    await _require_search(db, search_id)
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+
+    async def events(since: int) -> AsyncIterator[bytes]:
+        yield f"retry: {int(SAVED_SEARCH_POLL_SECONDS * 1000)}\n\n".encode()
+        while not await request.is_disconnected():
+            # A session per poll: an idle stream holds no connection.
+            async with AsyncSessionLocal() as poll_db:
+                rows = await get_matches_async(poll_db, search_id, LISTING_COLUMNS, since, SAVED_SEARCH_STREAM_BATCH)
+            for row in rows:
+                since = row[0]
+                yield b"id: %d\nevent: job\ndata: %s\n\n" % (since, orjson.dumps(job_row_item(row[1:])))
+            if len(rows) < SAVED_SEARCH_STREAM_BATCH:
+                yield b": keep-alive\n\n"
+                await asyncio.sleep(SAVED_SEARCH_POLL_SECONDS)
+
+    return StreamingResponse(
+        events(since), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
@@ -0,0 +1,89 @@
+"""
+The publishing side of Celery, for processes that only enqueue tasks and
+poll their results (the API). Tasks are sent by name, so neither the task
+modules nor what they import (scrapers, httpx, numpy) are loaded here, and
+Celery itself is imported on the first send. Workers and beat use
+app.celery_config, which shares these settings.
+"""
+import os
+import sys
+from typing import Any, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from app.services.scrape_coordination import claim_scrape, release_scrape
+
+# Redis URL
+redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Scrapes and database maintenance go to separate queues, each consumed by
+# its own worker profile (see start.sh), so a long cleanup never holds the
+# slots scrapes need. Anything unrouted stays on the default "celery" queue,
+# which both profiles also consume.
+SCRAPE_QUEUE = "scrape"
+MAINTENANCE_QUEUE = "maintenance"
+TASK_ROUTES = {
+    "app.tasks.scrape_tasks.*": {"queue": SCRAPE_QUEUE},
+    "app.tasks.cleanup_tasks.*": {"queue": MAINTENANCE_QUEUE},
+}
+
+# Names of the tasks the API enqueues.
+SCRAPE_AND_STORE_JOBS = "app.tasks.scrape_tasks.scrape_and_store_jobs"
+
+_client = None
+
+
+def get_celery():
+    """
+    A Celery app configured for publishing, created on first use. Inside a
+    worker (or wherever app.celery_config is loaded) that app is returned.
+    """
+    global _client
+    if _client is None:
+        from celery import Celery
+
+        config = sys.modules.get("app.celery_config")
+        if config is not None:
+            _client = config.celery_app
+        else:
+            client = Celery("worker", broker=redis_url, backend=redis_url)
+            client.conf.update(
+                task_serializer='json',
+                accept_content=['json'],
+                result_serializer='json',
+                timezone='UTC',
+                enable_utc=True,
+                task_routes=TASK_ROUTES,
+            )
+            _client = client
+    return _client
+
+
+def send_task(name: str, args: Sequence[Any] = (), task_id: Optional[str] = None, **options: Any):
+    """
+    Enqueues the task registered as `name`. Returns its AsyncResult.
+    """
+    return get_celery().send_task(name, args=list(args), task_id=task_id, **options)
+
+
+def task_result(task_id: str):
+    """
+    The AsyncResult of a task sent earlier, for polling its state.
+    """
+    return get_celery().AsyncResult(task_id)
+
+
+def start_scrape(search_term: str = "job", incremental: bool = True) -> Tuple[str, bool]:
+    """
+    Starts a scrape of `search_term`, or joins the one already in flight for
+    the same query. Returns the scrape's task id and whether it was joined.
+    """
+    task_id = str(uuid4())
+    in_flight = claim_scrape(search_term, task_id)
+    if in_flight is not None:
+        return in_flight, True
+    try:
+        send_task(SCRAPE_AND_STORE_JOBS, (search_term, incremental, task_id))
+    except Exception:
+        release_scrape(search_term, task_id)
+        raise
+    return task_id, False
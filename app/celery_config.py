@@ -1,9 +1,13 @@
 import os
 from celery import Celery
+from celery.concurrency import get_implementation
 from celery.schedules import crontab
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
 
-# Redis URL
-redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+from app.celery_client import TASK_ROUTES, redis_url
+from app.services.metrics import mark_process_dead, start_worker_metrics_server
+from app.services.tracing import configure_tracing, instrument_celery
+from app.services.watchlist import WATCHLIST_TICK_MINUTES
 
 # Celery app
 celery_app = Celery(
@@ -23,19 +27,100 @@ celery_app.conf.update(
 )
 
 celery_app.conf.broker_connection_retry_on_startup = True
+# Scrape tasks run for seconds to minutes and mostly wait on the network.
+# Reserve one task per process at a time, so queued batches go to whichever
+# process is free, and run more processes than cores. Upstream load is capped
+# by the per-source rate limits (app.services.rate_limit), not by concurrency.
+celery_app.conf.worker_prefetch_multiplier = int(os.getenv("CELERY_PREFETCH_MULTIPLIER", "1"))
+celery_app.conf.worker_concurrency = int(
+    os.getenv("CELERY_WORKER_CONCURRENCY", str(max(2 * (os.cpu_count() or 1), 4)))
+)
+
+# Scrapes to the "scrape" queue, cleanups and recounts to "maintenance"
+# (see app.celery_client, which the API publishes through).
+celery_app.conf.task_routes = TASK_ROUTES
+
+# Acknowledge after the task ran, so a worker lost mid-task (OOM, deploy)
+# has its task redelivered instead of dropped. Every task is safe to run
+# twice: jobs are upserted, cleanups and recounts are idempotent.
+celery_app.conf.task_acks_late = True
+celery_app.conf.task_reject_on_worker_lost = True
+# Unacknowledged tasks are redelivered after this long, so it must exceed
+# the longest task plus the longest countdown (watchlist spreading).
+celery_app.conf.broker_transport_options = {
+    "visibility_timeout": int(os.getenv("CELERY_VISIBILITY_TIMEOUT", "7200")),
+}
+# Scrape status stays pollable for this long; the results are small.
+celery_app.conf.result_expires = int(os.getenv("CELERY_RESULT_EXPIRES", "21600"))
+# Recycle prefork processes now and then; bulk upserts grow the heap.
+celery_app.conf.worker_max_tasks_per_child = int(os.getenv("CELERY_MAX_TASKS_PER_CHILD", "200"))
+
+# (soft, hard) time limits in seconds. Celery enforces them in prefork pools
+# only (the maintenance worker, or a single prefork worker for everything).
+# The scrape worker's threads pool has no soft or hard stop: a scrape there
+# is bounded only by its own SCRAPE_SOURCE_TIMEOUT / SCRAPE_TOTAL_TIMEOUT,
+# and a thread stuck outside them is never killed.
+TASK_TIME_LIMITS = {
+    "app.tasks.scrape_tasks.scrape_source": (240, 300),
+    "app.tasks.scrape_tasks.refresh_feed_snapshots": (240, 300),
+    "app.tasks.scrape_tasks.scrape_and_store_jobs": (30, 60),
+    "app.tasks.scrape_tasks.finalize_scrape": (30, 60),
+    "app.tasks.scrape_tasks.schedule_watchlist": (30, 60),
+    "app.tasks.cleanup_tasks.delete_old_jobs": (3300, 3600),
+    "app.tasks.cleanup_tasks.rebuild_job_facets": (900, 1200),
+}
+celery_app.conf.task_annotations = {
+    name: {"soft_time_limit": soft, "time_limit": hard} for name, (soft, hard) in TASK_TIME_LIMITS.items()
+}
 # Periodic task schedule
 celery_app.conf.beat_schedule = {
-    # Scrape every 6 hours
-    "scrape-jobs-every-6-hours": {
-        "task": "app.tasks.scrape_tasks.scrape_and_store_jobs",
-        "schedule": crontab(minute=0, hour='*/6'),
-        "args": ("job",),
+    # Dispatch the watchlist queries that are due (see app.services.watchlist)
+    "schedule-watchlist": {
+        "task": "app.tasks.scrape_tasks.schedule_watchlist",
+        "schedule": crontab(minute=f'*/{WATCHLIST_TICK_MINUTES}'),
+    },
+    # Keep the feed snapshots fresh so query scrapes need no network I/O
+    "refresh-feed-snapshots-every-30-minutes": {
+        "task": "app.tasks.scrape_tasks.refresh_feed_snapshots",
+        "schedule": crontab(minute='*/30'),
     },
     # Delete old jobs once daily at 00:00 UTC
     "delete-old-jobs-daily": {
         "task": "app.tasks.cleanup_tasks.delete_old_jobs",
         "schedule": crontab(minute=0, hour=0),  # Every day at midnight UTC
+    },
+    # Recount the facet summary from scratch, correcting any drift
+    "rebuild-job-facets-daily": {
+        "task": "app.tasks.cleanup_tasks.rebuild_job_facets",
+        "schedule": crontab(minute=30, hour=0),
     }
 }
 
+
+PROCESS_INIT_POOLS = ("celery.concurrency.prefork", "celery.concurrency.solo")
+
+
+# Metrics are served by the worker's main process (CELERY_METRICS_PORT) and
+# aggregated over its pool processes through PROMETHEUS_MULTIPROC_DIR.
+@worker_init.connect
+def _start_metrics_server(sender=None, **kwargs):
+    start_worker_metrics_server()
+    # Only prefork and solo pools send worker_process_init; thread and green
+    # pools run their tasks in this process.
+    if sender is not None and get_implementation(sender.pool_cls).__module__ not in PROCESS_INIT_POOLS:
+        _init_tracing()
+
+
+# Tracer providers do not survive a fork, so each pool process sets up its own.
+@worker_process_init.connect
+def _init_tracing(**kwargs):
+    configure_tracing("job-aggregator-worker")
+    instrument_celery()
+
+
+@worker_process_shutdown.connect
+def _forget_process_metrics(pid=None, **kwargs):
+    mark_process_dead(pid or os.getpid())
+
+
 from app.tasks import scrape_tasks, cleanup_tasks
@@ -1,42 +1,414 @@
-from sqlalchemy import or_
+import os
+from collections import Counter
+from datetime import timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, delete, exists, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db import models
-from app.schemas.job import JobCreate
-from app.db.models import Job
+from app.db.facets import apply_facet_deltas, count_rows
+from app.schemas.job import JOB_LISTING_FIELDS, JobCreate
+from app.db.models import Job, JobLshBand, JobTag
+from app.db.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.db.search import apply_text_search
+from app.services.dedup import band_keys, company_key, is_duplicate, job_features
+from app.services.metrics import SEARCH_SECONDS, stage
+from app.services.normalization import (
+    normalize_job_type,
+    normalize_location,
+    parse_salary_range,
+    split_tags,
+)
+
+# Rows per multi-row INSERT. Kept well under SQLite's bound-parameter limit.
+SAVE_BATCH_SIZE = int(os.getenv("SAVE_BATCH_SIZE", "500"))
+
+# Columns written by the bulk upsert and compared to detect changed rows.
+UPSERT_COLUMNS = (
+    "title",
+    "company_name",
+    "location",
+    "url",
+    "source",
+    "publication_date",
+    "tags",
+    "salary",
+    "job_type",
+)
+
+# Columns computed from UPSERT_COLUMNS by with_filter_columns.
+DERIVED_COLUMNS = ("location_normalized", "job_type_normalized", "salary_min", "salary_max")
+
+# The listing projection: exactly the JobSchema fields, in order, as plain columns.
+LISTING_COLUMNS = tuple(getattr(Job, field) for field in JOB_LISTING_FIELDS)
+
+
+def job_to_row(job: JobCreate) -> Dict[str, Any]:
+    """
+    Converts a validated JobCreate into a column dict for the jobs table.
+    """
+    return {
+        "title": job.title,
+        "company_name": job.company_name,
+        "location": job.location,
+        "url": str(job.url),
+        "source": job.source,
+        "job_id": job.job_id,
+        "publication_date": job.publication_date,
+        "tags": ",".join(job.tags) if job.tags else None,
+        "salary": job.salary,
+        "job_type": job.job_type,
+    }
+
+
+def with_filter_columns(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Adds the normalized location/job_type and parsed salary range used by the
+    indexed filters in search_jobs.
+    """
+    salary_min, salary_max = parse_salary_range(row.get("salary"))
+    return {
+        **row,
+        "location_normalized": normalize_location(row.get("location")),
+        "job_type_normalized": normalize_job_type(row.get("job_type")),
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+    }
+
 
 def create_job(db: Session, job: JobCreate):
     existing_job = db.query(models.Job).filter(models.Job.job_id == job.job_id).first()
     if existing_job:
         return existing_job
 
-    db_job = models.Job(
-        title=job.title,
-        company_name=job.company_name,
-        location=job.location,
-        url=str(job.url),
-        source=job.source,
-        job_id=job.job_id,
-        publication_date=job.publication_date,
-        tags=",".join(job.tags) if job.tags else None,
-        salary=job.salary,
-        job_type=job.job_type,
-    )
+    db_job = models.Job(**with_filter_columns(job_to_row(job)))
+    db_job.tag_rows = [JobTag(tag=tag) for tag in split_tags(db_job.tags)]
     db.add(db_job)
     return db_job
 
 def get_all_jobs(db: Session, skip: int = 0, limit: int = 20):
-    return db.query(models.Job).offset(skip).limit(limit).all()
+    return db.query(models.Job).filter(models.Job.canonical_id.is_(None)).offset(skip).limit(limit).all()
 
 def save_jobs(db: Session, jobs: list[JobCreate]):
-    added = 0
-    for job in jobs:
-        if db.query(models.Job).filter_by(job_id=job.job_id).first():
-            continue
-        create_job(db, job)
-        added += 1
-    return added
+    return bulk_upsert_jobs(db, [job_to_row(job) for job in jobs])["inserted"]
+
+
+def _dialect_insert(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"Bulk upsert is not supported on '{dialect}'.")
+
+
+def _chunks(items: List[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _comparable(value: Any) -> Any:
+    # publication_date is stored without a timezone, so compare naive UTC values.
+    if hasattr(value, "tzinfo") and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _has_changed(existing, row: Dict[str, Any]) -> bool:
+    return any(
+        _comparable(getattr(existing, column)) != _comparable(row.get(column))
+        for column in UPSERT_COLUMNS
+    )
+
+
+def _replace_tags(db: Session, insert, tags_by_pk: Dict[int, List[str]], replace: bool = False) -> None:
+    if replace and tags_by_pk:
+        db.execute(delete(JobTag).where(JobTag.job_pk.in_(list(tags_by_pk))))
+    tag_rows = [{"job_pk": pk, "tag": tag[:128]} for pk, tags in tags_by_pk.items() for tag in tags]
+    if tag_rows:
+        db.execute(insert(JobTag).values(tag_rows).on_conflict_do_nothing())
+
+
+def _replace_lsh_bands(db: Session, insert, keys_by_pk: Dict[int, List[int]], replace: bool = False) -> None:
+    if replace and keys_by_pk:
+        db.execute(delete(JobLshBand).where(JobLshBand.job_pk.in_(list(keys_by_pk))))
+    band_rows = [{"band_key": key, "job_pk": pk} for pk, keys in keys_by_pk.items() for key in set(keys)]
+    if band_rows:
+        # executemany: one cached statement instead of compiling a VALUES list per batch.
+        db.execute(insert(JobLshBand).on_conflict_do_nothing(), band_rows)
+
+
+def _link_duplicates(db: Session, insert, rows_by_pk: Dict[int, Dict[str, Any]]) -> List[int]:
+    """
+    Fingerprints newly inserted jobs and points each near-duplicate at the
+    canonical job it duplicates, checking earlier rows of the same batch too.
+    Candidates come from indexed band-key lookups once per batch, so the cost
+    does not grow with the size of the table. Returns the pks of the
+    duplicates found.
+    """
+    if not rows_by_pk:
+        return []
+
+    fingerprints = {}
+    for pk, row in rows_by_pk.items():
+        features = job_features(row.get("title"), row.get("company_name"), row.get("location"))
+        company = company_key(row.get("company_name"))
+        fingerprints[pk] = (features, company, band_keys(features, company))
+    all_keys = {key for _, _, keys in fingerprints.values() for key in keys}
+
+    # Two point-lookup queries rather than a join, which SQLite would drive
+    # from the (mostly NULL) canonical_id index and turn into a table scan.
+    candidates_by_key: Dict[int, List[int]] = {}
+    for band_key, pk in db.execute(
+        select(JobLshBand.band_key, JobLshBand.job_pk).where(JobLshBand.band_key.in_(list(all_keys)))
+    ):
+        if pk not in rows_by_pk:
+            candidates_by_key.setdefault(band_key, []).append(pk)
+
+    candidate_fingerprints = {}
+    candidate_pks = {pk for pks in candidates_by_key.values() for pk in pks}
+    if candidate_pks:
+        for pk, title, company_name, location in db.execute(
+            select(Job.id, Job.title, Job.company_name, Job.location)
+            .where(Job.id.in_(list(candidate_pks)), Job.canonical_id.is_(None))
+        ):
+            candidate_fingerprints[pk] = (job_features(title, company_name, location), company_key(company_name))
+
+    links = []
+    for pk in sorted(rows_by_pk):
+        features, company, keys = fingerprints[pk]
+        candidates = sorted({
+            candidate for key in keys for candidate in candidates_by_key.get(key, ())
+            if candidate in candidate_fingerprints
+        })
+        canonical = next(
+            (candidate for candidate in candidates
+             if is_duplicate(features, company, *candidate_fingerprints[candidate])),
+            None,
+        )
+        if canonical is not None:
+            links.append({"id": pk, "canonical_id": canonical})
+        else:
+            # A new canonical job: later rows of this batch may duplicate it.
+            candidate_fingerprints[pk] = (features, company)
+            for key in keys:
+                candidates_by_key.setdefault(key, []).append(pk)
+
+    if links:
+        db.execute(update(Job), links)
+    _replace_lsh_bands(db, insert, {pk: keys for pk, (_, _, keys) in fingerprints.items()})
+    return [link["id"] for link in links]
+
+
+def bulk_upsert_jobs(
+    db: Session,
+    rows: Iterable[Dict[str, Any]],
+    batch_size: int = SAVE_BATCH_SIZE,
+    update_existing: bool = False,
+    new_jobs: Optional[List[Tuple[int, Dict[str, Any]]]] = None,
+) -> Dict[str, int]:
+    """
+    Inserts job rows in batches with one pre-fetch and one multi-row INSERT per batch.
+
+    Rows whose job_id already exists are skipped, or rewritten with
+    INSERT ... ON CONFLICT DO UPDATE when update_existing is set and their
+    content changed. New jobs that are near-duplicates of a stored job (the
+    same posting on another board) are inserted but linked to it through
+    canonical_id. The job_facets counts of canonical jobs are adjusted in
+    the same transaction. Returns inserted/updated/skipped/duplicates counts.
+    If `new_jobs` is given, (pk, row) of every inserted canonical job is
+    appended to it. The caller commits.
+    """
+    insert = _dialect_insert(db)
+    counts = {"inserted": 0, "updated": 0, "skipped": 0, "duplicates": 0}
+    facet_deltas: Counter = Counter()
+
+    for batch in _chunks(list(rows), batch_size):
+        unique_rows: Dict[str, Dict[str, Any]] = {}
+        for row in batch:
+            if row["job_id"] in unique_rows:
+                counts["skipped"] += 1
+                continue
+            unique_rows[row["job_id"]] = row
+
+        existing = {
+            record.job_id: record
+            for record in db.execute(
+                select(Job.id, Job.job_id, Job.canonical_id, *(getattr(Job, column) for column in UPSERT_COLUMNS))
+                .where(Job.job_id.in_(list(unique_rows)))
+            )
+        }
+
+        new_rows = [
+            with_filter_columns(row) for job_id, row in unique_rows.items() if job_id not in existing
+        ]
+        changed_rows = []
+        for job_id, record in existing.items():
+            if update_existing and _has_changed(record, unique_rows[job_id]):
+                changed_rows.append(with_filter_columns(unique_rows[job_id]))
+            else:
+                counts["skipped"] += 1
+
+        if new_rows:
+            # DO NOTHING also absorbs url collisions and rows inserted concurrently.
+            inserted = db.execute(
+                insert(Job).values(new_rows).on_conflict_do_nothing().returning(Job.id, Job.job_id)
+            ).all()
+            counts["inserted"] += len(inserted)
+            counts["skipped"] += len(new_rows) - len(inserted)
+            _replace_tags(db, insert, {pk: split_tags(unique_rows[job_id].get("tags")) for pk, job_id in inserted})
+            duplicates = set(_link_duplicates(db, insert, {pk: unique_rows[job_id] for pk, job_id in inserted}))
+            counts["duplicates"] += len(duplicates)
+            canonical_jobs = [(pk, unique_rows[job_id]) for pk, job_id in inserted if pk not in duplicates]
+            facet_deltas.update(count_rows(row for _, row in canonical_jobs))
+            if new_jobs is not None:
+                new_jobs.extend(canonical_jobs)
+
+        if changed_rows:
+            stmt = insert(Job).values(changed_rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Job.job_id],
+                set_={column: stmt.excluded[column] for column in UPSERT_COLUMNS + DERIVED_COLUMNS},
+            )
+            db.execute(stmt)
+            counts["updated"] += len(changed_rows)
+            canonical = [row for row in changed_rows if existing[row["job_id"]].canonical_id is None]
+            facet_deltas.update(count_rows((existing[row["job_id"]]._mapping for row in canonical), sign=-1))
+            facet_deltas.update(count_rows(canonical))
+            _replace_tags(
+                db,
+                insert,
+                {existing[row["job_id"]].id: split_tags(row.get("tags")) for row in changed_rows},
+                replace=True,
+            )
+            _replace_lsh_bands(
+                db,
+                insert,
+                {
+                    existing[row["job_id"]].id: band_keys(
+                        job_features(row.get("title"), row.get("company_name"), row.get("location")),
+                        company_key(row.get("company_name")),
+                    )
+                    for row in changed_rows
+                },
+                replace=True,
+            )
+
+    apply_facet_deltas(db, facet_deltas)
+    return counts
+
 
 
+def build_search_statement(
+    dialect: str,
+    query=None,
+    location=None,
+    job_type=None,
+    tags=None,
+    min_salary=None,
+    skip=0,
+    limit=20,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    columns: Optional[Sequence[Any]] = None,
+) -> Tuple[Select, bool]:
+    """
+    Builds the SELECT for one page of jobs, shared by the sync and async
+    sessions. Returns the statement and whether it is date-paginated, in which
+    case it fetches one extra row to detect the next page (see finish_page).
+    With `columns` it selects those plain columns instead of Job entities.
+
+    Results are ordered by relevance when searching by text, and by
+    (publication_date, id) descending otherwise or when sort="date". Date-ordered
+    pages can be continued with a cursor, which seeks on the composite index
+    instead of skipping rows; skip is kept for legacy clients.
+    """
+    if sort is None:
+        sort = "date" if cursor or not query else "relevance"
+    if cursor and sort != "date":
+        raise InvalidCursorError("Cursors are only supported with sort=date.")
+
+    stmt = select(*columns) if columns else select(Job)
+    stmt = stmt.where(Job.canonical_id.is_(None))
+
+    if query:
+        stmt = apply_text_search(stmt, Job, dialect, query, rank=sort == "relevance")
+
+    stmt = apply_filters(stmt, location, job_type, tags, min_salary)
+
+    if sort != "date":
+        return stmt.offset(skip).limit(limit), False
+
+    if cursor:
+        publication_date, job_pk = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Job.publication_date, Job.id) < (publication_date, job_pk))
+
+    stmt = stmt.order_by(Job.publication_date.desc(), Job.id.desc()).offset(skip).limit(limit + 1)
+    return stmt, True
+
+
+def finish_page(jobs: List[Any], limit: int, paginated: bool) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trims the look-ahead row of a date-paginated page and encodes the cursor.
+    """
+    if not paginated or len(jobs) <= limit:
+        return jobs, None
+    jobs = jobs[:limit]
+    return jobs, encode_cursor(jobs[-1].publication_date, jobs[-1].id)
+
+
+def search_jobs_page(
+    db: Session,
+    query=None,
+    location=None,
+    job_type=None,
+    tags=None,
+    min_salary=None,
+    skip=0,
+    limit=20,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    columns: Optional[Sequence[Any]] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Returns one page of jobs and the cursor for the next page. With `columns`
+    the page holds rows of those columns (e.g. LISTING_COLUMNS) instead of Job objects.
+    """
+    stmt, paginated = build_search_statement(
+        db.get_bind().dialect.name, query, location, job_type, tags, min_salary, skip, limit, cursor, sort, columns
+    )
+    with stage("search_jobs", SEARCH_SECONDS, mode="text" if query else "listing"):
+        result = db.execute(stmt)
+        rows = list(result if columns else result.scalars())
+    return finish_page(rows, limit, paginated)
+
+
+async def search_jobs_page_async(
+    db: AsyncSession,
+    query=None,
+    location=None,
+    job_type=None,
+    tags=None,
+    min_salary=None,
+    skip=0,
+    limit=20,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    columns: Optional[Sequence[Any]] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    search_jobs_page on an AsyncSession, for handlers running on the event loop.
+    """
+    stmt, paginated = build_search_statement(
+        db.get_bind().dialect.name, query, location, job_type, tags, min_salary, skip, limit, cursor, sort, columns
+    )
+    with stage("search_jobs", SEARCH_SECONDS, mode="text" if query else "listing"):
+        result = await db.execute(stmt)
+        rows = list(result if columns else result.scalars())
+    return finish_page(rows, limit, paginated)
+
 
 def search_jobs(
     db: Session,
@@ -48,19 +420,47 @@ def search_jobs(
     skip=0,
     limit=20
 ):
-    jobs_query = db.query(Job)
+    jobs, _ = search_jobs_page(
+        db,
+        query=query,
+        location=location,
+        job_type=job_type,
+        tags=tags,
+        min_salary=min_salary,
+        skip=skip,
+        limit=limit,
+    )
+    return jobs
 
-    if query:
+
+def _prefix_upper_bound(prefix: str) -> str:
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def apply_filters(jobs_query, location=None, job_type=None, tags=None, min_salary=None):
+    """
+    Applies the structured filters. Each maps onto an indexed column: location
+    is a prefix range over location_normalized, job_type an equality on
+    job_type_normalized, every tag an EXISTS probe on job_tags(tag, job_pk) and
+    min_salary a range over salary_max.
+    """
+    location_prefix = normalize_location(location)
+    if location_prefix:
         jobs_query = jobs_query.filter(
-            or_(
-                Job.title.ilike(f"%{query}%"),
-                Job.company_name.ilike(f"%{query}%"),
-                Job.location.ilike(f"%{query}%"),
-                Job.tags.ilike(f"%{query}%"),
-                Job.job_type.ilike(f"%{query}%"),
-                Job.salary.ilike(f"%{query}%"),
-                Job.source.ilike(f"%{query}%"),
-            )
+            Job.location_normalized >= location_prefix,
+            Job.location_normalized < _prefix_upper_bound(location_prefix),
         )
 
-    return jobs_query.offset(skip).limit(limit).all()
+    normalized_job_type = normalize_job_type(job_type)
+    if normalized_job_type:
+        jobs_query = jobs_query.filter(Job.job_type_normalized == normalized_job_type)
+
+    for tag in split_tags(tags):
+        jobs_query = jobs_query.filter(
+            exists().where(JobTag.tag == tag, JobTag.job_pk == Job.id)
+        )
+
+    if min_salary is not None:
+        jobs_query = jobs_query.filter(Job.salary_max >= min_salary)
+
+    return jobs_query
@@ -0,0 +1,138 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, delete, func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.models import Job, JobFacet, JobTag
+from app.services.normalization import normalize_job_type, normalize_location, split_tags
+
+# Facets and the job column each is counted on ("tag" comes from job_tags).
+FACET_COLUMNS = {
+    "source": Job.source,
+    "job_type": Job.job_type_normalized,
+    "location": Job.location_normalized,
+}
+FACETS = tuple(FACET_COLUMNS) + ("tag",)
+
+
+def facet_values(row: Mapping[str, Any]) -> List[Tuple[str, str]]:
+    """
+    The (facet, value) pairs a job counts towards, from its raw columns.
+    """
+    values = [
+        ("source", row.get("source")),
+        ("job_type", normalize_job_type(row.get("job_type"))),
+        ("location", normalize_location(row.get("location"))),
+    ]
+    # Tags as _replace_tags stores them: truncated, then de-duplicated.
+    values.extend(("tag", tag) for tag in dict.fromkeys(tag[:128] for tag in split_tags(row.get("tags"))))
+    return [(facet, value[:512]) for facet, value in values if value]
+
+
+def count_rows(rows: Iterable[Mapping[str, Any]], sign: int = 1) -> Counter:
+    deltas: Counter = Counter()
+    for row in rows:
+        for key in facet_values(row):
+            deltas[key] += sign
+    return deltas
+
+
+def _counts_where(db: Session, condition) -> Counter:
+    counts: Counter = Counter()
+    for facet, column in FACET_COLUMNS.items():
+        for value, count in db.execute(
+            select(column, func.count()).where(condition, column.is_not(None)).group_by(column)
+        ):
+            counts[(facet, value)] += count
+    for tag, count in db.execute(
+        select(JobTag.tag, func.count()).join(Job, Job.id == JobTag.job_pk).where(condition).group_by(JobTag.tag)
+    ):
+        counts[("tag", tag)] += count
+    return counts
+
+
+def deletion_deltas(db: Session, deleted_ids: Select) -> Counter:
+    """
+    Facet changes of deleting the jobs whose ids `deleted_ids` selects:
+    those that are canonical stop counting, and their surviving duplicates,
+    promoted to canonical by ON DELETE SET NULL, start counting. Call it in
+    the deleting transaction, before the delete.
+    """
+    ids = deleted_ids.correlate(None)
+    deltas = Counter(_counts_where(db, Job.id.in_(ids) & Job.canonical_id.is_(None)))
+    deltas = Counter({key: -count for key, count in deltas.items()})
+    deltas.update(_counts_where(db, Job.canonical_id.in_(ids) & Job.id.not_in(ids)))
+    return deltas
+
+
+def _dialect_insert(db: Session):
+    dialect = db.get_bind().dialect.name
+    return postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+
+def apply_facet_deltas(db: Session, deltas: Mapping[Tuple[str, str], int]) -> None:
+    """
+    Adds `deltas` to the stored counts in the caller's transaction, so they
+    commit (or roll back) together with the job changes they describe.
+    """
+    changes = sorted((key, delta) for key, delta in deltas.items() if delta)
+    if not changes:
+        return
+    insert = _dialect_insert(db)
+    stmt = insert(JobFacet).values([{"facet": facet, "value": value, "count": delta} for (facet, value), delta in changes])
+    # Sorted keys: concurrent writers lock rows in the same order.
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[JobFacet.facet, JobFacet.value],
+        set_={"count": JobFacet.count + stmt.excluded.count},
+    ))
+    if any(delta < 0 for _, delta in changes):
+        db.execute(delete(JobFacet).where(JobFacet.facet.in_(FACETS), JobFacet.count <= 0))
+
+
+def rebuild_facets(db: Session) -> int:
+    """
+    Recomputes every count from the jobs table. Used to fill the summary
+    for existing data and to repair drift; the caller commits.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Writers apply their deltas after this commits, or had committed
+        # them (and their jobs) before the lock was granted.
+        db.execute(text("LOCK TABLE job_facets IN EXCLUSIVE MODE"))
+    counts = _counts_where(db, Job.canonical_id.is_(None))
+    db.execute(delete(JobFacet))
+    rows = [{"facet": facet, "value": value, "count": count} for (facet, value), count in sorted(counts.items())]
+    for start in range(0, len(rows), 500):
+        db.execute(_dialect_insert(db)(JobFacet).values(rows[start:start + 500]))
+    return len(rows)
+
+
+async def get_facets_async(
+    db: AsyncSession, facets: Sequence[str] = FACETS, limit: int = 20
+) -> Dict[str, List[Tuple[str, int]]]:
+    """
+    The `limit` most frequent values of each facet, most frequent first.
+    Each facet is one range read of ix_job_facets_facet_count.
+    """
+    result: Dict[str, List[Tuple[str, int]]] = {}
+    for facet in facets:
+        rows = await db.execute(
+            select(JobFacet.value, JobFacet.count)
+            .where(JobFacet.facet == facet, JobFacet.count > 0)
+            .order_by(JobFacet.count.desc(), JobFacet.value)
+            .limit(limit)
+        )
+        result[facet] = [(value, count) for value, count in rows]
+    return result
+
+
+async def count_jobs_async(db: AsyncSession) -> int:
+    """
+    Number of canonical jobs: every one has exactly one source.
+    """
+    total: Optional[int] = await db.scalar(
+        select(func.sum(JobFacet.count)).where(JobFacet.facet == "source")
+    )
+    return int(total or 0)
@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import BigInteger, Column, ForeignKey, Index, Integer, String, DateTime, Text, event, text
+from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime, timezone
 
+from app.db.search import install_search_index
+
 Base = declarative_base()
 
 class Job(Base):
@@ -13,9 +16,142 @@ class Job(Base):
     location = Column(Text, nullable=True)
     url = Column(Text, nullable=False, unique=True)
     source = Column(String(512), nullable=False)
-    job_id = Column(String(512), nullable=False, index=True)
+    job_id = Column(String(512), nullable=False, unique=True, index=True)
     publication_date = Column(DateTime, nullable=False)
     tags = Column(Text, nullable=True)
     salary = Column(Text, nullable=True)
     job_type = Column(String(512), nullable=True)
     scraped_at = Column(DateTime, default=datetime.now(timezone.utc), nullable=False)
+
+    # Filter columns derived from the raw fields above on write.
+    location_normalized = Column(String(512), nullable=True)
+    job_type_normalized = Column(String(64), nullable=True)
+    salary_min = Column(Integer, nullable=True)
+    salary_max = Column(Integer, nullable=True)
+
+    # Set when this job is a near-duplicate of another posting (usually the
+    # same listing on a different board); listings only show canonical jobs.
+    # Deleting the canonical job promotes its duplicates back to canonical.
+    canonical_id = Column(Integer, ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True)
+
+    tag_rows = relationship("JobTag", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_jobs_publication_date_id", "publication_date", "id"),
+        Index("ix_jobs_location_normalized_publication_date", "location_normalized", "publication_date"),
+        Index("ix_jobs_job_type_normalized_publication_date", "job_type_normalized", "publication_date"),
+        Index("ix_jobs_job_type_normalized_location_normalized", "job_type_normalized", "location_normalized"),
+        Index("ix_jobs_salary_max", "salary_max"),
+        # Partial, so that listings filtering on canonical_id IS NULL keep
+        # walking ix_jobs_publication_date_id instead of sorting every
+        # canonical row; it still serves the ON DELETE SET NULL lookups.
+        Index(
+            "ix_jobs_canonical_id",
+            "canonical_id",
+            postgresql_where=text("canonical_id IS NOT NULL"),
+            sqlite_where=text("canonical_id IS NOT NULL"),
+        ),
+    )
+
+
+class JobTag(Base):
+    __tablename__ = "job_tags"
+
+    job_pk = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(128), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_job_tags_tag_job_pk", "tag", "job_pk"),
+    )
+
+
+class JobLshBand(Base):
+    """
+    MinHash LSH band keys of a job's normalized (title, company, location).
+    Jobs sharing a band key are near-duplicate candidates.
+    """
+    __tablename__ = "job_lsh_bands"
+
+    band_key = Column(BigInteger, primary_key=True, autoincrement=False)
+    job_pk = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_job_lsh_bands_job_pk", "job_pk"),
+    )
+
+
+class JobFacet(Base):
+    """
+    Number of canonical jobs per facet value (source, job_type, location,
+    tag), kept up to date by the writes that change them. Serves facet
+    counts without scanning jobs.
+    """
+    __tablename__ = "job_facets"
+
+    facet = Column(String(16), primary_key=True)
+    value = Column(String(512), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_job_facets_facet_count", "facet", "count"),
+    )
+
+
+class SavedSearch(Base):
+    """
+    Search criteria, with the meaning of GET /api/jobs's parameters, that
+    newly stored jobs are matched against as they are saved.
+    """
+    __tablename__ = "saved_searches"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(255), nullable=True)
+    query = Column(String(512), nullable=True)
+    location = Column(String(512), nullable=True)
+    job_type = Column(String(64), nullable=True)
+    tags = Column(String(512), nullable=True)
+    min_salary = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+
+    # Ids are never reused, so (count, max id) identifies the set of searches.
+    __table_args__ = {"sqlite_autoincrement": True}
+
+
+class SavedSearchMatch(Base):
+    """
+    A job that matched a saved search when it was stored. `id` increases with
+    every match, so it doubles as the "since" cursor of the match feed.
+    """
+    __tablename__ = "saved_search_matches"
+
+    id = Column(Integer, primary_key=True)
+    saved_search_id = Column(Integer, ForeignKey("saved_searches.id", ondelete="CASCADE"), nullable=False)
+    job_pk = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
+    matched_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_saved_search_matches_search_id", "saved_search_id", "id"),
+        Index("ix_saved_search_matches_search_job", "saved_search_id", "job_pk", unique=True),
+        Index("ix_saved_search_matches_job_pk", "job_pk"),
+    )
+
+
+class SourceState(Base):
+    """
+    Per source and query: conditional-GET validators and the publication-date
+    high-watermark of the last successful scrape.
+    """
+    __tablename__ = "source_states"
+
+    source = Column(String(64), primary_key=True)
+    query = Column(String(512), primary_key=True)
+    etag = Column(Text, nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    watermark = Column(DateTime, nullable=True)
+    watermark_job_id = Column(String(512), nullable=True)
+    updated_at = Column(DateTime, nullable=False)
+
+
+@event.listens_for(Job.__table__, "after_create")
+def _create_search_index(target, connection, **kw):
+    install_search_index(connection)
@@ -0,0 +1,27 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(publication_date: datetime, job_pk: int) -> str:
+    """
+    Encodes the (publication_date, id) keyset position of the last row on a
+    page as an opaque, URL-safe token.
+    """
+    payload = json.dumps([publication_date.isoformat(), job_pk], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        publication_date, job_pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(publication_date), int(job_pk)
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
@@ -0,0 +1,131 @@
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.models import Job, SavedSearch, SavedSearchMatch
+from app.db.search import apply_text_search, indexed_terms, stem_terms, term_frequencies
+from app.services.saved_search_matcher import SavedSearchMatcher, SearchCriteria
+
+# Match rows per executemany INSERT.
+MATCH_BATCH_SIZE = 1000
+
+# The matcher of this process and the (count, max id) of the searches it
+# was built from; rebuilt when that changes.
+_matcher: Optional[Tuple[Tuple[int, Optional[int]], SavedSearchMatcher]] = None
+
+
+def get_matcher(db: Session) -> SavedSearchMatcher:
+    global _matcher
+    version = tuple(db.execute(select(func.count(), func.max(SavedSearch.id))).one())
+    if _matcher is None or _matcher[0] != version:
+        searches = db.execute(select(SavedSearch)).scalars().all() if version[0] else []
+        criteria = [SearchCriteria.from_search(search) for search in searches]
+        # Every distinct term stemmed in one round trip, as the search stems it.
+        terms = list(dict.fromkeys(term for item in criteria for term in item.terms))
+        stems = stem_terms(db, terms)
+        if stems is not None:
+            stemmed = dict(zip(terms, stems))
+            criteria = [replace(item, stems=tuple(stemmed[term] for term in item.terms)) for item in criteria]
+        tokens = {token for item in criteria for stem in item.stems or () for token in stem}
+        _matcher = (version, SavedSearchMatcher(criteria, term_frequencies(db, tokens)))
+    return _matcher[1]
+
+
+def _confirm_query(db: Session, criteria: SearchCriteria, job_pks: List[int]) -> Set[int]:
+    """
+    The jobs among `job_pks` that the search's query finds, asked of the
+    same full-text search GET /api/jobs uses, stemming included.
+    """
+    stmt = apply_text_search(
+        select(Job.id).where(Job.id.in_(job_pks)), Job, db.get_bind().dialect.name, criteria.query, rank=False
+    )
+    return set(db.scalars(stmt))
+
+
+def record_matches(db: Session, new_jobs: Sequence[Tuple[int, Dict[str, Any]]]) -> int:
+    """
+    Matches newly stored, committed jobs, as (pk, row) pairs, against every
+    saved search and records the matches. The batch's indexed terms are
+    read from the full-text index once, and the searches are matched in
+    memory against them and the structured filters. Only searches hit by
+    some job whose query the stemmed terms cannot decide are confirmed by a
+    full-text query. Returns the number recorded; the caller commits.
+    """
+    if not new_jobs:
+        return 0
+    matcher = get_matcher(db)
+    if not len(matcher):
+        return 0
+    tokens: Dict[int, Set[str]] = {}
+    for pk, term in indexed_terms(db, [pk for pk, _ in new_jobs]):
+        tokens.setdefault(pk, set()).add(term)
+    candidates: Dict[int, List[int]] = {}
+    for pk, row in new_jobs:
+        for search_id in matcher.match(row, tokens.get(pk, frozenset())):
+            candidates.setdefault(search_id, []).append(pk)
+    matched: List[Tuple[int, int]] = []
+    for search_id, job_pks in candidates.items():
+        criteria = matcher.searches[search_id]
+        if criteria.terms and criteria.term_prefixes is None:
+            found = _confirm_query(db, criteria, job_pks)
+            job_pks = [pk for pk in job_pks if pk in found]
+        matched.extend((pk, search_id) for pk in job_pks)
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    # Ordered by job so a search's feed lists a batch's jobs in insertion order.
+    match_rows = [
+        {"saved_search_id": search_id, "job_pk": pk, "matched_at": now}
+        for pk, search_id in sorted(matched)
+    ]
+    if not match_rows:
+        return 0
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    # DO NOTHING: a search deleted meanwhile, or a job matched twice.
+    stmt = insert(SavedSearchMatch).on_conflict_do_nothing()
+    for start in range(0, len(match_rows), MATCH_BATCH_SIZE):
+        db.execute(stmt, match_rows[start:start + MATCH_BATCH_SIZE])
+    return len(match_rows)
+
+
+async def create_saved_search_async(db: AsyncSession, **criteria: Any) -> SavedSearch:
+    search = SavedSearch(**criteria, created_at=datetime.now(timezone.utc).replace(tzinfo=None))
+    db.add(search)
+    await db.commit()
+    return search
+
+
+async def list_saved_searches_async(db: AsyncSession) -> List[SavedSearch]:
+    return list((await db.execute(select(SavedSearch).order_by(SavedSearch.id))).scalars())
+
+
+async def get_saved_search_async(db: AsyncSession, search_id: int) -> Optional[SavedSearch]:
+    return await db.get(SavedSearch, search_id)
+
+
+async def delete_saved_search_async(db: AsyncSession, search_id: int) -> bool:
+    # Matches go with it through ON DELETE CASCADE.
+    result = await db.execute(delete(SavedSearch).where(SavedSearch.id == search_id))
+    await db.commit()
+    return result.rowcount > 0
+
+
+async def get_matches_async(
+    db: AsyncSession, search_id: int, columns: Sequence[Any], since: int = 0, limit: int = 100
+) -> List[Any]:
+    """
+    The jobs matched by a saved search after match id `since`, oldest first,
+    as rows of (match id, *columns). A range read of the (search, id) index.
+    """
+    result = await db.execute(
+        select(SavedSearchMatch.id, *columns)
+        .join(Job, Job.id == SavedSearchMatch.job_pk)
+        .where(SavedSearchMatch.saved_search_id == search_id, SavedSearchMatch.id > since)
+        .order_by(SavedSearchMatch.id)
+        .limit(limit)
+    )
+    return result.all()
@@ -0,0 +1,241 @@
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, column, func, literal_column, or_, table, text
+
+# Columns covered by full-text search, highest weight first.
+SEARCH_COLUMNS = ("title", "company_name", "tags", "location", "job_type", "salary", "source")
+
+# bm25 column weights for SQLite, in SEARCH_COLUMNS order.
+SQLITE_BM25_WEIGHTS = (10.0, 5.0, 5.0, 2.0, 1.0, 1.0, 1.0)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+jobs_fts = table("jobs_fts", column("rowid"))
+
+_POSTGRES_DDL = [
+    """
+    ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(company_name, '') || ' ' || coalesce(tags, '')), 'B') ||
+        setweight(to_tsvector('english'::regconfig,
+            coalesce(location, '') || ' ' || coalesce(job_type, '') || ' ' ||
+            coalesce(salary, '') || ' ' || coalesce(source, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING GIN (search_vector)",
+]
+
+# FTS5 tokenizer of jobs_fts, shared by the scratch table below.
+_SQLITE_TOKENIZER = "porter unicode61"
+
+_SQLITE_COLUMNS = ", ".join(SEARCH_COLUMNS)
+_SQLITE_NEW = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+_SQLITE_OLD = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+
+_SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        {_SQLITE_COLUMNS}, content='jobs', content_rowid='id', tokenize='{_SQLITE_TOKENIZER}'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, {_SQLITE_COLUMNS}) VALUES (new.id, {_SQLITE_NEW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, {_SQLITE_COLUMNS}) VALUES ('delete', old.id, {_SQLITE_OLD});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, {_SQLITE_COLUMNS}) VALUES ('delete', old.id, {_SQLITE_OLD});
+        INSERT INTO jobs_fts(rowid, {_SQLITE_COLUMNS}) VALUES (new.id, {_SQLITE_NEW});
+    END
+    """,
+]
+
+
+# A contentless FTS5 table private to the connection: text written to it is
+# tokenized exactly as jobs_fts tokenizes jobs, and read back through its
+# fts5vocab table. Emptied after every use.
+_SQLITE_SCRATCH_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts_scratch USING fts5(
+        {_SQLITE_COLUMNS}, content='', tokenize='{_SQLITE_TOKENIZER}'
+    )
+    """,
+    "CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts_scratch_terms USING fts5vocab(temp, fts_scratch, instance)",
+]
+
+# The terms of jobs_fts by document, and the number of documents per term.
+_SQLITE_VOCAB_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS temp.jobs_fts_terms USING fts5vocab(main, jobs_fts, instance)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS temp.jobs_fts_rows USING fts5vocab(main, jobs_fts, row)",
+]
+
+
+def install_search_index(connection) -> None:
+    """
+    Creates the full-text search structures for the jobs table. Idempotent.
+
+    PostgreSQL gets a generated, weighted tsvector column with a GIN index.
+    SQLite gets an external-content FTS5 table kept in sync by triggers; it is
+    rebuilt from the jobs table the first time it is created.
+    """
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        for statement in _POSTGRES_DDL:
+            connection.execute(text(statement))
+    elif dialect == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'")
+        ).first()
+        for statement in _SQLITE_DDL:
+            connection.execute(text(statement))
+        if not exists:
+            connection.execute(text("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')"))
+
+
+def tokenize_query(query: str) -> List[str]:
+    return _TOKEN_RE.findall(query.lower())
+
+
+def _tokenize_in_scratch(db, insert, params) -> List[Tuple[int, str]]:
+    """
+    Runs `insert` into temp.fts_scratch and returns its (rowid, term) pairs
+    in token order.
+    """
+    for statement in _SQLITE_SCRATCH_DDL:
+        db.execute(text(statement))
+    try:
+        db.execute(insert, params)
+        return db.execute(text("SELECT doc, term FROM temp.fts_scratch_terms ORDER BY doc, col, offset")).all()
+    finally:
+        db.execute(text("INSERT INTO temp.fts_scratch(fts_scratch) VALUES ('delete-all')"))
+
+
+def indexed_terms(db, job_pks: Optional[Sequence[int]] = None) -> List[Tuple[int, str]]:
+    """
+    (job id, term) for every distinct term the full-text index holds for the
+    jobs in `job_pks`, or for all jobs: the stemmed lexemes of search_vector
+    on PostgreSQL, the FTS5 tokens on SQLite. Empty on other databases.
+    """
+    if job_pks is not None and not job_pks:
+        return []
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = "SELECT id, unnest(tsvector_to_array(search_vector)) FROM jobs"
+        if job_pks is None:
+            return db.execute(text(stmt)).all()
+        return db.execute(
+            text(stmt + " WHERE id IN :ids").bindparams(bindparam("ids", expanding=True)), {"ids": list(job_pks)}
+        ).all()
+    if dialect == "sqlite":
+        if job_pks is None:
+            # One scan of the whole index; fts5vocab cannot seek by document.
+            for statement in _SQLITE_VOCAB_DDL:
+                db.execute(text(statement))
+            return db.execute(text("SELECT DISTINCT doc, term FROM temp.jobs_fts_terms")).all()
+        # Just these jobs, tokenized again as the jobs_fts triggers did.
+        insert = text(
+            f"INSERT INTO temp.fts_scratch(rowid, {_SQLITE_COLUMNS}) "
+            f"SELECT id, {_SQLITE_COLUMNS} FROM jobs WHERE id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True))
+        return list(dict.fromkeys(_tokenize_in_scratch(db, insert, {"ids": list(job_pks)})))
+    return []
+
+
+def stem_terms(db, terms: Sequence[str]) -> Optional[List[Tuple[str, ...]]]:
+    """
+    What the full-text search makes of each query term (tokenize_query
+    output) before prefix-matching it against the indexed terms: usually one
+    stemmed token, several when the term is split ("foo_bar"), none for a
+    PostgreSQL stop word. None on databases without full-text search.
+    """
+    if not terms:
+        return []
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        rows = db.execute(text(
+            "SELECT t.ord, lexeme FROM unnest(CAST(:terms AS text[])) WITH ORDINALITY AS t(term, ord), "
+            "unnest(tsvector_to_array(to_tsvector('english'::regconfig, t.term))) AS lexeme"
+        ), {"terms": list(terms)}).all()
+    elif dialect == "sqlite":
+        insert = text("INSERT INTO temp.fts_scratch(rowid, title) VALUES (:ord, :term)")
+        rows = _tokenize_in_scratch(db, insert, [{"ord": ord, "term": term} for ord, term in enumerate(terms, 1)])
+    else:
+        return None
+    stems: List[List[str]] = [[] for _ in terms]
+    for ord, token in rows:
+        stems[ord - 1].append(token)
+    return [tuple(stem) for stem in stems]
+
+
+def term_frequencies(db, prefixes: Iterable[str]) -> Dict[str, float]:
+    """
+    How common jobs with a term starting with each prefix are, to tell the
+    selective prefixes from the common ones: document counts from the FTS5
+    vocabulary on SQLite, the planner's lexeme frequencies (pg_stats) on
+    PostgreSQL, where lexemes too rare to be tracked count as 0. Empty on
+    other databases.
+    """
+    prefixes = list(dict.fromkeys(prefixes))
+    dialect = db.get_bind().dialect.name
+    if not prefixes or dialect not in ("postgresql", "sqlite"):
+        return {}
+    if dialect == "sqlite":
+        for statement in _SQLITE_VOCAB_DDL:
+            db.execute(text(statement))
+        count = text("SELECT coalesce(sum(doc), 0) FROM temp.jobs_fts_rows WHERE term >= :start AND term < :end")
+        return {prefix: db.scalar(count, {"start": prefix, "end": prefix + "\U0010ffff"}) for prefix in prefixes}
+    stats = db.execute(text(
+        "SELECT most_common_elems::text::text[], most_common_elem_freqs FROM pg_stats "
+        "WHERE tablename = 'jobs' AND attname = 'search_vector'"
+    )).first()
+    lexemes = list(zip(stats[0] or [], stats[1] or [])) if stats else []
+    return {
+        prefix: sum(frequency for lexeme, frequency in lexemes if lexeme.startswith(prefix)) for prefix in prefixes
+    }
+
+
+def apply_text_search(jobs_query, job_model, dialect: str, query: str, rank: bool = True):
+    """
+    Filters a Job query to rows matching every term of `query` (prefix match)
+    and, if `rank` is set, orders it by relevance. Falls back to ILIKE on other
+    databases.
+    """
+    terms = tokenize_query(query)
+    if not terms:
+        return jobs_query
+
+    if dialect == "postgresql":
+        ts_query = func.to_tsquery(
+            literal_column("'english'::regconfig"),
+            bindparam("fts_query", " & ".join(f"{term}:*" for term in terms)),
+        )
+        search_vector = literal_column("jobs.search_vector")
+        jobs_query = jobs_query.filter(search_vector.op("@@")(ts_query))
+        if rank:
+            jobs_query = jobs_query.order_by(func.ts_rank_cd(search_vector, ts_query).desc(), job_model.id.desc())
+        return jobs_query
+
+    if dialect == "sqlite":
+        weights = ", ".join(str(weight) for weight in SQLITE_BM25_WEIGHTS)
+        jobs_query = (
+            jobs_query
+            .join(jobs_fts, jobs_fts.c.rowid == job_model.id)
+            .filter(text("jobs_fts MATCH :fts_query").bindparams(
+                fts_query=" ".join(f'"{term}"*' for term in terms)
+            ))
+        )
+        if rank:
+            jobs_query = jobs_query.order_by(text(f"bm25(jobs_fts, {weights})"), job_model.id.desc())
+        return jobs_query
+
+    return jobs_query.filter(
+        or_(*(getattr(job_model, column).ilike(f"%{query}%") for column in SEARCH_COLUMNS))
+    )
@@ -1,21 +1,42 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.database import engine
-from app.db.models import Base
+from app.db.database import dispose_async_engine
 from app.api.jobs import router as jobs_router
+from app.api.saved_searches import router as saved_searches_router
+from app.services.hot_index import HOT_INDEX_ENABLED, hot_index
+from app.services.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS, metrics_payload
+from app.services.tracing import configure_tracing, instrument_celery, instrument_fastapi
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
+# Celery workers configure logging themselves; the API process does it here.
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format='%(asctime)s - %(levelname)s - %(message)s',
+)
+configure_tracing("job-aggregator-api")
+
+# The schema is managed by migrations (alembic upgrade head, see
+# start.sh migrate), not created on startup.
 
-# Only create tables in development
-if os.getenv("ENVIRONMENT", "development") == "development":
-    Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if HOT_INDEX_ENABLED:
+        await asyncio.to_thread(hot_index.start)
+    yield
+    hot_index.stop()
+    await dispose_async_engine()
 
 app = FastAPI(
     title="Job Aggregator API",
     description="Fetches, stores, and serves jobs from multiple sources",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS setup - update with your frontend URL in production
@@ -28,7 +49,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    # Label by route template (/api/scrape/{task_id}), not by raw path.
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    HTTP_REQUEST_SECONDS.labels(method=request.method, route=path).observe(time.perf_counter() - started)
+    HTTP_REQUESTS.labels(method=request.method, route=path, status=response.status_code).inc()
+    return response
+
 # Register routers
 app.include_router(jobs_router, prefix="/api", tags=["Jobs"])
+app.include_router(saved_searches_router, prefix="/api", tags=["Saved searches"])
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    payload, content_type = metrics_payload()
+    return Response(content=payload, media_type=content_type)
+
+# Spans for every request, continued into the Celery tasks they publish
+instrument_fastapi(app)
+instrument_celery()
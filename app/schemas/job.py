@@ -1,5 +1,6 @@
+import orjson
 from pydantic import BaseModel, HttpUrl, field_validator
-from typing import Optional, List
+from typing import Any, Dict, Iterable, Optional, List, Sequence
 from datetime import datetime
 
 class JobBase(BaseModel):
@@ -37,3 +38,38 @@ class JobSchema(JobBase):
 
     class Config:
         from_attributes = True
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class JobFacetsSchema(BaseModel):
+    total: int
+    facets: Dict[str, List[FacetCount]]
+
+
+# JobSchema's fields in declaration order: the columns of the listing projection.
+JOB_LISTING_FIELDS = tuple(JobSchema.model_fields)
+
+
+def dump_job_rows(rows: Iterable[Sequence[Any]]) -> bytes:
+    """
+    Serializes rows of JOB_LISTING_FIELDS straight to JobSchema-shaped JSON,
+    skipping per-row model validation. Safe because every stored row was
+    checked on write: scraped batches by JobColumns.build, which drops rows
+    with a non-string title, id or text field or an invalid URL, fills in
+    missing dates and stores tags as the ","-join of the stripped tag list
+    (so they split back exactly); single jobs by JobCreate, to the same
+    effect.
+    """
+    return orjson.dumps([job_row_item(row) for row in rows])
+
+
+def job_row_item(row: Sequence[Any]) -> dict:
+    """
+    One row of JOB_LISTING_FIELDS as a JobSchema-shaped dict (see dump_job_rows).
+    """
+    item = dict(zip(JOB_LISTING_FIELDS, row))
+    item["tags"] = item["tags"].split(",") if item["tags"] else []
+    return item
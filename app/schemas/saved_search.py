@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional
+from datetime import datetime
+
+class SavedSearchBase(BaseModel):
+    name: Optional[str] = Field(None, max_length=255)
+    query: Optional[str] = Field(None, max_length=512)
+    location: Optional[str] = Field(None, max_length=512)
+    job_type: Optional[str] = Field(None, max_length=64)
+    tags: Optional[str] = Field(None, max_length=512, description="Comma-separated, all required")
+    min_salary: Optional[int] = None
+
+class SavedSearchCreate(SavedSearchBase):
+    @model_validator(mode="after")
+    def require_criteria(self):
+        if not any(getattr(self, name) for name in ("query", "location", "job_type", "tags")) \
+                and self.min_salary is None:
+            raise ValueError("A saved search needs at least one of query, location, job_type, tags, min_salary.")
+        return self
+
+class SavedSearchSchema(SavedSearchBase):
+    id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,94 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.scrapers.source_client import FetchResult, FetchState, build_fetch_result, get_json
+from app.services.columnar import JobColumns
+
+logger = logging.getLogger(__name__)
+
+
+class JobSource:
+    """
+    Common interface for a job board. Subclasses set `name` (the registry key,
+    also used for task routing and stored source state), `display_name` and
+    `items_path`, and implement `build_request` and `normalize_job`.
+    """
+    name: str = ""
+    display_name: str = ""
+    # ijson prefix of the job objects in the response, e.g. "jobs.item".
+    items_path: str = "item"
+    # False for boards whose API returns the whole feed whatever the query.
+    # Those are fetched into a feed snapshot and filtered locally.
+    server_side_search: bool = True
+    # Requests per minute across all workers; None uses SCRAPER_RATE_LIMIT_PER_MINUTE.
+    rate_limit_per_minute: Optional[int] = None
+
+    def build_request(self, search_query: str) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        """
+        Returns the (url, params, headers) to GET for `search_query`.
+        """
+        raise NotImplementedError
+
+    def normalize_job(
+        self, raw_job: Any, search_query: str, since: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Normalizes one raw job, or returns None if it should be skipped.
+        """
+        raise NotImplementedError
+
+    def normalize_columns(
+        self, raw_jobs: List[Any], search_query: str, since: Optional[datetime] = None
+    ) -> JobColumns:
+        """
+        Normalizes a whole batch of raw jobs into columns ready to store. This
+        default calls normalize_job per job; sources override it to convert
+        each field for the batch at once.
+        """
+        jobs = [self.normalize_job(raw_job, search_query, since) for raw_job in raw_jobs]
+        return JobColumns.from_jobs([job for job in jobs if job])
+
+    def extract_jobs(self, payload: Any) -> List[Any]:
+        """
+        Returns the raw job list of a fully parsed payload, following `items_path`.
+        """
+        for key in self.items_path.split(".")[:-1]:
+            payload = payload.get(key, []) if isinstance(payload, dict) else []
+        return payload if isinstance(payload, list) else []
+
+    def normalize_payload(
+        self, payload: Any, search_query: str, since: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        raw_jobs = self.extract_jobs(payload)
+        logger.info(f"Successfully fetched {len(raw_jobs)} raw jobs from {self.display_name}.")
+        jobs = []
+        for raw_job in raw_jobs:
+            try:
+                job = self.normalize_job(raw_job, search_query, since)
+            except Exception as e:
+                logger.error(f"Error normalizing {self.display_name} job: {e}", exc_info=True)
+                continue
+            if job:
+                jobs.append(job)
+        return jobs
+
+    async def fetch(
+        self, client: httpx.AsyncClient, search_query: str, state: Optional[FetchState] = None
+    ) -> FetchResult:
+        """
+        Fetches and normalizes jobs for `search_query` on a shared client.
+        With a previous state the request is conditional and only jobs newer
+        than the watermark are normalized. Network errors are raised to the caller.
+        """
+        url, params, headers = self.build_request(search_query)
+        response = await get_json(client, self, url, params=params, headers=headers, state=state)
+        if response.not_modified:
+            return build_fetch_result(response, [], state)
+        jobs = self.normalize_payload(response.payload, search_query, since=state.since if state else None)
+        return build_fetch_result(response, jobs, state)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name!r}>"
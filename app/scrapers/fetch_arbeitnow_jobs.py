@@ -1,54 +1,136 @@
+import os
 import pprint
-import requests
+import httpx
 from datetime import datetime, timezone
 import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+from app.scrapers.base import JobSource
+from app.scrapers.source_client import FetchResult, FetchState, run_standalone
+from app.services.columnar import JobColumns, parse_epochs, select_rows
 
 logger = logging.getLogger(__name__)
 
-def fetch_arbeitnow_jobs(search_query: str) -> list[dict]:
-    url = "https://www.arbeitnow.com/api/job-board-api"
-    headers = {"User-Agent": "JobScraperBot/1.0"}
-    timeout = 15
+ARBEITNOW_API_URL = os.getenv("ARBEITNOW_API_URL", "https://www.arbeitnow.com/api/job-board-api")
+HEADERS = {"User-Agent": "JobScraperBot/1.0"}
+
+
+def normalize_arbeitnow_job(
+    job: Dict[str, Any], search_query: str, since: Optional[datetime] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Normalizes one raw Arbeitnow job. Returns None for titles not matching the
+    search query and jobs published before `since`.
+    """
+    created_at_epoch = job.get("created_at")
+    if since and created_at_epoch and created_at_epoch < since.timestamp():
+        return None
+
+    title = job.get("title", "").lower()
+    if search_query and search_query.lower() not in title:
+        return None
+
+    if created_at_epoch:
+        publication_date = datetime.fromtimestamp(created_at_epoch, tz=timezone.utc)
+    else:
+        publication_date = datetime.now(timezone.utc)
+        logger.warning(f"Arbeitnow job {job.get('slug')} missing created_at. Using current UTC.")
+
+    job_id = f"arbeitnow-{job.get('slug') or job.get('id') or datetime.now().timestamp()}"
+
+    return {
+        "title": job.get("title"),
+        "company_name": job.get("company"),
+        "location": job.get("location"),
+        "url": job.get("url"),
+        "source": "arbeitnow",
+        "job_id": job_id,
+        "publication_date": publication_date,
+        "tags": ", ".join(job.get("tags", [])),
+        "salary": job.get("salary_range") or job.get("salary"),
+        "job_type": job.get("job_type") or job.get("type")
+    }
+
+
+def normalize_arbeitnow_jobs(
+    jobs_data: Dict[str, Any], search_query: str, since: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Normalizes a raw Arbeitnow API payload, filtering titles by the search query.
+    Jobs published before `since` are skipped before any other work.
+    """
+    jobs = jobs_data.get("data", [])
+    logger.info(f"Successfully fetched {len(jobs)} raw jobs from Arbeitnow.")
+
+    normalized_jobs = []
+    for job in jobs:
+        normalized_job = normalize_arbeitnow_job(job, search_query, since)
+        if normalized_job:
+            normalized_jobs.append(normalized_job)
+
+    return normalized_jobs
 
+
+def normalize_arbeitnow_columns(
+    jobs: List[Dict[str, Any]], search_query: str, since: Optional[datetime] = None
+) -> JobColumns:
+    """
+    Columnar normalize_arbeitnow_job for a batch of raw Arbeitnow jobs.
+    """
+    raw_dates = [job.get("created_at") for job in jobs]
+    dates = parse_epochs(raw_dates)
+    titles = [job.get("title", "") for job in jobs]
+    fallback_id = datetime.now().timestamp()
+    return JobColumns.build(
+        source="arbeitnow",
+        job_id=[f"arbeitnow-{job.get('slug') or job.get('id') or fallback_id}" for job in jobs],
+        title=titles,
+        url=[job.get("url") for job in jobs],
+        publication_date=dates,
+        company_name=[job.get("company") for job in jobs],
+        location=[job.get("location") for job in jobs],
+        tags=[job.get("tags") for job in jobs],
+        salary=[job.get("salary_range") or job.get("salary") for job in jobs],
+        job_type=[job.get("job_type") or job.get("type") for job in jobs],
+        keep=select_rows(dates, titles, search_query, since),
+        raw_dates=raw_dates,
+    )
+
+
+class ArbeitnowSource(JobSource):
+    name = "arbeitnow"
+    display_name = "Arbeitnow"
+    items_path = "data.item"
+    server_side_search = False
+
+    def build_request(self, search_query: str) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        return ARBEITNOW_API_URL, {}, HEADERS
+
+    def normalize_job(self, raw_job, search_query, since=None):
+        return normalize_arbeitnow_job(raw_job, search_query, since)
+
+    def normalize_columns(self, raw_jobs, search_query, since=None):
+        return normalize_arbeitnow_columns(raw_jobs, search_query, since)
+
+    def normalize_payload(self, payload, search_query, since=None):
+        return normalize_arbeitnow_jobs(payload, search_query, since)
+
+
+async def fetch_arbeitnow_jobs_async(
+    client: httpx.AsyncClient, search_query: str, state: Optional[FetchState] = None
+) -> FetchResult:
+    """
+    Fetches jobs from the Arbeitnow API on a shared client and normalizes them.
+    With a previous state, the request is conditional and only jobs newer than
+    the watermark are normalized. Network errors are raised to the caller.
+    """
+    return await ArbeitnowSource().fetch(client, search_query, state)
+
+
+def fetch_arbeitnow_jobs(search_query: str) -> list[dict]:
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
-
-        jobs_data = response.json()
-        jobs = jobs_data.get("data", [])
-        logger.info(f"Successfully fetched {len(jobs)} raw jobs from Arbeitnow.")
-
-        normalized_jobs = []
-        for job in jobs:
-            title = job.get("title", "").lower()
-            if search_query and search_query.lower() not in title:
-                continue
-
-            created_at_epoch = job.get("created_at")
-            if created_at_epoch:
-                publication_date = datetime.fromtimestamp(created_at_epoch, tz=timezone.utc)
-            else:
-                publication_date = datetime.now(timezone.utc)
-                logger.warning(f"Arbeitnow job {job.get('slug')} missing created_at. Using current UTC.")
-
-            job_id = f"arbeitnow-{job.get('slug') or job.get('id') or datetime.now().timestamp()}"
-
-            normalized_jobs.append({
-                "title": job.get("title"),
-                "company_name": job.get("company"),
-                "location": job.get("location"),
-                "url": job.get("url"),
-                "source": "arbeitnow",
-                "job_id": job_id,
-                "publication_date": publication_date,
-                "tags": ", ".join(job.get("tags", [])),
-                "salary": job.get("salary_range") or job.get("salary"),
-                "job_type": job.get("job_type") or job.get("type")
-            })
-
-        return normalized_jobs
-
-    except requests.exceptions.RequestException as e:
+        return run_standalone(fetch_arbeitnow_jobs_async, search_query)
+    except httpx.HTTPError as e:
         logger.error(f"Network error fetching from Arbeitnow: {e}", exc_info=True)
         return []
     except Exception as e:
@@ -60,4 +142,4 @@ if __name__ == "__main__":
     test_search_query = "developer"
     normalized_jobs = fetch_arbeitnow_jobs(test_search_query)
     pprint.pprint(normalized_jobs[:5])
-    print(f"\nTotal jobs fetched from Arbeitnow (for '{test_search_query}'): {len(normalized_jobs)}")
\ No newline at end of file
+    print(f"\nTotal jobs fetched from Arbeitnow (for '{test_search_query}'): {len(normalized_jobs)}")
@@ -1,62 +1,145 @@
-import requests
+import os
+import httpx
 from datetime import datetime, timezone
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+from app.scrapers.base import JobSource
+from app.scrapers.source_client import FetchResult, FetchState, run_standalone
+from app.services.columnar import JobColumns, parse_epochs, select_rows
 
 logger = logging.getLogger(__name__)
 
+REMOTEOK_API_URL = os.getenv("REMOTEOK_API_URL", "https://remoteok.com/api")
+HEADERS = {"User-Agent": "JobAggregatorBot/1.0"}
+
+
+def normalize_remoteok_job(
+    job: Any, search_query: str, since: Optional[datetime] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Normalizes one raw RemoteOK job. Returns None for the legal notice entry,
+    titles not matching the search query and jobs published before `since`.
+    """
+    if not isinstance(job, dict) or not job.get("id"):
+        return None
+
+    epoch = job.get("epoch")
+    if since and epoch and epoch < since.timestamp():
+        return None
+    if epoch:
+        publication_date = datetime.fromtimestamp(epoch, tz=timezone.utc)
+    else:
+        publication_date = datetime.now(timezone.utc)
+        logger.warning(f"RemoteOK job {job.get('id')} missing epoch. Using current UTC.")
+
+    job_id = f"remoteok-{job.get('id')}" if job.get('id') else f"remoteok-{job.get('url') or datetime.now().timestamp()}"
+
+
+    title = job.get("position") or job.get("title", "")
+    if search_query and search_query.lower() not in title.lower():
+        return None
+
+    return {
+        "title": title,
+        "company_name": job.get("company"),
+        "location": job.get("location"),
+        "url": job.get("url"),
+        "source": "remoteok",
+        "job_id": job_id,
+        "publication_date": publication_date,
+        "tags": ", ".join(job.get("tags", [])) if isinstance(job.get("tags"), list) else job.get("tags"),
+        "salary": job.get("salary"),
+        "job_type": job.get("type")
+    }
+
+
+def normalize_remoteok_jobs(
+    jobs_data: List[Any], search_query: str, since: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Normalizes a raw RemoteOK API payload, filtering titles by the search query.
+    Jobs published before `since` are skipped before any other work.
+    """
+    jobs = [job for job in jobs_data if isinstance(job, dict) and job.get("id")]
+    logger.info(f"Successfully fetched {len(jobs)} raw jobs from RemoteOK.")
+
+    normalized_jobs: List[Dict[str, Any]] = []
+    for job in jobs:
+        try:
+            normalized_job = normalize_remoteok_job(job, search_query, since)
+        except Exception as e:
+            logger.error(f"Error normalizing RemoteOK job {job.get('id', 'N/A')}: {e}", exc_info=True)
+            continue
+        if normalized_job:
+            normalized_jobs.append(normalized_job)
+
+    return normalized_jobs
+
+
+def normalize_remoteok_columns(
+    jobs: List[Any], search_query: str, since: Optional[datetime] = None
+) -> JobColumns:
+    """
+    Columnar normalize_remoteok_job for a batch of raw RemoteOK entries.
+    """
+    jobs = [job for job in jobs if isinstance(job, dict) and job.get("id")]
+    raw_dates = [job.get("epoch") for job in jobs]
+    dates = parse_epochs(raw_dates)
+    titles = [job.get("position") or job.get("title", "") for job in jobs]
+    return JobColumns.build(
+        source="remoteok",
+        job_id=[f"remoteok-{job['id']}" for job in jobs],
+        title=titles,
+        url=[job.get("url") for job in jobs],
+        publication_date=dates,
+        company_name=[job.get("company") for job in jobs],
+        location=[job.get("location") for job in jobs],
+        tags=[job.get("tags") for job in jobs],
+        salary=[job.get("salary") for job in jobs],
+        job_type=[job.get("type") for job in jobs],
+        keep=select_rows(dates, titles, search_query, since),
+        raw_dates=raw_dates,
+    )
+
+
+class RemoteOKSource(JobSource):
+    name = "remoteok"
+    display_name = "RemoteOK"
+    items_path = "item"
+    server_side_search = False
+
+    def build_request(self, search_query: str) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        return REMOTEOK_API_URL, {}, HEADERS
+
+    def normalize_job(self, raw_job, search_query, since=None):
+        return normalize_remoteok_job(raw_job, search_query, since)
+
+    def normalize_columns(self, raw_jobs, search_query, since=None):
+        return normalize_remoteok_columns(raw_jobs, search_query, since)
+
+    def normalize_payload(self, payload, search_query, since=None):
+        return normalize_remoteok_jobs(payload, search_query, since)
+
+
+async def fetch_remoteok_jobs_async(
+    client: httpx.AsyncClient, search_query: str, state: Optional[FetchState] = None
+) -> FetchResult:
+    """
+    Fetches jobs from the RemoteOK.com API on a shared client and normalizes them.
+    With a previous state, the request is conditional and only jobs newer than
+    the watermark are normalized. Network errors are raised to the caller.
+    """
+    return await RemoteOKSource().fetch(client, search_query, state)
+
+
 def fetch_remoteok_jobs(search_query: str) -> List[Dict[str, Any]]:
     """
     Fetches jobs from the RemoteOK.com API and normalizes them.
     """
-    url = "https://remoteok.com/api"
-    headers = {"User-Agent": "JobAggregatorBot/1.0"}
-    timeout = 15
-
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        jobs_data = response.json()
-
-        jobs = [job for job in jobs_data if isinstance(job, dict) and job.get("id")]
-        logger.info(f"Successfully fetched {len(jobs)} raw jobs from RemoteOK.")
-
-        normalized_jobs: List[Dict[str, Any]] = []
-        for job in jobs:
-            try:
-                epoch = job.get("epoch")
-                if epoch:
-                    publication_date = datetime.fromtimestamp(epoch, tz=timezone.utc)
-                else:
-                    publication_date = datetime.now(timezone.utc)
-                    logger.warning(f"RemoteOK job {job.get('id')} missing epoch. Using current UTC.")
-
-                job_id = f"remoteok-{job.get('id')}" if job.get('id') else f"remoteok-{job.get('url') or datetime.now().timestamp()}"
-
-
-                title = job.get("position") or job.get("title", "")
-                if search_query and search_query.lower() not in title.lower():
-                    continue
-
-                normalized_jobs.append({
-                    "title": title,
-                    "company_name": job.get("company"),
-                    "location": job.get("location"),
-                    "url": job.get("url"),
-                    "source": "remoteok",
-                    "job_id": job_id,
-                    "publication_date": publication_date,
-                    "tags": ", ".join(job.get("tags", [])) if isinstance(job.get("tags"), list) else job.get("tags"),
-                    "salary": job.get("salary"),
-                    "job_type": job.get("type")
-                })
-            except Exception as e:
-                logger.error(f"Error normalizing RemoteOK job {job.get('id', 'N/A')}: {e}", exc_info=True)
-                continue
-
-        return normalized_jobs
-
-    except requests.exceptions.RequestException as e:
+        return run_standalone(fetch_remoteok_jobs_async, search_query)
+    except httpx.HTTPError as e:
         logger.error(f"Network error fetching from RemoteOK: {e}", exc_info=True)
         return []
     except Exception as e:
@@ -72,4 +155,4 @@ if __name__ == "__main__":
     print("--- Testing RemoteOK Scraper ---")
     jobs = fetch_remoteok_jobs("python")
     pprint(jobs[:5])
-    print(f"\nTotal jobs fetched from RemoteOK: {len(jobs)}")
\ No newline at end of file
+    print(f"\nTotal jobs fetched from RemoteOK: {len(jobs)}")
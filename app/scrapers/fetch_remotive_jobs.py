@@ -1,59 +1,137 @@
-import requests
+import os
+import httpx
 from datetime import datetime, timezone
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+from app.scrapers.base import JobSource
+from app.scrapers.source_client import FetchResult, FetchState, run_standalone
+from app.services.columnar import JobColumns, parse_iso_dates, select_rows
 
 logger = logging.getLogger(__name__)
 
+REMOTIVE_API_URL = os.getenv("REMOTIVE_API_URL", "https://remotive.com/api/remote-jobs")
+HEADERS = {"User-Agent": "JobAggregatorBot/1.0"}
+
+
+def normalize_remotive_job(
+    job: Dict[str, Any], search_query: str, since: Optional[datetime] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Normalizes one raw Remotive job. Remotive filters by query server-side.
+    Returns None for jobs published before `since`.
+    """
+    publication_date_str = job.get("publication_date")
+    if publication_date_str:
+        publication_date = datetime.fromisoformat(publication_date_str.replace('Z', '+00:00'))
+        if publication_date.tzinfo is None:
+            publication_date = publication_date.replace(tzinfo=timezone.utc)
+    else:
+        publication_date = datetime.now(timezone.utc)
+        logger.warning(f"Remotive job {job.get('id')} missing publication_date. Using current UTC.")
+
+    if since and publication_date < since:
+        return None
+
+    job_id = f"remotive-{job.get('id')}" if job.get('id') else f"remotive-{job.get('url') or datetime.now().timestamp()}"
+
+    return {
+        "title": job.get("title"),
+        "company_name": job.get("company_name"),
+        "location": job.get("candidate_required_location"),
+        "url": job.get("url"),
+        "source": "remotive",
+        "job_id": job_id,
+        "publication_date": publication_date,
+        "tags": ", ".join(job.get("tags", [])) if isinstance(job.get("tags"), list) else job.get("tags"),
+        "salary": job.get("salary"),
+        "job_type": job.get("job_type")
+    }
+
+
+def normalize_remotive_jobs(
+    jobs_data: Dict[str, Any], search_query: str, since: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Normalizes a raw Remotive API payload. Jobs published before `since` are skipped.
+    """
+    jobs = jobs_data.get("jobs", [])
+    logger.info(f"Successfully fetched {len(jobs)} raw jobs from Remotive.")
+
+    normalized_jobs: List[Dict[str, Any]] = []
+    for job in jobs:
+        try:
+            normalized_job = normalize_remotive_job(job, search_query, since)
+        except Exception as e:
+            logger.error(f"Error normalizing Remotive job {job.get('id', 'N/A')}: {e}", exc_info=True)
+            continue
+        if normalized_job:
+            normalized_jobs.append(normalized_job)
+
+    return normalized_jobs
+
+
+def normalize_remotive_columns(
+    jobs: List[Dict[str, Any]], search_query: str, since: Optional[datetime] = None
+) -> JobColumns:
+    """
+    Columnar normalize_remotive_job for a batch of raw Remotive jobs.
+    """
+    raw_dates = [job.get("publication_date") for job in jobs]
+    dates = parse_iso_dates(raw_dates)
+    fallback_id = datetime.now().timestamp()
+    return JobColumns.build(
+        source="remotive",
+        job_id=[f"remotive-{job.get('id') or job.get('url') or fallback_id}" for job in jobs],
+        title=[job.get("title") for job in jobs],
+        url=[job.get("url") for job in jobs],
+        publication_date=dates,
+        company_name=[job.get("company_name") for job in jobs],
+        location=[job.get("candidate_required_location") for job in jobs],
+        tags=[job.get("tags") for job in jobs],
+        salary=[job.get("salary") for job in jobs],
+        job_type=[job.get("job_type") for job in jobs],
+        keep=select_rows(dates, [None] * len(jobs), since=since),
+        raw_dates=raw_dates,
+    )
+
+
+class RemotiveSource(JobSource):
+    name = "remotive"
+    display_name = "Remotive"
+    items_path = "jobs.item"
+
+    def build_request(self, search_query: str) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        return REMOTIVE_API_URL, {"search": search_query}, HEADERS
+
+    def normalize_job(self, raw_job, search_query, since=None):
+        return normalize_remotive_job(raw_job, search_query, since)
+
+    def normalize_columns(self, raw_jobs, search_query, since=None):
+        return normalize_remotive_columns(raw_jobs, search_query, since)
+
+    def normalize_payload(self, payload, search_query, since=None):
+        return normalize_remotive_jobs(payload, search_query, since)
+
+
+async def fetch_remotive_jobs_async(
+    client: httpx.AsyncClient, search_query: str, state: Optional[FetchState] = None
+) -> FetchResult:
+    """
+    Fetches jobs from the Remotive.com API on a shared client and normalizes them.
+    With a previous state, the request is conditional and only jobs newer than
+    the watermark are normalized. Network errors are raised to the caller.
+    """
+    return await RemotiveSource().fetch(client, search_query, state)
+
+
 def fetch_remotive_jobs(search_query: str) -> List[Dict[str, Any]]:
     """
     Fetches jobs from the Remotive.com API and normalizes them.
     """
-    url = "https://remotive.com/api/remote-jobs"
-    params = {"search": search_query}
-    headers = {"User-Agent": "JobAggregatorBot/1.0"}
-    timeout = 15
-
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        jobs_data = response.json()
-        jobs = jobs_data.get("jobs", [])
-        logger.info(f"Successfully fetched {len(jobs)} raw jobs from Remotive.")
-
-        normalized_jobs: List[Dict[str, Any]] = []
-        for job in jobs:
-            try:
-                publication_date_str = job.get("publication_date")
-                if publication_date_str:
-                    publication_date = datetime.fromisoformat(publication_date_str.replace('Z', '+00:00'))
-                    if publication_date.tzinfo is None:
-                        publication_date = publication_date.replace(tzinfo=timezone.utc)
-                else:
-                    publication_date = datetime.now(timezone.utc)
-                    logger.warning(f"Remotive job {job.get('id')} missing publication_date. Using current UTC.")
-
-                job_id = f"remotive-{job.get('id')}" if job.get('id') else f"remotive-{job.get('url') or datetime.now().timestamp()}"
-
-                normalized_jobs.append({
-                    "title": job.get("title"),
-                    "company_name": job.get("company_name"),
-                    "location": job.get("candidate_required_location"),
-                    "url": job.get("url"),
-                    "source": "remotive",
-                    "job_id": job_id,
-                    "publication_date": publication_date,
-                    "tags": ", ".join(job.get("tags", [])) if isinstance(job.get("tags"), list) else job.get("tags"),
-                    "salary": job.get("salary"),
-                    "job_type": job.get("job_type")
-                })
-            except Exception as e:
-                logger.error(f"Error normalizing Remotive job {job.get('id', 'N/A')}: {e}", exc_info=True)
-                continue
-
-        return normalized_jobs
-
-    except requests.exceptions.RequestException as e:
+        return run_standalone(fetch_remotive_jobs_async, search_query)
+    except httpx.HTTPError as e:
         logger.error(f"Network error fetching from Remotive: {e}", exc_info=True)
         return []
     except Exception as e:
@@ -69,4 +147,4 @@ if __name__ == "__main__":
     print("--- Testing Remotive Scraper ---")
     jobs = fetch_remotive_jobs("developer")
     pprint(jobs[:5])
-    print(f"\nTotal jobs fetched from Remotive: {len(jobs)}")
\ No newline at end of file
+    print(f"\nTotal jobs fetched from Remotive: {len(jobs)}")
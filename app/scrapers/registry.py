@@ -0,0 +1,85 @@
+import importlib
+import logging
+import os
+import threading
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Dict, List, Type, Union
+
+if TYPE_CHECKING:
+    # Sources (and with them httpx) are imported when first looked up.
+    from app.scrapers.base import JobSource
+
+logger = logging.getLogger(__name__)
+
+# Third-party packages can ship sources under this entry-point group.
+ENTRY_POINT_GROUP = "job_aggregator.sources"
+
+BUILTIN_SOURCES = [
+    "app.scrapers.fetch_remotive_jobs:RemotiveSource",
+    "app.scrapers.fetch_remoteok_jobs:RemoteOKSource",
+    "app.scrapers.fetch_arbeitnow_jobs:ArbeitnowSource",
+]
+
+# Extra sources as comma-separated "module:Class" paths.
+EXTRA_SOURCES = [path.strip() for path in os.getenv("SCRAPER_SOURCES", "").split(",") if path.strip()]
+# Optional allow-list of source names; empty means every registered source.
+ENABLED_SOURCES = {name.strip() for name in os.getenv("SCRAPER_ENABLED_SOURCES", "").split(",") if name.strip()}
+
+_sources: Dict[str, "JobSource"] = {}
+_loaded = False
+_lock = threading.Lock()
+
+
+def register_source(source: Union["JobSource", Type["JobSource"]]):
+    """
+    Registers a source instance or class. Usable as a class decorator.
+    """
+    instance = source() if isinstance(source, type) else source
+    if not instance.name:
+        raise ValueError(f"{source!r} has no name.")
+    if instance.name in _sources:
+        logger.warning(f"⚠️ Source '{instance.name}' registered twice; keeping the latest.")
+    _sources[instance.name] = instance
+    return source
+
+
+def _load_path(path: str) -> None:
+    module_name, _, attribute = path.partition(":")
+    register_source(getattr(importlib.import_module(module_name), attribute))
+
+
+def _load_sources() -> None:
+    global _loaded
+    with _lock:
+        if _loaded:
+            return
+        for path in BUILTIN_SOURCES + EXTRA_SOURCES:
+            try:
+                _load_path(path)
+            except Exception as e:
+                logger.error(f"❌ Could not load job source '{path}': {e}", exc_info=True)
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            try:
+                register_source(entry_point.load())
+            except Exception as e:
+                logger.error(f"❌ Could not load job source entry point '{entry_point.name}': {e}", exc_info=True)
+        _loaded = True
+
+
+def get_sources() -> List["JobSource"]:
+    """
+    Returns the enabled sources, loading them on first use.
+    """
+    _load_sources()
+    return [
+        source for name, source in _sources.items()
+        if not ENABLED_SOURCES or name in ENABLED_SOURCES
+    ]
+
+
+def get_source(name: str) -> "JobSource":
+    _load_sources()
+    try:
+        return _sources[name]
+    except KeyError:
+        raise KeyError(f"Unknown job source '{name}'.") from None
@@ -0,0 +1,321 @@
+import asyncio
+import atexit
+import logging
+import os
+import random
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import httpx
+import ijson
+
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.metrics import SOURCE_CIRCUIT_REJECTIONS, SOURCE_RETRIES
+from app.services.rate_limit import throttle
+
+if TYPE_CHECKING:
+    from app.scrapers.base import JobSource
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 15
+MAX_CONNECTIONS = int(os.getenv("SCRAPER_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("SCRAPER_MAX_KEEPALIVE_CONNECTIONS", "10"))
+# Idle keep-alive connections are kept this long, so consecutive scrapes in
+# a worker reuse their connections (and TLS sessions).
+KEEPALIVE_EXPIRY = float(os.getenv("SCRAPER_KEEPALIVE_EXPIRY", "120"))
+
+# Retries of a request after a connection error, a timeout or a retryable
+# status, with exponential backoff and full jitter between attempts.
+MAX_RETRIES = int(os.getenv("SCRAPER_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("SCRAPER_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.getenv("SCRAPER_BACKOFF_MAX", "30"))
+# A Retry-After longer than this is not waited for; the request fails instead.
+MAX_RETRY_AFTER = float(os.getenv("SCRAPER_MAX_RETRY_AFTER", "60"))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Re-read this much before the watermark, for postings published out of order.
+WATERMARK_OVERLAP = timedelta(minutes=int(os.getenv("SCRAPE_WATERMARK_OVERLAP_MINUTES", "60")))
+
+
+@dataclass
+class FetchState:
+    """
+    What is remembered about a source between scrapes: validators for
+    conditional GETs and the newest publication date seen so far.
+    """
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    watermark: Optional[datetime] = None
+    watermark_job_id: Optional[str] = None
+
+    @property
+    def since(self) -> Optional[datetime]:
+        return self.watermark - WATERMARK_OVERLAP if self.watermark else None
+
+
+@dataclass
+class FetchResult:
+    jobs: List[Dict[str, Any]] = field(default_factory=list)
+    state: FetchState = field(default_factory=FetchState)
+    not_modified: bool = False
+    failed: bool = False
+    # Set by the streaming pipeline, which writes jobs instead of returning them.
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class JsonResponse:
+    payload: Any = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+
+AsyncFetcher = Callable[[httpx.AsyncClient, str, Optional[FetchState]], Awaitable[FetchResult]]
+T = TypeVar("T")
+
+
+class SourceUnavailableError(httpx.HTTPError):
+    """
+    Raised instead of sending a request while the source's circuit is open.
+    """
+
+
+def create_client(timeout: float = DEFAULT_TIMEOUT) -> httpx.AsyncClient:
+    """
+    Creates a pooled async HTTP client. Responses compressed with gzip,
+    deflate or (with the brotli package installed) br are decoded transparently.
+    """
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(timeout),
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        follow_redirects=True,
+    )
+
+
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_thread_loops = threading.local()
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """
+    Returns the pooled client of the running event loop, creating it on
+    first use. Run blocking entry points through run_async so the loop, and
+    with it the client's keep-alive connections, outlive a single scrape.
+    """
+    loop = asyncio.get_running_loop()
+    client = _shared_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _shared_clients[loop] = create_client()
+    return client
+
+
+def run_async(coroutine: Awaitable[T]) -> T:
+    """
+    Runs a coroutine to completion on this thread's persistent event loop.
+    Unlike asyncio.run, the loop is kept between calls, so Celery tasks in
+    the same worker process share one pooled client.
+    """
+    loop = getattr(_thread_loops, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _thread_loops.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(coroutine)
+
+
+@atexit.register
+def close_shared_clients() -> None:
+    for loop, client in list(_shared_clients.items()):
+        if not loop.is_closed() and not loop.is_running():
+            loop.run_until_complete(client.aclose())
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Full-jitter exponential backoff: uniform in [0, min(BACKOFF_MAX, BACKOFF_BASE * 2^attempt)].
+    """
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """
+    Parses a Retry-After header given in seconds or as an HTTP date.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+@asynccontextmanager
+async def open_stream(
+    client: httpx.AsyncClient,
+    source: "JobSource",
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> AsyncIterator[httpx.Response]:
+    """
+    GETs `url` for `source` as a streamed response, behind the source's
+    circuit breaker and rate limit. Connection errors, timeouts and
+    429/5xx answers are retried up to MAX_RETRIES times, after the server's
+    Retry-After or with backoff. Only sending is retried: errors while the
+    body is read reach the caller, and count as a breaker failure.
+
+    Raises SourceUnavailableError without sending anything while the circuit
+    is open, so a degraded source fails fast instead of timing out.
+    """
+    breaker = CircuitBreaker(source.name)
+    request_timeout = httpx.Timeout(timeout) if timeout is not None else httpx.USE_CLIENT_DEFAULT
+    attempt = 0
+    while True:
+        if not await asyncio.to_thread(breaker.allow):
+            SOURCE_CIRCUIT_REJECTIONS.labels(source=source.name).inc()
+            raise SourceUnavailableError(f"{source.display_name} is failing; its circuit is open.")
+        await throttle(source)
+        try:
+            response = await client.send(
+                client.build_request("GET", url, params=params, headers=headers, timeout=request_timeout),
+                stream=True,
+            )
+        except httpx.TransportError as e:
+            await asyncio.to_thread(breaker.record_failure)
+            if attempt >= MAX_RETRIES:
+                raise
+            delay = backoff_delay(attempt)
+            reason = type(e).__name__
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                break
+            # Drain the (short) error body so the connection returns to the pool.
+            await response.aread()
+            await response.aclose()
+            await asyncio.to_thread(breaker.record_failure)
+            delay = retry_after_seconds(response)
+            if attempt >= MAX_RETRIES or (delay is not None and delay > MAX_RETRY_AFTER):
+                response.raise_for_status()
+            delay = backoff_delay(attempt) if delay is None else delay
+            reason = f"HTTP {response.status_code}"
+        attempt += 1
+        SOURCE_RETRIES.labels(source=source.name, reason=reason).inc()
+        logger.warning(f"🔁 {source.display_name}: {reason}; retry {attempt}/{MAX_RETRIES} in {delay:.1f}s.")
+        await asyncio.sleep(delay)
+
+    await asyncio.to_thread(breaker.record_success)
+    try:
+        yield response
+    except httpx.TransportError:
+        await asyncio.to_thread(breaker.record_failure)
+        raise
+    finally:
+        await response.aclose()
+
+
+def conditional_headers(headers: Optional[Dict[str, str]], state: Optional[FetchState]) -> Dict[str, str]:
+    request_headers = dict(headers or {})
+    if state and state.etag:
+        request_headers["If-None-Match"] = state.etag
+    if state and state.last_modified:
+        request_headers["If-Modified-Since"] = state.last_modified
+    return request_headers
+
+
+def advance_watermark(state: FetchState, job: Dict[str, Any]) -> None:
+    publication_date = job.get("publication_date")
+    if isinstance(publication_date, datetime) and (state.watermark is None or publication_date > state.watermark):
+        state.watermark = publication_date
+        state.watermark_job_id = job.get("job_id")
+
+
+async def get_json(
+    client: httpx.AsyncClient,
+    source: "JobSource",
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    state: Optional[FetchState] = None,
+) -> JsonResponse:
+    """
+    GETs a JSON document through open_stream, sending If-None-Match /
+    If-Modified-Since from the previous state. A 304 yields a response with
+    not_modified set and no payload.
+    """
+    async with open_stream(client, source, url, params=params, headers=conditional_headers(headers, state)) as response:
+        if response.status_code == 304:
+            previous = state or FetchState()
+            return JsonResponse(etag=previous.etag, last_modified=previous.last_modified, not_modified=True)
+        response.raise_for_status()
+        await response.aread()
+        return JsonResponse(
+            payload=response.json(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+
+async def iter_json_items(chunks: AsyncIterable[bytes], prefix: str) -> AsyncIterator[Any]:
+    """
+    Yields the objects found at `prefix` as the bytes of a JSON document
+    arrive, without ever holding the whole document.
+    """
+    items = ijson.sendable_list()
+    parser = ijson.items_coro(items, prefix, use_float=True)
+    async for chunk in chunks:
+        parser.send(chunk)
+        for item in items:
+            yield item
+        del items[:]
+    parser.close()
+    for item in items:
+        yield item
+
+
+def build_fetch_result(response: JsonResponse, jobs: List[Dict[str, Any]], state: Optional[FetchState]) -> FetchResult:
+    """
+    Combines the validators of a response with the newest job it produced into
+    the state to remember for the next scrape.
+    """
+    previous = state or FetchState()
+    if response.not_modified:
+        return FetchResult(state=previous, not_modified=True)
+
+    new_state = FetchState(
+        etag=response.etag,
+        last_modified=response.last_modified,
+        watermark=previous.watermark,
+        watermark_job_id=previous.watermark_job_id,
+    )
+    for job in jobs:
+        advance_watermark(new_state, job)
+    return FetchResult(jobs=jobs, state=new_state)
+
+
+def run_standalone(fetch_func: AsyncFetcher, search_query: str) -> List[Dict[str, Any]]:
+    """
+    Runs a single async fetcher to completion with its own client.
+    Used by the synchronous fetch_* wrappers.
+    """
+    async def _run() -> FetchResult:
+        return await fetch_func(get_shared_client(), search_query, None)
+
+    return run_async(_run()).jobs
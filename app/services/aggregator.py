@@ -1,22 +1,26 @@
-import sys
-import os
 import logging
 from datetime import datetime, timezone
-from typing import List, Dict, Any
-
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
-
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
+from typing import List, Dict, Any, Optional, Tuple
 
 from app.db.database import SessionLocal
-from app.db.crud import create_job
+from app.db.crud import bulk_upsert_jobs, job_to_row
+from app.db.saved_searches import record_matches
 from app.schemas.job import JobCreate
-from app.scrapers.fetch_remotive_jobs import fetch_remotive_jobs
-from app.scrapers.fetch_remoteok_jobs import fetch_remoteok_jobs
-from app.scrapers.fetch_arbeitnow_jobs import fetch_arbeitnow_jobs
+from app.services.columnar import JobColumns
+from app.scrapers.source_client import FetchResult, FetchState
+from app.services.fetch_engine import fetch_all_sources_sync
+from app.services.metrics import (
+    NORMALIZE_SECONDS,
+    SAVED_SEARCH_MATCHES,
+    SAVED_SEARCH_MATCH_SECONDS,
+    SOURCE_FETCH_SECONDS,
+    SOURCE_RAW_JOBS,
+    STORE_BATCH_SECONDS,
+    STORED_JOBS,
+    stage,
+)
+
+logger = logging.getLogger(__name__)
 
 
 def _normalize_datetime_to_utc(dt_obj: Any) -> datetime:
@@ -49,27 +53,30 @@ def safe_fetch(fetch_func, source_name: str, search_query: str) -> List[Dict[str
     Safely fetches jobs from a given source, handles exceptions,
     and normalizes publication dates to UTC.
     """
-    try:
-        source_jobs = fetch_func(search_query)
-        logger.info(f"✅ Successfully fetched {len(source_jobs)} jobs from {source_name}.")
+    with stage("fetch_source", SOURCE_FETCH_SECONDS, source=source_name, outcome="ok") as labels:
+        try:
+            source_jobs = fetch_func(search_query)
+        except Exception as e:
+            labels["outcome"] = "error"
+            logger.error(f"❌ Failed to fetch from {source_name}: {e}", exc_info=True)
+            return []
+    SOURCE_RAW_JOBS.labels(source=source_name).inc(len(source_jobs))
+    logger.info(f"✅ Successfully fetched {len(source_jobs)} jobs from {source_name}.")
+    with stage("normalize", NORMALIZE_SECONDS, source=source_name):
         for job in source_jobs:
             job['publication_date'] = _normalize_datetime_to_utc(job.get('publication_date'))
-        return source_jobs
-    except Exception as e:
-        logger.error(f"❌ Failed to fetch from {source_name}: {e}", exc_info=True)
-        return []
+    return source_jobs
 
 
-def aggregate_jobs(search_query: str = "job") -> List[Dict[str, Any]]:
+def merge_results(results: Dict[str, FetchResult]) -> List[Dict[str, Any]]:
     """
-    Aggregates jobs from all defined scrapers.
+    Merges per-source results into one deduplicated list, newest first.
     """
-    logger.info(f"\n🔎 Starting job aggregation for query: '{search_query}'...")
-
     jobs: List[Dict[str, Any]] = []
-    jobs.extend(safe_fetch(fetch_remotive_jobs, "Remotive", search_query))
-    jobs.extend(safe_fetch(fetch_remoteok_jobs, "RemoteOK", search_query))
-    jobs.extend(safe_fetch(fetch_arbeitnow_jobs, "Arbeitnow", search_query))
+    for result in results.values():
+        for job in result.jobs:
+            job['publication_date'] = _normalize_datetime_to_utc(job.get('publication_date'))
+        jobs.extend(result.jobs)
 
     seen_ids = set()
     unique_jobs: List[Dict[str, Any]] = []
@@ -92,46 +99,130 @@ def aggregate_jobs(search_query: str = "job") -> List[Dict[str, Any]]:
     )
 
 
-def save_jobs_to_db(jobs: List[Dict[str, Any]]):
-    """
-    Saves a list of job dictionaries to the database.
-    """
-    db = SessionLocal()
-    try:
-        new_count = 0
-        for job_data in jobs:
-            try:
-                job_create = JobCreate(
-                    title=job_data.get('title', 'No Title'),
-                    company_name=job_data.get('company_name', 'Unknown Company'),
-                    location=job_data.get('location'),
-                    url=job_data.get('url', 'No URL'),
-                    source=job_data.get('source', 'Unknown'),
-                    job_id=job_data.get('job_id', f"manual-{datetime.now().timestamp()}"),
-                    publication_date=_normalize_datetime_to_utc(job_data.get('publication_date')),
-                    tags=job_data.get('tags'),
-                    salary=job_data.get('salary'),
-                    job_type=job_data.get('job_type')
-                )
-                result = create_job(db, job_create)
-                if result:
-                    new_count += 1
-            except Exception as e:
-                logger.warning(f"⚠️ Error preparing or saving job {job_data.get('job_id', 'N/A')}: {e}")
-        db.commit()
-        logger.info(f"✅ Attempted to save {len(jobs)} jobs. Saved {new_count} new jobs to the database.")
-    except Exception as e:
-        db.rollback()
-        logger.error(f"❌ Database transaction error: {e}", exc_info=True)
-    finally:
-        db.close()
+def collect_jobs(
+    search_query: str = "job", states: Optional[Dict[str, FetchState]] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, FetchResult]]:
+    """
+    Fetches all sources concurrently and returns the deduplicated jobs, newest
+    first, together with each source's FetchResult. With `states`, sources are
+    fetched incrementally: unchanged feeds answer 304 and only postings newer
+    than the stored watermark are normalized.
+    """
+    logger.info(f"\n🔎 Starting job aggregation for query: '{search_query}'...")
+
+    results = fetch_all_sources_sync(search_query, states=states)
+    return merge_results(results), results
+
+
+def aggregate_jobs(search_query: str = "job") -> List[Dict[str, Any]]:
+    """
+    Aggregates jobs from all defined scrapers.
+    Sources are fetched concurrently, so the wall-clock cost is close to the
+    slowest single source rather than the sum of all of them.
+    """
+    jobs, _ = collect_jobs(search_query)
+    return jobs
+
+
+def save_jobs_to_db(jobs: List[Dict[str, Any]], update_existing: bool = False) -> Dict[str, int]:
+    """
+    Saves a list of job dictionaries to the database using batched upserts.
+    Returns inserted/updated/skipped counts, how many of the inserted jobs were
+    grouped under an existing posting, and the number of rows lost to a failed
+    transaction.
+    """
+    rows: List[Dict[str, Any]] = []
+    skipped = 0
+    for job_data in jobs:
+        try:
+            job_create = JobCreate(
+                title=job_data.get('title', 'No Title'),
+                company_name=job_data.get('company_name', 'Unknown Company'),
+                location=job_data.get('location'),
+                url=job_data.get('url', 'No URL'),
+                source=job_data.get('source', 'Unknown'),
+                job_id=job_data.get('job_id', f"manual-{datetime.now().timestamp()}"),
+                publication_date=_normalize_datetime_to_utc(job_data.get('publication_date')),
+                tags=job_data.get('tags'),
+                salary=job_data.get('salary'),
+                job_type=job_data.get('job_type')
+            )
+            rows.append(job_to_row(job_create))
+        except Exception as e:
+            skipped += 1
+            logger.warning(f"⚠️ Error preparing job {job_data.get('job_id', 'N/A')}: {e}")
+    return save_job_rows(rows, update_existing=update_existing, skipped=skipped)
+
+
+def save_job_rows(rows: List[Dict[str, Any]], update_existing: bool = False, skipped: int = 0) -> Dict[str, int]:
+    """
+    Upserts rows that are already validated and normalized (JobColumns.rows()
+    or job_to_row output), skipping the per-job JobCreate round trip.
+    `skipped` counts jobs the caller already dropped, for the returned counts.
+    The new jobs are then matched against the saved searches.
+    """
+    counts = {"inserted": 0, "updated": 0, "skipped": skipped, "duplicates": 0, "failed": 0}
+    new_jobs: List[Tuple[int, Dict[str, Any]]] = []
+    with stage("store_batch", STORE_BATCH_SECONDS):
+        db = SessionLocal()
+        try:
+            result = bulk_upsert_jobs(db, rows, update_existing=update_existing, new_jobs=new_jobs)
+            db.commit()
+            for key, value in result.items():
+                counts[key] += value
+            logger.info(
+                f"✅ Attempted to save {len(rows) + skipped} jobs. Inserted {counts['inserted']}, "
+                f"updated {counts['updated']}, skipped {counts['skipped']}, "
+                f"grouped {counts['duplicates']} as duplicates."
+            )
+        except Exception as e:
+            db.rollback()
+            counts["failed"] = len(rows)
+            logger.error(f"❌ Database transaction error: {e}", exc_info=True)
+        finally:
+            db.close()
+    for name, value in counts.items():
+        STORED_JOBS.labels(result=name).inc(value)
+    if new_jobs and not counts["failed"]:
+        match_saved_searches(new_jobs)
+    return counts
+
+
+def match_saved_searches(new_jobs: List[Tuple[int, Dict[str, Any]]]) -> int:
+    """
+    Records which saved searches the just-stored jobs match. Runs in its own
+    transaction: a failure here loses alerts, never the jobs themselves.
+    """
+    with stage("match_saved_searches", SAVED_SEARCH_MATCH_SECONDS):
+        db = SessionLocal()
+        try:
+            matched = record_matches(db, new_jobs)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Error matching saved searches: {e}", exc_info=True)
+            return 0
+        finally:
+            db.close()
+    SAVED_SEARCH_MATCHES.inc(matched)
+    if matched:
+        logger.info(f"🔔 {len(new_jobs)} new jobs matched saved searches {matched} times.")
+    return matched
+
+
+def save_job_columns(columns: JobColumns, update_existing: bool = False) -> Dict[str, int]:
+    """
+    Stores a batch from the columnar normalization stage.
+    """
+    return save_job_rows(columns.rows(), update_existing=update_existing, skipped=columns.skipped)
 
 
 if __name__ == "__main__":
     """
-    This block runs only when aggregator.py is executed directly.
-    It's for testing the aggregation logic independently.
+    Runs one aggregation outside Celery, for testing it independently:
+    python -m app.services.aggregator
     """
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     search_term = "engineer"
     jobs = aggregate_jobs(search_term)
     if jobs:
@@ -0,0 +1,253 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import redis
+
+from app.services.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENABLED = os.getenv("API_CACHE_ENABLED", "true").lower() == "true"
+CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", "1024"))
+CACHE_TTL = float(os.getenv("API_CACHE_TTL", "300"))
+CACHE_USE_REDIS = os.getenv("API_CACHE_REDIS", "false").lower() == "true"
+# How long a process trusts its last read of the generation counter.
+GENERATION_POLL_INTERVAL = float(os.getenv("API_CACHE_GENERATION_POLL", "1.0"))
+
+GENERATION_KEY = "jobs:cache:generation"
+REDIS_KEY_PREFIX = "jobs:cache:response:"
+
+# After a Redis error, skip Redis for this many seconds instead of paying a
+# connect timeout on every request.
+REDIS_RETRY_AFTER = 30.0
+
+_redis_client: Optional[redis.Redis] = None
+_redis_down_until = 0.0
+_redis_lock = threading.Lock()
+
+
+def mark_redis_unavailable(error: Exception) -> None:
+    global _redis_down_until
+    _redis_down_until = time.monotonic() + REDIS_RETRY_AFTER
+    logger.warning(f"⚠️ Redis unavailable, caching locally for {REDIS_RETRY_AFTER:.0f}s: {error}")
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """
+    Returns a shared client for the Redis configured in celery_client, or None
+    if it cannot be created or recently failed.
+    """
+    global _redis_client
+    if time.monotonic() < _redis_down_until:
+        return None
+    if _redis_client is None:
+        with _redis_lock:
+            if _redis_client is None:
+                from app.celery_client import redis_url
+                try:
+                    _redis_client = redis.Redis.from_url(
+                        redis_url, socket_timeout=0.5, socket_connect_timeout=0.5
+                    )
+                except (redis.RedisError, ValueError) as e:
+                    mark_redis_unavailable(e)
+                    return None
+    return _redis_client
+
+
+class _Generation:
+    """
+    Cache generation counter. Every data change bumps it, which orphans all
+    cached responses at once. The authoritative value lives in Redis so that
+    bumps from Celery workers reach the API processes; a local counter is used
+    when Redis is unreachable.
+    """
+
+    def __init__(self) -> None:
+        self._value = 0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() - self._checked_at < GENERATION_POLL_INTERVAL
+
+    def current(self) -> int:
+        now = time.monotonic()
+        if now - self._checked_at < GENERATION_POLL_INTERVAL:
+            return self._value
+        with self._lock:
+            self._checked_at = now
+            client = get_redis()
+            if client is not None:
+                try:
+                    self._value = int(client.get(GENERATION_KEY) or 0)
+                except redis.RedisError as e:
+                    mark_redis_unavailable(e)
+        return self._value
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            self._checked_at = 0.0
+            client = get_redis()
+            if client is not None:
+                try:
+                    self._value = int(client.incr(GENERATION_KEY))
+                except redis.RedisError as e:
+                    mark_redis_unavailable(e)
+        return self._value
+
+
+generation = _Generation()
+
+
+def bump_generation() -> int:
+    """
+    Invalidates every cached API response. Call after committing job changes.
+    """
+    value = generation.bump()
+    logger.info(f"♻️ Response cache generation bumped to {value}.")
+    return value
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    expires_at: float = 0.0
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def make_cache_key(namespace: str, params: Dict[str, Any]) -> str:
+    """
+    Builds a key from already-normalized request parameters and the current
+    generation, so a bump makes every older key unreachable.
+    """
+    encoded = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+    digest = hashlib.sha1(encoded.encode()).hexdigest()
+    return f"{namespace}:{generation.current()}:{digest}"
+
+
+async def make_cache_key_async(namespace: str, params: Dict[str, Any]) -> str:
+    """
+    make_cache_key for the event loop: the periodic Redis read of the
+    generation runs in a worker thread.
+    """
+    if not generation.is_fresh():
+        await asyncio.to_thread(generation.current)
+    return make_cache_key(namespace, params)
+
+
+class ResponseCache:
+    """
+    Two-tier response cache: a per-process LRU in front of an optional shared
+    Redis tier. Entries expire after `ttl` seconds as a safety net; freshness
+    normally comes from the generation embedded in the key.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL, use_redis: bool = CACHE_USE_REDIS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.use_redis = use_redis
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._get_local(key)
+        if entry is not None:
+            return entry
+        return self._get_shared(key)
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        entry.expires_at = time.monotonic() + self.ttl
+        self._store_local(key, entry)
+        self._set_in_redis(key, entry)
+
+    async def get_async(self, key: str) -> Optional[CachedResponse]:
+        """
+        get for the event loop: only the Redis tier runs in a worker thread.
+        """
+        entry = self._get_local(key)
+        if entry is not None:
+            return entry
+        if self.use_redis:
+            return await asyncio.to_thread(self._get_shared, key)
+        return self._get_shared(key)
+
+    async def set_async(self, key: str, entry: CachedResponse) -> None:
+        entry.expires_at = time.monotonic() + self.ttl
+        self._store_local(key, entry)
+        if self.use_redis:
+            await asyncio.to_thread(self._set_in_redis, key, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _get_local(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    CACHE_LOOKUPS.labels(result="local_hit").inc()
+                    return entry
+                del self._entries[key]
+        return None
+
+    def _get_shared(self, key: str) -> Optional[CachedResponse]:
+        entry = self._get_from_redis(key)
+        if entry is not None:
+            self._store_local(key, entry)
+        CACHE_LOOKUPS.labels(result="miss" if entry is None else "redis_hit").inc()
+        return entry
+
+    def _store_local(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_from_redis(self, key: str) -> Optional[CachedResponse]:
+        client = get_redis() if self.use_redis else None
+        if client is None:
+            return None
+        try:
+            raw = client.get(REDIS_KEY_PREFIX + key)
+        except redis.RedisError as e:
+            mark_redis_unavailable(e)
+            return None
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return CachedResponse(
+            body=data["body"].encode(),
+            etag=data["etag"],
+            headers=data["headers"],
+            expires_at=time.monotonic() + self.ttl,
+        )
+
+    def _set_in_redis(self, key: str, entry: CachedResponse) -> None:
+        client = get_redis() if self.use_redis else None
+        if client is None:
+            return
+        payload = json.dumps({"body": entry.body.decode(), "etag": entry.etag, "headers": entry.headers})
+        try:
+            client.set(REDIS_KEY_PREFIX + key, payload, ex=int(self.ttl))
+        except redis.RedisError as e:
+            mark_redis_unavailable(e)
+
+
+jobs_cache = ResponseCache()
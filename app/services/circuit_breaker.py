@@ -0,0 +1,131 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import redis
+
+from app.services.cache import get_redis, mark_redis_unavailable
+
+logger = logging.getLogger(__name__)
+
+# Failures (connection errors, timeouts, 429/5xx) within BREAKER_WINDOW seconds
+# that open a source's circuit, and how long it then stays open.
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("SCRAPER_BREAKER_THRESHOLD", "5"))
+BREAKER_WINDOW = int(os.getenv("SCRAPER_BREAKER_WINDOW", "300"))
+BREAKER_COOLDOWN = int(os.getenv("SCRAPER_BREAKER_COOLDOWN", "120"))
+# How long a half-open probe may take before another worker may probe.
+BREAKER_PROBE_TIMEOUT = int(os.getenv("SCRAPER_BREAKER_PROBE_TIMEOUT", "60"))
+
+BREAKER_KEY_PREFIX = "scrape:breaker:"
+
+
+class _LocalStore:
+    """
+    The few Redis commands the breaker uses, in process memory. Used when
+    Redis is unreachable; the breaker then only covers this process.
+    """
+
+    def __init__(self) -> None:
+        self._values: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[Any]:
+        value, expires_at = self._values.get(key, (None, 0.0))
+        if value is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        return value
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._get(key)
+
+    def exists(self, key: str) -> int:
+        return int(self.get(key) is not None)
+
+    def set(self, key: str, value: Any, nx: bool = False, ex: int = 0) -> bool:
+        with self._lock:
+            if nx and self._get(key) is not None:
+                return False
+            self._values[key] = (value, time.monotonic() + ex)
+            return True
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            current = self._get(key)
+            expires_at = self._values[key][1] if current is not None else float("inf")
+            self._values[key] = (int(current or 0) + 1, expires_at)
+            return self._values[key][0]
+
+    def expire(self, key: str, seconds: int) -> None:
+        with self._lock:
+            if self._get(key) is not None:
+                self._values[key] = (self._values[key][0], time.monotonic() + seconds)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+
+_local_store = _LocalStore()
+
+
+class CircuitBreaker:
+    """
+    Per-source circuit breaker whose state lives in Redis, so all workers
+    share it. While closed, failures are counted over BREAKER_WINDOW; once
+    BREAKER_FAILURE_THRESHOLD are reached the circuit opens and requests fail
+    fast for BREAKER_COOLDOWN. It is then half-open: one probe request at a
+    time is let through, and its outcome closes or reopens the circuit.
+
+    Methods block on Redis briefly; call them from a thread in async code.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._failures_key = f"{BREAKER_KEY_PREFIX}{name}:failures"
+        self._open_key = f"{BREAKER_KEY_PREFIX}{name}:open"
+        self._probe_key = f"{BREAKER_KEY_PREFIX}{name}:probe"
+
+    def _run(self, operation):
+        store = get_redis()
+        if store is not None:
+            try:
+                return operation(store)
+            except redis.RedisError as e:
+                mark_redis_unavailable(e)
+        return operation(_local_store)
+
+    def allow(self) -> bool:
+        """
+        Whether a request may be sent now.
+        """
+        def operation(store) -> bool:
+            if store.exists(self._open_key):
+                return False
+            if int(store.get(self._failures_key) or 0) < BREAKER_FAILURE_THRESHOLD:
+                return True
+            return bool(store.set(self._probe_key, 1, nx=True, ex=BREAKER_PROBE_TIMEOUT))
+
+        return self._run(operation)
+
+    def record_success(self) -> None:
+        self._run(lambda store: store.delete(self._failures_key, self._probe_key))
+
+    def record_failure(self) -> None:
+        def operation(store) -> None:
+            failures = store.incr(self._failures_key)
+            store.expire(self._failures_key, max(BREAKER_WINDOW, BREAKER_COOLDOWN + BREAKER_PROBE_TIMEOUT))
+            if failures >= BREAKER_FAILURE_THRESHOLD:
+                store.set(self._open_key, 1, ex=BREAKER_COOLDOWN)
+                store.delete(self._probe_key)
+                if failures == BREAKER_FAILURE_THRESHOLD:
+                    logger.warning(
+                        f"🔌 Circuit for {self.name} opened after {failures} failures; "
+                        f"failing fast for {BREAKER_COOLDOWN}s."
+                    )
+
+        self._run(operation)
@@ -0,0 +1,289 @@
+import logging
+import sys
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta, timezone
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pydantic import HttpUrl, TypeAdapter, ValidationError
+
+try:
+    import numpy as np
+except ImportError:  # optional; epochs are then converted one by one
+    np = None
+
+if TYPE_CHECKING:
+    from app.scrapers.base import JobSource
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+_url_adapter = TypeAdapter(HttpUrl)
+
+
+def naive_utc(value: datetime) -> datetime:
+    """
+    The naive UTC form publication dates are stored (and compared) in.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def parse_epochs(values: Sequence[Any]) -> List[Optional[datetime]]:
+    """
+    Converts Unix timestamps to naive UTC datetimes in one pass. Missing or
+    unusable values become None.
+    """
+    if np is not None and values:
+        try:
+            seconds = np.array(values, dtype="float64")
+        except (TypeError, ValueError):
+            pass
+        else:
+            missing = ~np.isfinite(seconds) | (seconds <= 0)
+            micros = np.where(missing, 0, np.round(seconds * 1e6)).astype("int64").astype("datetime64[us]")
+            dates = micros.tolist()
+            for index in np.flatnonzero(missing).tolist():
+                dates[index] = None
+            return dates
+    dates: List[Optional[datetime]] = []
+    for value in values:
+        try:
+            dates.append(_EPOCH + timedelta(seconds=float(value)) if value and float(value) > 0 else None)
+        except (TypeError, ValueError, OverflowError):
+            dates.append(None)
+    return dates
+
+
+def parse_iso_dates(values: Sequence[Any]) -> List[Optional[datetime]]:
+    """
+    Parses ISO 8601 strings to naive UTC datetimes (strings without an offset
+    are taken as UTC). Missing or unparsable values become None.
+    """
+    try:
+        dates = list(map(datetime.fromisoformat, values))
+    except (TypeError, ValueError):
+        dates = []
+        for value in values:
+            try:
+                dates.append(datetime.fromisoformat(value))
+            except (TypeError, ValueError):
+                dates.append(None)
+    return [naive_utc(date) if date is not None and date.tzinfo is not None else date for date in dates]
+
+
+def select_rows(
+    dates: Sequence[Optional[datetime]],
+    titles: Sequence[Any],
+    search_query: str = "",
+    since: Optional[datetime] = None,
+) -> List[bool]:
+    """
+    Which rows were published since `since` (undated rows count as new) and,
+    with a search query, have it in their title, ignoring case.
+    """
+    cutoff = naive_utc(since) if since else None
+    query = search_query.lower() if search_query else None
+    return [
+        (cutoff is None or date is None or date >= cutoff)
+        and (query is None or (isinstance(title, str) and query in title.lower()))
+        for date, title in zip(dates, titles)
+    ]
+
+
+class TagInterner:
+    """
+    Joins tag lists into the stored ","-separated form, sharing one string per
+    distinct tag set. Feeds repeat the same few tag sets across thousands of
+    jobs, so this is mostly dictionary lookups. Holds at most `max_entries`
+    tag sets; it starts over when full. Tags are strings: JobColumns.build
+    drops rows with any other kind.
+    """
+
+    def __init__(self, max_entries: int = 50_000) -> None:
+        self.max_entries = max_entries
+        self._joined: Dict[Any, Optional[str]] = {}
+
+    def join(self, value: Any) -> Optional[str]:
+        if not value:
+            return None
+        key = tuple(value) if isinstance(value, list) else value
+        try:
+            return self._joined[key]
+        except KeyError:
+            pass
+        raw_tags = value.split(",") if isinstance(value, str) else value
+        stripped = [tag.strip() for tag in raw_tags]
+        joined = ",".join(sys.intern(tag) for tag in stripped if tag) or None
+        if len(self._joined) >= self.max_entries:
+            self._joined.clear()
+        self._joined[key] = joined
+        return joined
+
+
+def _valid_tags(value: Any) -> bool:
+    # A joined string or a list of strings, as the per-job normalizers accept.
+    if not value or isinstance(value, str):
+        return True
+    return isinstance(value, list) and all(isinstance(tag, str) for tag in value)
+
+
+_tags = TagInterner()
+
+
+@dataclass
+class JobColumns:
+    """
+    A batch of normalized jobs as parallel columns. Dates are naive UTC and
+    tags are already joined, so rows() is exactly what bulk_upsert_jobs
+    stores; `skipped` counts raw jobs dropped as invalid.
+    """
+    title: List[str] = field(default_factory=list)
+    company_name: List[Optional[str]] = field(default_factory=list)
+    location: List[Optional[str]] = field(default_factory=list)
+    url: List[str] = field(default_factory=list)
+    source: List[str] = field(default_factory=list)
+    job_id: List[str] = field(default_factory=list)
+    publication_date: List[datetime] = field(default_factory=list)
+    tags: List[Optional[str]] = field(default_factory=list)
+    salary: List[Optional[str]] = field(default_factory=list)
+    job_type: List[Optional[str]] = field(default_factory=list)
+    skipped: int = 0
+
+    @classmethod
+    def build(
+        cls,
+        source: str,
+        job_id: List[Any],
+        title: List[Any],
+        url: List[Any],
+        publication_date: List[Optional[datetime]],
+        company_name: List[Any],
+        location: List[Any],
+        tags: List[Any],
+        salary: List[Any],
+        job_type: List[Any],
+        keep: Optional[Iterable[bool]] = None,
+        raw_dates: Optional[List[Any]] = None,
+    ) -> "JobColumns":
+        """
+        Assembles columns extracted from raw jobs, keeping the rows selected by
+        `keep` and dropping (and counting) rows JobCreate or the per-job
+        normalizers would reject: wrong types, non-string tags, invalid URLs,
+        and dates given in `raw_dates` that did not parse. Missing dates
+        become the current time, as in the per-job normalizers.
+        """
+        kept: List[int] = []
+        urls: List[str] = []
+        skipped = 0
+        rows = zip(
+            keep if keep is not None else repeat(True),
+            job_id, title, url, company_name, location, salary, job_type, tags,
+            publication_date, raw_dates if raw_dates is not None else repeat(None),
+        )
+        for index, row in enumerate(rows):
+            keep_row, row_id, row_title, row_url, company, place, pay, kind, row_tags, date, raw_date = row
+            if not keep_row:
+                continue
+            if not (
+                isinstance(row_title, str) and isinstance(row_id, str)
+                and (company is None or isinstance(company, str)) and (place is None or isinstance(place, str))
+                and (pay is None or isinstance(pay, str)) and (kind is None or isinstance(kind, str))
+                and _valid_tags(row_tags) and (date is not None or not raw_date)
+            ):
+                skipped += 1
+                continue
+            try:
+                urls.append(str(_url_adapter.validate_python(row_url)))
+            except ValidationError:
+                skipped += 1
+                continue
+            kept.append(index)
+
+        now = naive_utc(datetime.now(timezone.utc))
+        dates = [publication_date[index] for index in kept]
+        return cls(
+            title=[title[index] for index in kept],
+            company_name=[company_name[index] for index in kept],
+            location=[location[index] for index in kept],
+            url=urls,
+            source=[source] * len(kept),
+            job_id=[job_id[index] for index in kept],
+            publication_date=[date if date is not None else now for date in dates],
+            tags=[_tags.join(tags[index]) for index in kept],
+            salary=[salary[index] for index in kept],
+            job_type=[job_type[index] for index in kept],
+            skipped=skipped,
+        )
+
+    @classmethod
+    def from_jobs(cls, jobs: Sequence[Dict[str, Any]]) -> "JobColumns":
+        """
+        Columns of jobs already normalized one by one (normalize_job output).
+        """
+        columns = cls()
+        for source in dict.fromkeys(job.get("source") for job in jobs):
+            group = [job for job in jobs if job.get("source") == source]
+            dates = (job.get("publication_date") for job in group)
+            columns.extend(cls.build(
+                source=source if isinstance(source, str) else "Unknown",
+                publication_date=[naive_utc(date) if isinstance(date, datetime) else None for date in dates],
+                **{name: [job.get(name) for job in group] for name in _EXTRACTED_FIELDS},
+            ))
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.job_id)
+
+    def extend(self, other: "JobColumns") -> None:
+        for name in ROW_FIELDS:
+            getattr(self, name).extend(getattr(other, name))
+        self.skipped += other.skipped
+
+    def take(self, indices: Sequence[int]) -> "JobColumns":
+        return JobColumns(**{name: [getattr(self, name)[index] for index in indices] for name in ROW_FIELDS})
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """
+        One dict per job, in the shape of crud.job_to_row.
+        """
+        return [dict(zip(ROW_FIELDS, values)) for values in zip(*(getattr(self, name) for name in ROW_FIELDS))]
+
+    def newest(self, indices: Optional[Iterable[int]] = None) -> Optional[Tuple[datetime, str]]:
+        """
+        The latest (aware) publication date among the given rows, and its job_id.
+        """
+        candidates = range(len(self)) if indices is None else indices
+        newest = max(candidates, key=self.publication_date.__getitem__, default=None)
+        if newest is None:
+            return None
+        return self.publication_date[newest].replace(tzinfo=timezone.utc), self.job_id[newest]
+
+
+ROW_FIELDS = tuple(item.name for item in fields(JobColumns) if item.name != "skipped")
+_EXTRACTED_FIELDS = tuple(name for name in ROW_FIELDS if name not in ("source", "publication_date"))
+
+
+def normalize_batch(
+    source: "JobSource", raw_jobs: List[Any], search_query: str, since: Optional[datetime] = None
+) -> JobColumns:
+    """
+    Normalizes a batch of raw jobs with the source's columnar normalizer,
+    falling back to normalize_job per job if the batch cannot be converted
+    as a whole (e.g. an entry of an unexpected shape).
+    """
+    try:
+        return source.normalize_columns(raw_jobs, search_query, since)
+    except Exception as e:
+        logger.warning(f"⚠️ Columnar normalization of a {source.display_name} batch failed, going job by job: {e}")
+    jobs = []
+    for raw_job in raw_jobs:
+        try:
+            job = source.normalize_job(raw_job, search_query, since)
+        except Exception as e:
+            logger.error(f"Error normalizing {source.display_name} job: {e}", exc_info=True)
+            continue
+        if job:
+            jobs.append(job)
+    return JobColumns.from_jobs(jobs)
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import random
+import re
+import zlib
+from typing import FrozenSet, List, Optional
+
+from app.services.normalization import normalize_location
+
+# Signature layout: DEDUP_BANDS bands of DEDUP_ROWS MinHash values each. Two
+# jobs become candidates when any band matches, which happens with
+# probability 1 - (1 - J**rows)**bands for Jaccard similarity J: ~0.98 at
+# J=0.8 and ~0.04 at J=0.4 with the defaults. Changing them invalidates the
+# stored band keys.
+DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", "8"))
+DEDUP_ROWS = int(os.getenv("DEDUP_ROWS", "4"))
+# Candidates are confirmed on the exact Jaccard similarity of their features.
+DEDUP_SIMILARITY = float(os.getenv("DEDUP_SIMILARITY", "0.8"))
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+# Gender markers German boards append to titles: "(m/w/d)", "(f/m/x)".
+_GENDER_MARKER_RE = re.compile(r"\(\s*[mwfdx](?:\s*/\s*[mwfdx])+\s*\)", re.IGNORECASE)
+
+# Legal-form suffixes that boards include or drop at will.
+COMPANY_SUFFIXES = frozenset({
+    "ag", "bv", "co", "corp", "corporation", "gmbh", "inc", "incorporated",
+    "limited", "llc", "ltd", "plc", "sa", "sarl", "se", "srl",
+})
+
+# Fixed seed: signatures are stored, so the permutations must never change
+# between processes or releases.
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(DEDUP_BANDS * DEDUP_ROWS)
+]
+
+
+def _tokens(value: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall(value.lower()) if value else []
+
+
+def company_key(company_name: Optional[str]) -> FrozenSet[str]:
+    """
+    Company tokens without legal-form suffixes, so "Acme GmbH" and "ACME" agree.
+    """
+    return frozenset(token for token in _tokens(company_name) if token not in COMPANY_SUFFIXES)
+
+
+def job_features(title: Optional[str], company_name: Optional[str], location: Optional[str]) -> FrozenSet[str]:
+    """
+    The normalized (title, company, location) tokens a job is compared on,
+    tagged by field so a word in the title never matches the same word in the
+    company name.
+    """
+    features = {f"t:{token}" for token in _tokens(_GENDER_MARKER_RE.sub(" ", title or ""))}
+    features.update(f"c:{token}" for token in company_key(company_name))
+    features.update(f"l:{token}" for token in _tokens(normalize_location(location)))
+    return frozenset(features)
+
+
+def minhash(features: FrozenSet[str]) -> List[int]:
+    """
+    MinHash signature of a feature set, one value per permutation.
+    """
+    hashes = [zlib.crc32(feature.encode()) for feature in features] or [0]
+    return [
+        min((a * value + b) % _MERSENNE_PRIME for value in hashes) & _MAX_HASH
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def band_keys(features: FrozenSet[str], company: FrozenSet[str] = frozenset()) -> List[int]:
+    """
+    LSH band keys of a feature set as signed 64-bit integers, ready for an
+    indexed BIGINT column. Jobs sharing any key are duplicate candidates.
+
+    The company key is mixed into every band, so only postings of the same
+    company can collide. Without it generic titles ("Senior Software
+    Engineer") would put thousands of jobs in one bucket, all of them then
+    rejected by is_duplicate.
+    """
+    signature = minhash(features)
+    block = " ".join(sorted(company)).encode()
+    keys = []
+    for band in range(DEDUP_BANDS):
+        rows = signature[band * DEDUP_ROWS:(band + 1) * DEDUP_ROWS]
+        digest = hashlib.blake2b(
+            band.to_bytes(2, "big") + b"".join(value.to_bytes(4, "big") for value in rows) + block,
+            digest_size=8,
+        ).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def jaccard(left: FrozenSet[str], right: FrozenSet[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def is_duplicate(features: FrozenSet[str], company: FrozenSet[str],
+                 other_features: FrozenSet[str], other_company: FrozenSet[str]) -> bool:
+    """
+    Confirms an LSH candidate: same company, and near-identical normalized
+    title and location.
+    """
+    return company == other_company and jaccard(features, other_features) >= DEDUP_SIMILARITY
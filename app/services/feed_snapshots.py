@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+
+import httpx
+
+from app.scrapers.base import JobSource
+from app.scrapers.registry import get_sources
+from app.scrapers.source_client import (
+    FetchState,
+    conditional_headers,
+    get_shared_client,
+    iter_json_items,
+    open_stream,
+    run_async,
+)
+from app.services.fetch_engine import SOURCE_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Sources whose API ignores the search query (server_side_search = False) are
+# downloaded whole into a snapshot, and query scrapes filter the snapshot
+# locally instead of downloading the same feed again for every query.
+FEED_SNAPSHOTS_ENABLED = os.getenv("FEED_SNAPSHOTS_ENABLED", "true").lower() == "true"
+# Point this at a volume shared by all workers so each feed is fetched once.
+FEED_SNAPSHOT_DIR = os.getenv("FEED_SNAPSHOT_DIR", os.path.join(tempfile.gettempdir(), "job-feed-snapshots"))
+# Beat refreshes the snapshots (refresh_feed_snapshots); a query scrape only
+# fetches a feed itself if its snapshot is missing or older than this.
+FEED_SNAPSHOT_MAX_AGE = float(os.getenv("FEED_SNAPSHOT_MAX_AGE", "3600"))
+
+READ_CHUNK_SIZE = 64 * 1024
+# Data files kept per source besides the current one, for readers that
+# loaded the previous meta file just before it was replaced.
+KEEP_OLD_VERSIONS = 2
+
+
+@dataclass
+class FeedSnapshot:
+    """
+    The last full download of a source's feed. `version` is a digest of the
+    body, so a re-download of identical content keeps the same version, and
+    names the data file: a meta file only ever points at the body it
+    describes, whatever refreshes overlap.
+    """
+    source: str
+    version: str
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        return _data_path(self.source, self.version)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+def uses_snapshot(source: JobSource) -> bool:
+    return FEED_SNAPSHOTS_ENABLED and not source.server_side_search
+
+
+def _data_path(source_name: str, version: str) -> str:
+    return os.path.join(FEED_SNAPSHOT_DIR, f"{source_name}-{version}.json")
+
+
+def _meta_path(source_name: str) -> str:
+    return os.path.join(FEED_SNAPSHOT_DIR, f"{source_name}.meta.json")
+
+
+def load_snapshot(source_name: str) -> Optional[FeedSnapshot]:
+    try:
+        with open(_meta_path(source_name)) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    snapshot = FeedSnapshot(**meta)
+    if not os.path.exists(snapshot.path):
+        return None
+    return snapshot
+
+
+def _write_meta(snapshot: FeedSnapshot) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=FEED_SNAPSHOT_DIR, prefix=f".{snapshot.source}.meta.")
+    with os.fdopen(fd, "w") as f:
+        json.dump(asdict(snapshot), f)
+    os.replace(tmp_path, _meta_path(snapshot.source))
+
+
+def _prune_versions(snapshot: FeedSnapshot) -> None:
+    """
+    Deletes the source's data files but the current one and the
+    KEEP_OLD_VERSIONS newest others.
+    """
+    pattern = re.compile(rf"{re.escape(snapshot.source)}-[0-9a-f]+\.json")
+    paths = [
+        os.path.join(FEED_SNAPSHOT_DIR, name) for name in os.listdir(FEED_SNAPSHOT_DIR)
+        if pattern.fullmatch(name) and os.path.join(FEED_SNAPSHOT_DIR, name) != snapshot.path
+    ]
+    try:
+        paths.sort(key=os.path.getmtime, reverse=True)
+    except OSError:
+        return  # pruned concurrently; the next refresh tries again
+    for path in paths[KEEP_OLD_VERSIONS:]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+async def refresh_snapshot(
+    client: httpx.AsyncClient,
+    source: JobSource,
+    max_age: float = FEED_SNAPSHOT_MAX_AGE,
+    timeout: float = SOURCE_TIMEOUT,
+) -> FeedSnapshot:
+    """
+    Returns the snapshot of `source`, first downloading the full feed if the
+    snapshot is missing or older than `max_age`. The download is conditional
+    on the snapshot's validators and is streamed to a data file named by
+    its version; only then is the meta file atomically replaced to point at
+    it, so readers never see a partial feed or a body with another's
+    version.
+    """
+    current = load_snapshot(source.name)
+    if current is not None and current.age < max_age:
+        return current
+
+    url, params, headers = source.build_request("")
+    validators = FetchState(etag=current.etag, last_modified=current.last_modified) if current else None
+    os.makedirs(FEED_SNAPSHOT_DIR, exist_ok=True)
+    async with open_stream(
+        client, source, url, params=params, headers=conditional_headers(headers, validators), timeout=timeout
+    ) as response:
+        if response.status_code == 304 and current is not None:
+            current.fetched_at = time.time()
+            _write_meta(current)
+            return current
+        response.raise_for_status()
+
+        digest = hashlib.blake2b(digest_size=16)
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=FEED_SNAPSHOT_DIR, prefix=f".{source.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in response.aiter_bytes():
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, _data_path(source.name, digest.hexdigest()))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    snapshot = FeedSnapshot(
+        source=source.name,
+        version=digest.hexdigest(),
+        fetched_at=time.time(),
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+    _write_meta(snapshot)
+    _prune_versions(snapshot)
+    logger.info(f"📸 Saved {size / 1024:.0f} KiB snapshot of {source.display_name} (version {snapshot.version[:8]}).")
+    return snapshot
+
+
+async def _read_chunks(f) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await asyncio.to_thread(f.read, READ_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def iter_snapshot_items(snapshot: FeedSnapshot, prefix: str) -> AsyncIterator[Any]:
+    """
+    Yields the raw jobs of a snapshot, parsed incrementally from disk.
+    """
+    with open(snapshot.path, "rb") as f:
+        async for item in iter_json_items(_read_chunks(f), prefix):
+            yield item
+
+
+async def refresh_snapshots(
+    sources: Optional[Sequence[JobSource]] = None, max_age: float = 0, timeout: float = SOURCE_TIMEOUT
+) -> Dict[str, bool]:
+    """
+    Refreshes the snapshot of every snapshot-backed source concurrently.
+    Returns whether each refresh succeeded; a failed one keeps the old snapshot.
+    """
+    sources = [source for source in (get_sources() if sources is None else sources) if uses_snapshot(source)]
+    client = get_shared_client()
+    outcomes = await asyncio.gather(
+        *(refresh_snapshot(client, source, max_age, timeout) for source in sources), return_exceptions=True
+    )
+    results = {}
+    for source, outcome in zip(sources, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error(f"❌ Could not refresh the {source.display_name} snapshot: {outcome}")
+        results[source.name] = not isinstance(outcome, BaseException)
+    return results
+
+
+def refresh_snapshots_sync(**kwargs) -> Dict[str, bool]:
+    return run_async(refresh_snapshots(**kwargs))
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Optional, Sequence
+
+import httpx
+
+from app.scrapers.base import JobSource
+from app.scrapers.registry import get_sources
+from app.scrapers.source_client import FetchResult, FetchState, get_shared_client, run_async
+from app.services.metrics import SOURCE_FETCH_SECONDS, SOURCE_RAW_JOBS, stage
+
+logger = logging.getLogger(__name__)
+
+# Deadline for a single source, and for the whole fan-out.
+SOURCE_TIMEOUT = float(os.getenv("SCRAPE_SOURCE_TIMEOUT", "15"))
+TOTAL_TIMEOUT = float(os.getenv("SCRAPE_TOTAL_TIMEOUT", "20"))
+
+
+async def _fetch_source(
+    client: httpx.AsyncClient,
+    source: JobSource,
+    search_query: str,
+    timeout: float,
+    state: Optional[FetchState] = None,
+) -> FetchResult:
+    """
+    Fetches one source under its own deadline. Never raises: a failing or
+    slow source yields a failed, empty result (keeping its previous state) so
+    the other sources still count.
+    """
+    source_name = source.display_name or source.name
+    started = time.perf_counter()
+    with stage("fetch_source", SOURCE_FETCH_SECONDS, source=source.name, outcome="ok") as labels:
+        try:
+            result = await asyncio.wait_for(source.fetch(client, search_query, state), timeout=timeout)
+        except asyncio.TimeoutError:
+            labels["outcome"] = "timeout"
+            logger.warning(f"⏱️ {source_name} did not respond within {timeout:.1f}s. Skipping it.")
+            return FetchResult(state=state or FetchState(), failed=True)
+        except Exception as e:
+            labels["outcome"] = "error"
+            logger.error(f"❌ Failed to fetch from {source_name}: {e}", exc_info=True)
+            return FetchResult(state=state or FetchState(), failed=True)
+        if result.not_modified:
+            labels["outcome"] = "not_modified"
+    SOURCE_RAW_JOBS.labels(source=source.name).inc(len(result.jobs))
+
+    elapsed = time.perf_counter() - started
+    if result.not_modified:
+        logger.info(f"💤 {source_name} unchanged since the last scrape ({elapsed:.2f}s).")
+    else:
+        logger.info(f"✅ Successfully fetched {len(result.jobs)} jobs from {source_name} in {elapsed:.2f}s.")
+    return result
+
+
+async def fetch_all_sources(
+    search_query: str,
+    sources: Optional[Sequence[JobSource]] = None,
+    source_timeout: float = SOURCE_TIMEOUT,
+    total_timeout: float = TOTAL_TIMEOUT,
+    client: Optional[httpx.AsyncClient] = None,
+    states: Optional[Dict[str, FetchState]] = None,
+) -> Dict[str, FetchResult]:
+    """
+    Fetches every source concurrently over one pooled client.
+
+    Returns a mapping of source name to its FetchResult. `sources` defaults to
+    every enabled source in the registry. Sources that fail,
+    miss their own deadline, or are still running when the overall deadline
+    expires are marked failed with no jobs, so callers always get partial
+    results. `states` makes each source fetch incrementally.
+    """
+    sources = get_sources() if sources is None else sources
+    states = states or {}
+    client = client or get_shared_client()
+
+    tasks = {
+        source.name: asyncio.create_task(
+            _fetch_source(client, source, search_query, source_timeout, states.get(source.name))
+        )
+        for source in sources
+    }
+    if not tasks:
+        return {}
+
+    done, pending = await asyncio.wait(tasks.values(), timeout=total_timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+        late = [name for name, task in tasks.items() if task in pending]
+        logger.warning(f"⏱️ Overall deadline of {total_timeout:.1f}s reached. Dropping: {', '.join(late)}")
+
+    return {
+        name: task.result() if task in done
+        else FetchResult(state=states.get(name) or FetchState(), failed=True)
+        for name, task in tasks.items()
+    }
+
+
+def fetch_all_sources_sync(search_query: str, **kwargs) -> Dict[str, FetchResult]:
+    """
+    Blocking entry point for fetch_all_sources, for use from Celery tasks and scripts.
+    """
+    return run_async(fetch_all_sources(search_query, **kwargs))
+
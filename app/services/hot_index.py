@@ -0,0 +1,384 @@
+import bisect
+import heapq
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import redis
+from sqlalchemy import func, select
+
+from app.db.crud import LISTING_COLUMNS
+from app.db.database import SessionLocal
+from app.db.models import Job
+from app.db.pagination import decode_cursor, encode_cursor
+from app.db.search import indexed_terms, stem_terms, tokenize_query
+from app.schemas.job import JOB_LISTING_FIELDS
+from app.services.cache import get_redis, mark_redis_unavailable
+from app.services.metrics import SEARCH_SECONDS, stage
+from app.services.saved_search_matcher import JobTerms, SearchCriteria, matches
+
+logger = logging.getLogger(__name__)
+
+# Serve GET /api/jobs from an in-process index of the live jobs.
+HOT_INDEX_ENABLED = os.getenv("HOT_INDEX_ENABLED", "false").lower() == "true"
+# Above this many canonical jobs the index stays unloaded and the API keeps
+# reading the database.
+HOT_INDEX_MAX_JOBS = int(os.getenv("HOT_INDEX_MAX_JOBS", "200000"))
+# Without a notification, look for new jobs this often anyway, and reload
+# the whole index this often to pick up anything an increment cannot see.
+HOT_INDEX_POLL_SECONDS = float(os.getenv("HOT_INDEX_POLL_SECONDS", "30"))
+HOT_INDEX_RELOAD_SECONDS = float(os.getenv("HOT_INDEX_RELOAD_SECONDS", "3600"))
+# Increments re-read this many ids below the highest one loaded: ids are
+# allocated before the inserting transaction commits, so a lower id can
+# become visible after a higher one.
+HOT_INDEX_ID_OVERLAP = int(os.getenv("HOT_INDEX_ID_OVERLAP", "5000"))
+
+# Published to after jobs are stored ("insert") or updated / deleted ("reload").
+HOT_INDEX_CHANNEL = "jobs:hot-index"
+
+# Distinct queries whose stemmed terms are remembered; starts over when full.
+STEM_CACHE_SIZE = 10_000
+
+_ID = JOB_LISTING_FIELDS.index("id")
+_PUBLICATION_DATE = JOB_LISTING_FIELDS.index("publication_date")
+
+
+def publish_jobs_changed(reload: bool = False) -> None:
+    """
+    Tells the API processes' hot indexes to pick up new jobs, or to reload
+    after updates and deletes. Call after committing. Best effort: without
+    Redis the indexes still catch up on their next poll.
+    """
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.publish(HOT_INDEX_CHANNEL, "reload" if reload else "insert")
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+
+
+class HotJob:
+    """
+    A live job: its listing row (LISTING_COLUMNS) and what the filters read.
+    """
+    __slots__ = ("key", "row", "terms")
+
+    def __init__(self, row: Sequence[Any]) -> None:
+        self.row = tuple(row)
+        self.key = (self.row[_PUBLICATION_DATE], self.row[_ID])
+        self.terms = JobTerms.from_row(dict(zip(JOB_LISTING_FIELDS, self.row)))
+
+
+class PrefixIndex:
+    """
+    Postings from a string key to job ids, looked up by key prefix. The
+    sorted key list the prefix ranges come from is rebuilt lazily.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[int]] = {}
+        self._sorted: Optional[List[str]] = None
+
+    def add(self, key: str, job_pk: int) -> None:
+        postings = self._postings.get(key)
+        if postings is None:
+            postings = self._postings[key] = set()
+            self._sorted = None
+        postings.add(job_pk)
+
+    def prefix(self, prefix: str) -> Set[int]:
+        if self._sorted is None:
+            self._sorted = sorted(self._postings)
+        start = bisect.bisect_left(self._sorted, prefix)
+        end = bisect.bisect_left(self._sorted, prefix + "\U0010ffff", start)
+        if end - start == 1:
+            return self._postings[self._sorted[start]]
+        return set().union(*(self._postings[key] for key in self._sorted[start:end]))
+
+
+class _Snapshot:
+    """
+    The indexed jobs: records by id, their (publication_date, id) keys in
+    ascending order, and postings for the filters and for the terms the
+    database's full-text index holds for each job.
+    """
+
+    def __init__(self) -> None:
+        self.jobs: Dict[int, HotJob] = {}
+        self.order: List[Tuple[datetime, int]] = []
+        self.terms = PrefixIndex()
+        self.locations = PrefixIndex()
+        self.tags: Dict[str, Set[int]] = {}
+        self.job_types: Dict[str, Set[int]] = {}
+        self.max_id = 0
+
+    def add(self, job: HotJob) -> None:
+        job_pk = job.key[1]
+        self.jobs[job_pk] = job
+        if job.terms.location:
+            self.locations.add(job.terms.location, job_pk)
+        for tag in job.terms.tags:
+            self.tags.setdefault(tag, set()).add(job_pk)
+        if job.terms.job_type:
+            self.job_types.setdefault(job.terms.job_type, set()).add(job_pk)
+        self.max_id = max(self.max_id, job_pk)
+
+    def add_terms(self, terms: Iterable[Tuple[int, str]]) -> None:
+        for job_pk, term in terms:
+            if job_pk in self.jobs:
+                self.terms.add(term, job_pk)
+
+    def candidates(self, criteria: SearchCriteria, prefixes: Sequence[str] = ()) -> Optional[Set[int]]:
+        """
+        Ids of the jobs the postings allow, or None if nothing narrows them.
+        Every stemmed prefix must start one of a job's terms.
+        """
+        postings = [self.terms.prefix(prefix) for prefix in prefixes]
+        postings.extend(self.tags.get(tag, set()) for tag in criteria.tags)
+        if criteria.job_type:
+            postings.append(self.job_types.get(criteria.job_type, set()))
+        if criteria.location:
+            postings.append(self.locations.prefix(criteria.location))
+        if not postings:
+            return None
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+
+class HotIndex:
+    """
+    The canonical jobs held in memory, answering GET /api/jobs searches that
+    are ordered by date: term, tag, job type and location postings narrow
+    the candidates, which are then verified with the search_jobs filters and
+    walked in (publication_date, id) order.
+
+    The term postings hold each job's terms as the full-text index stores
+    them (stemmed lexemes on PostgreSQL, FTS5 porter tokens on SQLite), and
+    query terms are stemmed by the database too, once per distinct query,
+    so a query finds what search_jobs would find.
+
+    Loaded in full at startup, then kept current by a thread that adds newly
+    inserted jobs whenever a scrape publishes on HOT_INDEX_CHANNEL (or every
+    HOT_INDEX_POLL_SECONDS) and reloads everything after updates, deletes
+    and every HOT_INDEX_RELOAD_SECONDS.
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+        # Bumped whenever the contents change; part of the response cache key.
+        self.version = 0
+        self._data = _Snapshot()
+        self._stems: Dict[Tuple[str, ...], Optional[Tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._data.jobs)
+
+    def _load_rows(self, min_id: Optional[int] = None) -> List[Any]:
+        stmt = select(*LISTING_COLUMNS).where(Job.canonical_id.is_(None))
+        if min_id is not None:
+            stmt = stmt.where(Job.id > min_id)
+        db = SessionLocal()
+        try:
+            if min_id is None:
+                total = db.scalar(select(func.count()).select_from(Job).where(Job.canonical_id.is_(None)))
+                if total > HOT_INDEX_MAX_JOBS:
+                    raise OverflowError(f"{total} jobs exceed HOT_INDEX_MAX_JOBS={HOT_INDEX_MAX_JOBS}")
+            return db.execute(stmt).all()
+        finally:
+            db.close()
+
+    def _load_terms(self, job_pks: Optional[Sequence[int]] = None) -> List[Tuple[int, str]]:
+        db = SessionLocal()
+        try:
+            return indexed_terms(db, job_pks)
+        finally:
+            db.close()
+
+    def _term_prefixes(self, terms: Tuple[str, ...]) -> Optional[Tuple[str, ...]]:
+        """
+        SearchCriteria.term_prefixes of a query's terms, stemmed by the
+        database on the first search for them.
+        """
+        try:
+            return self._stems[terms]
+        except KeyError:
+            pass
+        db = SessionLocal()
+        try:
+            stems = stem_terms(db, terms)
+        finally:
+            db.close()
+        prefixes = SearchCriteria(0, terms, stems=None if stems is None else tuple(stems)).term_prefixes
+        if len(self._stems) >= STEM_CACHE_SIZE:
+            self._stems.clear()
+        self._stems[terms] = prefixes
+        return prefixes
+
+    def reload(self) -> None:
+        """
+        Rebuilds the index from the database, then swaps it in.
+        """
+        started = time.perf_counter()
+        try:
+            rows = self._load_rows()
+        except OverflowError as e:
+            with self._lock:
+                self.ready = False
+                self._data = _Snapshot()
+            logger.warning(f"⚠️ Hot index disabled, searches go to the database: {e}")
+            return
+        data = _Snapshot()
+        for row in rows:
+            data.add(HotJob(row))
+        # Read after the rows, so every loaded job's terms are committed.
+        data.add_terms(self._load_terms())
+        data.order = sorted(job.key for job in data.jobs.values())
+        with self._lock:
+            self._data = data
+            self.version += 1
+            self.ready = True
+        logger.info(f"🔥 Hot index loaded {len(rows)} jobs in {time.perf_counter() - started:.2f}s.")
+
+    def refresh(self) -> int:
+        """
+        Adds jobs inserted since the last load. Returns how many were new.
+        """
+        if not self.ready:
+            return 0
+        data = self._data
+        rows = self._load_rows(max(data.max_id - HOT_INDEX_ID_OVERLAP, 0))
+        new_jobs = [HotJob(row) for row in rows if row[_ID] not in data.jobs]
+        if new_jobs:
+            # Only this thread changes the index, so the merged order can be
+            # built without the lock; searches wait just for the swap.
+            order = list(heapq.merge(data.order, sorted(job.key for job in new_jobs)))
+            terms = self._load_terms([job.key[1] for job in new_jobs])
+            with self._lock:
+                for job in new_jobs:
+                    data.add(job)
+                data.add_terms(terms)
+                data.order = order
+                self.version += 1
+        return len(new_jobs)
+
+    def search(
+        self,
+        query=None,
+        location=None,
+        job_type=None,
+        tags=None,
+        min_salary=None,
+        skip=0,
+        limit=20,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+    ) -> Optional[Tuple[List[Tuple[Any, ...]], Optional[str]]]:
+        """
+        search_jobs_page with columns=LISTING_COLUMNS, answered from memory.
+        Returns None for what only the database can answer: relevance-ranked
+        text searches, queries whose stemmed terms do not decide the match
+        (see SearchCriteria.term_prefixes), or anything while the index is
+        not loaded.
+        """
+        if sort is None:
+            sort = "date" if cursor or not query else "relevance"
+        if not self.ready or sort != "date":
+            return None
+        terms = tuple(dict.fromkeys(tokenize_query(query or "")))
+        prefixes = self._term_prefixes(terms) if terms else ()
+        if prefixes is None:
+            return None
+        before = decode_cursor(cursor) if cursor else None
+        criteria = SearchCriteria.from_params(0, None, location, job_type, tags, min_salary)
+        wanted = skip + limit + 1
+
+        with stage("search_jobs", SEARCH_SECONDS, mode="hot_index"), self._lock:
+            data = self._data
+            candidates = data.candidates(criteria, prefixes)
+            end = bisect.bisect_left(data.order, before) if before else len(data.order)
+            if candidates is not None and len(candidates) * 8 < end:
+                keys: Iterable[Tuple[datetime, int]] = sorted(
+                    (key for key in (data.jobs[job_pk].key for job_pk in candidates) if before is None or key < before),
+                    reverse=True,
+                )
+            else:
+                keys = (data.order[index] for index in range(end - 1, -1, -1))
+            rows = []
+            for key in keys:
+                if candidates is not None and key[1] not in candidates:
+                    continue
+                job = data.jobs[key[1]]
+                if matches(criteria, job.terms):
+                    rows.append(job.row)
+                    if len(rows) == wanted:
+                        break
+
+        page = rows[skip:]
+        if len(page) <= limit:
+            return page, None
+        page = page[:limit]
+        return page, encode_cursor(page[-1][_PUBLICATION_DATE], page[-1][_ID])
+
+    def _listen(self) -> None:
+        pubsub = None
+        reloaded_at = time.monotonic()
+        while not self._stop.is_set():
+            message = None
+            if pubsub is None and get_redis() is not None:
+                try:
+                    from app.celery_client import redis_url
+                    # Its own connection, without the shared client's short read timeout.
+                    pubsub = redis.Redis.from_url(redis_url, socket_connect_timeout=0.5).pubsub()
+                    pubsub.subscribe(HOT_INDEX_CHANNEL)
+                except redis.RedisError as e:
+                    mark_redis_unavailable(e)
+                    pubsub = None
+            if pubsub is not None:
+                try:
+                    message = pubsub.get_message(ignore_subscribe_messages=True, timeout=HOT_INDEX_POLL_SECONDS)
+                except redis.RedisError as e:
+                    mark_redis_unavailable(e)
+                    pubsub = None
+            else:
+                self._stop.wait(HOT_INDEX_POLL_SECONDS)
+            if self._stop.is_set():
+                break
+            try:
+                if (message is not None and message["data"] == b"reload") or \
+                        time.monotonic() - reloaded_at >= HOT_INDEX_RELOAD_SECONDS or not self.ready:
+                    self.reload()
+                    reloaded_at = time.monotonic()
+                else:
+                    self.refresh()
+            except Exception as e:
+                logger.error(f"❌ Error refreshing the hot index: {e}", exc_info=True)
+        if pubsub is not None:
+            pubsub.close()
+
+    def start(self) -> None:
+        """
+        Loads the index and starts the refresh thread. Blocks for the load.
+        """
+        try:
+            self.reload()
+        except Exception as e:
+            logger.error(f"❌ Error loading the hot index, searches go to the database: {e}", exc_info=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, name="hot-index", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=HOT_INDEX_POLL_SECONDS + 1)
+            self._thread = None
+
+
+hot_index = HotIndex()
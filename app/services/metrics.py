@@ -0,0 +1,118 @@
+import glob
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+from app.services.tracing import span
+
+# With several processes (uvicorn workers, Celery pool processes) point this
+# at an empty directory: every process writes its samples there and any of
+# them serves the sum. It must be set before the processes start.
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+# Port of the Celery worker's own /metrics endpoint; 0 disables it.
+WORKER_METRICS_PORT = int(os.getenv("CELERY_METRICS_PORT", "0"))
+
+if MULTIPROC_DIR:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+SOURCE_FETCH_SECONDS = Histogram(
+    "jobs_source_fetch_seconds", "Time to fetch (and stream) one source for one scrape",
+    ["source", "outcome"], buckets=LATENCY_BUCKETS,
+)
+SOURCE_RAW_JOBS = Counter("jobs_source_raw_jobs", "Raw jobs read from sources", ["source"])
+SOURCE_RETRIES = Counter("jobs_source_retries", "Source requests retried", ["source", "reason"])
+SOURCE_CIRCUIT_REJECTIONS = Counter(
+    "jobs_source_circuit_rejections", "Source requests not sent because the circuit was open", ["source"]
+)
+NORMALIZE_SECONDS = Histogram(
+    "jobs_normalize_seconds", "Time spent normalizing the raw jobs of one source for one scrape",
+    ["source"], buckets=LATENCY_BUCKETS,
+)
+STORE_BATCH_SECONDS = Histogram(
+    "jobs_store_batch_seconds", "Time to upsert one batch of jobs", buckets=LATENCY_BUCKETS
+)
+STORED_JOBS = Counter("jobs_stored", "Jobs handed to the database writer, by outcome", ["result"])
+SEARCH_SECONDS = Histogram(
+    "jobs_search_seconds", "Database time of one job search", ["mode"], buckets=LATENCY_BUCKETS
+)
+CACHE_LOOKUPS = Counter("jobs_api_cache_lookups", "Response cache lookups, by tier that answered", ["result"])
+CLEANUP_SECONDS = Histogram("jobs_cleanup_seconds", "Duration of the expired-jobs cleanup", buckets=LATENCY_BUCKETS)
+CLEANUP_DELETED = Counter("jobs_cleanup_deleted", "Expired jobs deleted")
+SAVED_SEARCH_MATCH_SECONDS = Histogram(
+    "jobs_saved_search_match_seconds", "Matching a stored batch against the saved searches", buckets=LATENCY_BUCKETS
+)
+SAVED_SEARCH_MATCHES = Counter("jobs_saved_search_matches", "Saved-search matches recorded")
+HTTP_REQUESTS = Counter("jobs_http_requests", "API requests", ["method", "route", "status"])
+HTTP_REQUEST_SECONDS = Histogram(
+    "jobs_http_request_seconds", "API request latency", ["method", "route"], buckets=LATENCY_BUCKETS
+)
+
+
+@contextmanager
+def stage(name: str, histogram: Optional[Histogram] = None, **labels: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Times the block into `histogram` and traces it as a span called `name`.
+    Yields the labels, so the block can fill in ones only known at the end;
+    an "outcome" label becomes "error" if the block raises.
+    """
+    labels = dict(labels)
+    started = time.perf_counter()
+    with span(name, **labels) as current:
+        try:
+            yield labels
+        except BaseException:
+            if "outcome" in labels:
+                labels["outcome"] = "error"
+            raise
+        finally:
+            if histogram is not None:
+                (histogram.labels(**labels) if labels else histogram).observe(time.perf_counter() - started)
+            if current is not None:
+                current.set_attributes(labels)
+
+
+def _registry() -> CollectorRegistry:
+    if not MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_payload() -> Tuple[bytes, str]:
+    """
+    The current samples in the Prometheus text format, and its content type.
+    """
+    return generate_latest(_registry()), CONTENT_TYPE_LATEST
+
+
+def start_worker_metrics_server() -> None:
+    """
+    Serves the worker's metrics on CELERY_METRICS_PORT. Runs in the worker's
+    main process, before the pool starts, and clears samples of previous runs.
+    """
+    if not WORKER_METRICS_PORT:
+        return
+    if MULTIPROC_DIR:
+        for path in glob.glob(os.path.join(MULTIPROC_DIR, "*.db")):
+            os.remove(path)
+    start_http_server(WORKER_METRICS_PORT, registry=_registry())
+
+
+def mark_process_dead(pid: int) -> None:
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
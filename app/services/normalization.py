@@ -0,0 +1,118 @@
+import re
+from typing import Any, List, Optional, Tuple
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_JOB_TYPE_SEPARATOR_RE = re.compile(r"[\s\-_/]+")
+# A figure with the currency and "k" around it: "$100k", "EUR 50.000", "60,000 USD".
+_SALARY_NUMBER_RE = re.compile(
+    r"((?:[$€£¥₹]|\b(?:usd|eur|gbp|cad|aud|chf)\b)\s*)?"
+    r"(\d+(?:[.,]\d+)*)"
+    r"(\s*k(?![a-z]))?"
+    r"(\s*(?:usd|eur|gbp|cad|aud|chf)\b)?",
+    re.IGNORECASE,
+)
+# Pay quoted per hour, day, week or month; such ranges are not annual salaries.
+_NON_ANNUAL_RE = re.compile(
+    r"/\s*(?:h|hr|hour|d|day|wk|week|mo|month)\b"
+    r"|\b(?:per|an?|each)\s+(?:hour|day|week|month)\b"
+    r"|\b(?:hourly|daily|weekly|monthly)\b",
+    re.IGNORECASE,
+)
+
+# Canonical job types keyed by their separator-free spelling.
+JOB_TYPE_ALIASES = {
+    "fulltime": "full_time",
+    "full": "full_time",
+    "permanent": "full_time",
+    "parttime": "part_time",
+    "contract": "contract",
+    "contractor": "contract",
+    "freelance": "freelance",
+    "freelancer": "freelance",
+    "internship": "internship",
+    "intern": "internship",
+    "temporary": "temporary",
+    "other": "other",
+}
+
+# Salaries below this are assumed to be hourly or monthly figures and ignored.
+MIN_ANNUAL_SALARY = 1000
+
+# Bare four-digit numbers in this range are read as years ("Since 2015"),
+# unless a currency or "k" marks them as money.
+YEAR_RANGE = (1900, 2100)
+
+
+def normalize_location(value: Optional[str]) -> Optional[str]:
+    """
+    Lowercases and collapses whitespace so locations can be prefix-matched.
+    """
+    if not value:
+        return None
+    normalized = _WHITESPACE_RE.sub(" ", value).strip(" ,.;").lower()
+    return normalized or None
+
+
+def normalize_job_type(value: Optional[str]) -> Optional[str]:
+    """
+    Maps the spellings used by the different boards ("Full-Time", "full_time",
+    "full time") onto one canonical value.
+    """
+    if not value:
+        return None
+    words = [word for word in _JOB_TYPE_SEPARATOR_RE.split(value.lower()) if word]
+    if not words:
+        return None
+    key = "".join(words)
+    return JOB_TYPE_ALIASES.get(key, "_".join(words))
+
+
+def split_tags(value: Any) -> List[str]:
+    """
+    Splits a comma-joined tag string (or list) into unique lowercase tags.
+    """
+    if not value:
+        return []
+    raw_tags = value.split(",") if isinstance(value, str) else value
+    tags: List[str] = []
+    for tag in raw_tags:
+        tag = str(tag).strip().lower()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def _parse_salary_number(number: str, thousands: bool) -> float:
+    # A trailing group of one or two digits is decimals ("45.50", "1.5k");
+    # any other "." or "," separates thousands ("100,000", "50.000").
+    groups = re.split(r"[.,]", number)
+    if len(groups) > 1 and len(groups[-1]) <= 2:
+        amount = float("".join(groups[:-1]) + "." + groups[-1])
+    else:
+        amount = float("".join(groups))
+    return amount * 1000 if thousands else amount
+
+
+def parse_salary_range(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Extracts a numeric (min, max) annual salary range from free-form text such
+    as "$100k - $120k" or "50.000 - 60.000 EUR". A single figure yields
+    (figure, figure). Returns (None, None) when nothing usable is found,
+    including pay quoted per hour, day, week or month.
+    """
+    if not value:
+        return None, None
+    text = str(value)
+    if _NON_ANNUAL_RE.search(text):
+        return None, None
+    amounts = []
+    for currency_before, number, thousands, currency_after in _SALARY_NUMBER_RE.findall(text):
+        marked = bool(currency_before or thousands or currency_after)
+        if not marked and number.isdigit() and len(number) == 4 and YEAR_RANGE[0] <= int(number) <= YEAR_RANGE[1]:
+            continue
+        amount = int(_parse_salary_number(number, bool(thousands)))
+        if amount >= MIN_ANNUAL_SALARY:
+            amounts.append(amount)
+    if not amounts:
+        return None, None
+    return min(amounts), max(amounts)
@@ -0,0 +1,366 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+from app.db.crud import SAVE_BATCH_SIZE
+from app.scrapers.base import JobSource
+from app.scrapers.registry import get_sources
+from app.scrapers.source_client import (
+    FetchResult,
+    FetchState,
+    advance_watermark,
+    conditional_headers,
+    get_shared_client,
+    iter_json_items,
+    open_stream,
+    run_async,
+)
+from app.services.aggregator import save_job_columns
+from app.services.columnar import JobColumns, naive_utc, normalize_batch
+from app.services.feed_snapshots import iter_snapshot_items, refresh_snapshot, uses_snapshot
+from app.services.fetch_engine import SOURCE_TIMEOUT
+from app.services.metrics import NORMALIZE_SECONDS, SOURCE_FETCH_SECONDS, SOURCE_RAW_JOBS, stage
+from app.services.query_matcher import QueryMatcher
+
+logger = logging.getLogger(__name__)
+
+# Normalized batches allowed to wait for the writer. Together with the batch
+# size this bounds how many jobs are held in memory at once.
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))
+# Whole-run deadline. Large feeds stream for longer than a single request
+# deadline, so this is separate from SCRAPE_TOTAL_TIMEOUT.
+PIPELINE_TIMEOUT = float(os.getenv("PIPELINE_TIMEOUT", "600"))
+
+BatchWriter = Callable[[JobColumns], Dict[str, int]]
+
+_DONE = object()
+
+
+def _advance(state: FetchState, columns: JobColumns, indices: Optional[Sequence[int]] = None) -> None:
+    newest = columns.newest(indices)
+    if newest is not None:
+        advance_watermark(state, {"publication_date": newest[0], "job_id": newest[1]})
+
+
+async def _produce(
+    client: httpx.AsyncClient,
+    source: JobSource,
+    search_query: str,
+    state: Optional[FetchState],
+    queue: "asyncio.Queue",
+    batch_size: int,
+    timeout: float,
+) -> Dict[str, FetchResult]:
+    """
+    Streams one source: parses job objects incrementally, normalizes them a
+    batch at a time into columns and hands batches of `batch_size` jobs to
+    the writer through the bounded queue. Blocks (back-pressure) whenever the
+    writer falls behind.
+    """
+    url, params, headers = source.build_request(search_query)
+    since = state.since if state else None
+    previous = state or FetchState()
+    key = (source.name, search_query)
+
+    with stage("fetch_source", SOURCE_FETCH_SECONDS, source=source.name, outcome="ok") as labels:
+        async with open_stream(
+            client, source, url, params=params, headers=conditional_headers(headers, state), timeout=timeout
+        ) as response:
+            if response.status_code == 304:
+                labels["outcome"] = "not_modified"
+                return {search_query: FetchResult(state=previous, not_modified=True)}
+            response.raise_for_status()
+
+            new_state = FetchState(
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                watermark=previous.watermark,
+                watermark_job_id=previous.watermark_job_id,
+            )
+            fetched = 0
+            normalizing = 0.0
+
+            def normalize(raw_jobs: List[Any]) -> JobColumns:
+                nonlocal normalizing
+                started = time.perf_counter()
+                columns = normalize_batch(source, raw_jobs, search_query, since)
+                normalizing += time.perf_counter() - started
+                _advance(new_state, columns)
+                return columns
+
+            raw_jobs: List[Any] = []
+            batch = JobColumns()
+            async for raw_job in iter_json_items(response.aiter_bytes(), source.items_path):
+                fetched += 1
+                raw_jobs.append(raw_job)
+                if len(raw_jobs) >= batch_size:
+                    batch.extend(normalize(raw_jobs))
+                    raw_jobs = []
+                    if len(batch) >= batch_size:
+                        await queue.put((key, batch))
+                        batch = JobColumns()
+            batch.extend(normalize(raw_jobs))
+            if len(batch) or batch.skipped:
+                await queue.put((key, batch))
+        SOURCE_RAW_JOBS.labels(source=source.name).inc(fetched)
+        NORMALIZE_SECONDS.labels(source=source.name).observe(normalizing)
+
+    logger.info(f"Successfully streamed {fetched} raw jobs from {source.display_name}.")
+    return {search_query: FetchResult(state=new_state, counts={"fetched": fetched})}
+
+
+async def _produce_from_snapshot(
+    client: httpx.AsyncClient,
+    source: JobSource,
+    search_queries: Sequence[str],
+    states: Dict[str, Optional[FetchState]],
+    queue: "asyncio.Queue",
+    batch_size: int,
+    timeout: float,
+) -> Dict[str, FetchResult]:
+    """
+    Serves every query of a source that ignores the query server-side from
+    one pass over its feed snapshot (downloaded only if missing or stale).
+
+    Each job is matched against all queries at once. A job matching several
+    queries is written once, in the batches (and counts) of the first one, but
+    advances the watermark of each. A query whose state already records the
+    snapshot's version is not modified.
+    """
+    with stage("refresh_snapshot", SOURCE_FETCH_SECONDS, source=source.name, outcome="snapshot"):
+        snapshot = await refresh_snapshot(client, source, timeout=timeout)
+    previous = {query: states.get(query) or FetchState() for query in search_queries}
+    results = {
+        query: FetchResult(state=previous[query], not_modified=True)
+        for query in search_queries if previous[query].etag == snapshot.version
+    }
+    pending = [query for query in search_queries if query not in results]
+    if not pending:
+        return results
+
+    new_states = {
+        query: FetchState(
+            etag=snapshot.version,
+            watermark=previous[query].watermark,
+            watermark_job_id=previous[query].watermark_job_id,
+        )
+        for query in pending
+    }
+    sinces = [previous[query].since for query in pending]
+    since = None if None in sinces else min(sinces)
+    cutoffs = {query: naive_utc(previous[query].since) if previous[query].since else None for query in pending}
+    matcher = QueryMatcher(pending)
+    batches = {query: JobColumns() for query in pending}
+
+    async def dispatch(raw_jobs: List[Any]) -> float:
+        started = time.perf_counter()
+        columns = normalize_batch(source, raw_jobs, "", since)
+        elapsed = time.perf_counter() - started
+        matched: Dict[str, List[int]] = {query: [] for query in pending}
+        owned: Dict[str, List[int]] = {query: [] for query in pending}
+        for index, (title, date) in enumerate(zip(columns.title, columns.publication_date)):
+            owner = None
+            for query in matcher.match(title):
+                if cutoffs[query] and date < cutoffs[query]:
+                    continue
+                matched[query].append(index)
+                if owner is None:
+                    owner = query
+            if owner is not None:
+                owned[owner].append(index)
+        # Invalid raw jobs belong to no query; count them with the first.
+        batches[pending[0]].skipped += columns.skipped
+        for query in pending:
+            _advance(new_states[query], columns, matched[query])
+            batches[query].extend(columns.take(owned[query]))
+            if len(batches[query]) >= batch_size:
+                await queue.put(((source.name, query), batches[query]))
+                batches[query] = JobColumns()
+        return elapsed
+
+    fetched = 0
+    normalizing = 0.0
+    raw_jobs: List[Any] = []
+    async for raw_job in iter_snapshot_items(snapshot, source.items_path):
+        fetched += 1
+        raw_jobs.append(raw_job)
+        if len(raw_jobs) >= batch_size:
+            normalizing += await dispatch(raw_jobs)
+            raw_jobs = []
+    if raw_jobs:
+        normalizing += await dispatch(raw_jobs)
+    for query, batch in batches.items():
+        if len(batch) or batch.skipped:
+            await queue.put(((source.name, query), batch))
+    SOURCE_RAW_JOBS.labels(source=source.name).inc(fetched)
+    NORMALIZE_SECONDS.labels(source=source.name).observe(normalizing)
+
+    logger.info(f"Filtered {fetched} raw jobs from the {source.display_name} snapshot for {len(pending)} queries.")
+    for index, query in enumerate(pending):
+        # Raw jobs are read once for all queries; count them once.
+        results[query] = FetchResult(state=new_states[query], counts={"fetched": fetched if index == 0 else 0})
+    return results
+
+
+def _add_counts(results: Dict[Any, Dict[str, int]], key: Any, counts: Dict[str, int]) -> None:
+    totals = results.setdefault(key, {})
+    for name, value in counts.items():
+        totals[name] = totals.get(name, 0) + value
+
+
+async def _consume(queue: "asyncio.Queue", write_batch: BatchWriter, results: Dict[Any, Dict[str, int]]) -> None:
+    """
+    Writes batches as they arrive, in a worker thread so the event loop keeps
+    streaming meanwhile. Counts are accumulated per (source, query); a batch
+    whose write raised counts as failed, and the writer moves on.
+    """
+    while True:
+        item = await queue.get()
+        if item is _DONE:
+            return
+        key, batch = item
+        try:
+            counts = await asyncio.to_thread(write_batch, batch)
+        except Exception as e:
+            logger.error(f"❌ Failed to write a batch of {len(batch)} {key[0]} jobs: {e}", exc_info=True)
+            counts = {"failed": len(batch)}
+        _add_counts(results, key, counts)
+
+
+async def _close(queue: "asyncio.Queue", writer: "asyncio.Task", results: Dict[Any, Dict[str, int]]) -> None:
+    """
+    Lets the writer finish the queued batches and stop. If the writer died
+    instead, the queue is not waited on: whatever is left in it counts as
+    failed.
+    """
+    closing = asyncio.create_task(queue.put(_DONE))
+    await asyncio.wait({closing, writer}, return_when=asyncio.FIRST_COMPLETED)
+    closing.cancel()
+    try:
+        await writer
+    except Exception as e:
+        logger.error(f"❌ The batch writer stopped: {e}", exc_info=True)
+    while not queue.empty():
+        item = queue.get_nowait()
+        if item is not _DONE:
+            key, batch = item
+            _add_counts(results, key, {"failed": len(batch)})
+
+
+async def run_queries(
+    search_queries: Sequence[str],
+    sources: Optional[Sequence[JobSource]] = None,
+    states: Optional[Dict[str, Dict[str, FetchState]]] = None,
+    batch_size: int = SAVE_BATCH_SIZE,
+    queue_size: int = PIPELINE_QUEUE_SIZE,
+    write_batch: BatchWriter = save_job_columns,
+    connect_timeout: float = SOURCE_TIMEOUT,
+    timeout: float = PIPELINE_TIMEOUT,
+    client: Optional[httpx.AsyncClient] = None,
+) -> Dict[str, Dict[str, FetchResult]]:
+    """
+    Fetch -> normalize -> store, streaming, for several queries at once.
+    Sources are read concurrently and their batches are written as soon as
+    they are full, so peak memory depends on batch_size * queue_size rather
+    than on the size of the feeds.
+
+    Sources that search server-side are requested once per query. The others
+    are fetched at most once, into their feed snapshot, which is filtered for
+    all queries in a single pass.
+
+    Requests go through open_stream (retries, circuit breaker, rate limit)
+    on the loop's shared client unless `client` is given; `connect_timeout`
+    bounds each network operation.
+
+    `states` and the result are keyed by query, then by source name. Each
+    FetchResult has no jobs but carries the write counts. A source whose
+    stream or writes failed is marked failed, so callers know not to advance
+    its state.
+    """
+    search_queries = list(dict.fromkeys(search_queries))
+    sources = get_sources() if sources is None else sources
+    states = states or {}
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(queue_size, 1))
+    write_counts: Dict[Any, Dict[str, int]] = {}
+
+    started = time.perf_counter()
+    client = client or get_shared_client()
+    writer = asyncio.create_task(_consume(queue, write_batch, write_counts))
+    producers = {}
+    for source in sources:
+        if uses_snapshot(source):
+            source_states = {query: states.get(query, {}).get(source.name) for query in search_queries}
+            task = asyncio.create_task(_produce_from_snapshot(
+                client, source, search_queries, source_states, queue, batch_size, connect_timeout
+            ))
+            producers[task] = (source, search_queries)
+            continue
+        for query in search_queries:
+            task = asyncio.create_task(_produce(
+                client, source, query, states.get(query, {}).get(source.name), queue, batch_size, connect_timeout
+            ))
+            producers[task] = (source, [query])
+    if producers:
+        await asyncio.wait(producers, timeout=timeout)
+    for task in producers:
+        if not task.done():
+            task.cancel()
+    await asyncio.gather(*producers, return_exceptions=True)
+    await _close(queue, writer, write_counts)
+
+    results: Dict[str, Dict[str, FetchResult]] = {query: {} for query in search_queries}
+    for task, (source, queries) in producers.items():
+        if task.cancelled():
+            logger.warning(f"⏱️ {source.display_name} did not finish within {timeout:.0f}s.")
+            produced = {}
+        elif task.exception() is not None:
+            logger.error(f"❌ Failed to stream from {source.display_name}: {task.exception()}")
+            produced = {}
+        else:
+            produced = task.result()
+        # Queries sharing a snapshot pass share jobs, so one failed write fails them all.
+        write_failed = any(write_counts.get((source.name, query), {}).get("failed") for query in queries)
+        for query in queries:
+            previous = states.get(query, {}).get(source.name) or FetchState()
+            result = produced.get(query) or FetchResult(state=previous, failed=True)
+            result.counts = {**result.counts, **write_counts.get((source.name, query), {})}
+            if write_failed:
+                result.failed = True
+            results[query][source.name] = result
+
+    for query, by_source in results.items():
+        logger.info(f"📦 Pipeline for '{query}' finished in {time.perf_counter() - started:.2f}s: "
+                    + ", ".join(f"{name}={result.counts}" for name, result in by_source.items()))
+    return results
+
+
+async def run_pipeline(
+    search_query: str,
+    sources: Optional[Sequence[JobSource]] = None,
+    states: Optional[Dict[str, FetchState]] = None,
+    **kwargs,
+) -> Dict[str, FetchResult]:
+    """
+    run_queries for a single query. `states` and the result are keyed by source name.
+    """
+    results = await run_queries([search_query], sources, {search_query: states or {}}, **kwargs)
+    return results[search_query]
+
+
+def run_pipeline_sync(search_query: str, **kwargs) -> Dict[str, FetchResult]:
+    """
+    Blocking entry point for run_pipeline, for use from Celery tasks and
+    scripts. Runs on the thread's persistent loop (see run_async).
+    """
+    return run_async(run_pipeline(search_query, **kwargs))
+
+
+def run_queries_sync(search_queries: Sequence[str], **kwargs) -> Dict[str, Dict[str, FetchResult]]:
+    """
+    Blocking entry point for run_queries.
+    """
+    return run_async(run_queries(search_queries, **kwargs))
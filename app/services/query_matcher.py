@@ -0,0 +1,61 @@
+import re
+from typing import Dict, List, Sequence
+
+try:
+    import ahocorasick
+except ImportError:  # optional C extension; a regex prefilter is used instead
+    ahocorasick = None
+
+
+class QueryMatcher:
+    """
+    Matches job titles against many search queries in one pass, with the same
+    semantics as the per-source title filter: a query matches when it occurs
+    in the title, case-insensitively, and an empty query matches everything.
+
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, so the
+    cost per title does not grow with the number of queries. Otherwise one
+    precompiled alternation rejects non-matching titles and only the titles
+    it accepts are checked query by query.
+    """
+
+    def __init__(self, queries: Sequence[str]) -> None:
+        self.queries = list(dict.fromkeys(queries))
+        self._match_all = [query for query in self.queries if not query]
+        self._by_term: Dict[str, List[str]] = {}
+        for query in self.queries:
+            if query:
+                self._by_term.setdefault(query.lower(), []).append(query)
+
+        self._automaton = None
+        self._pattern = None
+        if not self._by_term:
+            return
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for term in self._by_term:
+                self._automaton.add_word(term, term)
+            self._automaton.make_automaton()
+        else:
+            terms = sorted(self._by_term, key=len, reverse=True)
+            self._pattern = re.compile("|".join(re.escape(term) for term in terms))
+
+    def match(self, text: str) -> List[str]:
+        """
+        Returns the queries that match `text`, in the order they were given.
+        """
+        if not self._by_term:
+            return list(self._match_all)
+        text = (text or "").lower()
+        if self._automaton is not None:
+            terms = {term for _, term in self._automaton.iter(text)}
+        elif self._pattern.search(text):
+            terms = {term for term in self._by_term if term in text}
+        else:
+            terms = set()
+        if not terms:
+            return list(self._match_all)
+        matched = set(self._match_all)
+        for term in terms:
+            matched.update(self._by_term[term])
+        return [query for query in self.queries if query in matched]
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Tuple
+
+import redis
+
+from app.services.cache import get_redis, mark_redis_unavailable
+
+if TYPE_CHECKING:
+    from app.scrapers.base import JobSource
+
+logger = logging.getLogger(__name__)
+
+# Requests per minute sent to one source, across all workers. A source can
+# set its own `rate_limit_per_minute`; SCRAPER_RATE_LIMITS overrides both,
+# e.g. "remotive=10,remoteok=4". 0 disables the limit.
+SCRAPER_RATE_LIMIT_PER_MINUTE = int(os.getenv("SCRAPER_RATE_LIMIT_PER_MINUTE", "30"))
+SCRAPER_RATE_LIMITS = {
+    name.strip(): int(limit)
+    for name, _, limit in (
+        item.partition("=") for item in os.getenv("SCRAPER_RATE_LIMITS", "").split(",") if "=" in item
+    )
+}
+
+RATE_KEY_PREFIX = "scrape:ratelimit:"
+WINDOW_SECONDS = 60
+
+# Fallback counters when Redis is unreachable; they only limit this process.
+_local_counts: Dict[Tuple[str, int], int] = {}
+_local_lock = threading.Lock()
+
+
+def rate_limit_for(source: "JobSource") -> int:
+    if source.name in SCRAPER_RATE_LIMITS:
+        return SCRAPER_RATE_LIMITS[source.name]
+    if source.rate_limit_per_minute is not None:
+        return source.rate_limit_per_minute
+    return SCRAPER_RATE_LIMIT_PER_MINUTE
+
+
+def _count_request(source_name: str, window: int) -> int:
+    client = get_redis()
+    if client is not None:
+        key = f"{RATE_KEY_PREFIX}{source_name}:{window}"
+        try:
+            pipe = client.pipeline()
+            pipe.incr(key)
+            pipe.expire(key, WINDOW_SECONDS * 2)
+            return pipe.execute()[0]
+        except redis.RedisError as e:
+            mark_redis_unavailable(e)
+    with _local_lock:
+        for stale in [key for key in _local_counts if key[1] < window]:
+            del _local_counts[stale]
+        _local_counts[(source_name, window)] = _local_counts.get((source_name, window), 0) + 1
+        return _local_counts[(source_name, window)]
+
+
+async def throttle(source: "JobSource") -> None:
+    """
+    Waits until `source` may be sent another request. Requests are counted
+    per one-minute window in Redis, so the limit holds across every worker
+    process; callers over the limit sleep until a later window (with jitter,
+    so they do not all retry at once).
+    """
+    limit = rate_limit_for(source)
+    if limit <= 0:
+        return
+    while True:
+        now = time.time()
+        window = int(now // WINDOW_SECONDS)
+        count = await asyncio.to_thread(_count_request, source.name, window)
+        if count <= limit:
+            return
+        delay = (window + 1) * WINDOW_SECONDS - now + random.uniform(0, 1)
+        logger.info(f"⏳ {source.display_name} rate limit of {limit}/min reached; waiting {delay:.1f}s.")
+        await asyncio.sleep(delay)
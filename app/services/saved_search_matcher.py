@@ -0,0 +1,175 @@
+from dataclasses import dataclass, field
+from typing import AbstractSet, Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+from app.db.search import tokenize_query
+from app.services.normalization import normalize_job_type, normalize_location, parse_salary_range, split_tags
+
+
+@dataclass(frozen=True)
+class SearchCriteria:
+    """
+    A saved search in matchable form: query terms, normalized filters.
+    `stems` is what the database's full-text search makes of each term
+    (app.db.search.stem_terms), unknown until one is asked.
+    """
+    id: int
+    terms: Tuple[str, ...] = ()
+    location: Optional[str] = None
+    job_type: Optional[str] = None
+    tags: Tuple[str, ...] = ()
+    min_salary: Optional[int] = None
+    stems: Optional[Tuple[Tuple[str, ...], ...]] = None
+
+    @classmethod
+    def from_params(cls, id: int = 0, query=None, location=None, job_type=None, tags=None, min_salary=None
+                    ) -> "SearchCriteria":
+        return cls(
+            id=id,
+            terms=tuple(dict.fromkeys(tokenize_query(query or ""))),
+            location=normalize_location(location),
+            job_type=normalize_job_type(job_type),
+            tags=tuple(split_tags(tags)),
+            min_salary=min_salary,
+        )
+
+    @classmethod
+    def from_search(cls, search: Any) -> "SearchCriteria":
+        return cls.from_params(
+            search.id, search.query, search.location, search.job_type, search.tags, search.min_salary
+        )
+
+    @property
+    def query(self) -> str:
+        return " ".join(self.terms)
+
+    @property
+    def term_prefixes(self) -> Optional[Tuple[str, ...]]:
+        """
+        The stemmed prefixes a job's indexed terms must each have one of for
+        the query to find it. None when that alone does not decide it: stems
+        unknown, a term split into several tokens (a phrase to FTS5), or no
+        term left after PostgreSQL's stop words.
+        """
+        if not self.terms:
+            return ()
+        if self.stems is None or any(len(stem) > 1 for stem in self.stems):
+            return None
+        return tuple(stem[0] for stem in self.stems if stem) or None
+
+
+@dataclass
+class JobTerms:
+    """
+    What a job offers to the filters, derived from a stored row as
+    search_jobs would see it. `tokens` are the job's terms as the full-text
+    index holds them (app.db.search.indexed_terms), when known.
+    """
+    location: Optional[str]
+    job_type: Optional[str]
+    tags: Set[str]
+    salary_max: Optional[int]
+    tokens: AbstractSet[str] = field(default_factory=frozenset)
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any], tokens: AbstractSet[str] = frozenset()) -> "JobTerms":
+        return cls(
+            location=normalize_location(row.get("location")),
+            job_type=normalize_job_type(row.get("job_type")),
+            tags={tag[:128] for tag in split_tags(row.get("tags"))},
+            salary_max=parse_salary_range(row.get("salary"))[1],
+            tokens=tokens,
+        )
+
+
+def matches(criteria: SearchCriteria, job: JobTerms) -> bool:
+    """
+    The filters of search_jobs: the location is a prefix, job_type is
+    equal, every tag is present, the top of the salary range reaches
+    min_salary and every stemmed query term prefixes one of the job's
+    indexed terms. Queries term_prefixes cannot decide pass here and are
+    left to the database.
+    """
+    prefixes = criteria.term_prefixes or ()
+    return (
+        (criteria.location is None or (job.location or "").startswith(criteria.location))
+        and (criteria.job_type is None or criteria.job_type == job.job_type)
+        and all(tag in job.tags for tag in criteria.tags)
+        and (criteria.min_salary is None or (job.salary_max is not None and job.salary_max >= criteria.min_salary))
+        and all(any(token.startswith(prefix) for token in job.tokens) for prefix in prefixes)
+    )
+
+
+class SavedSearchMatcher:
+    """
+    Matches jobs against many saved searches through an inverted index.
+
+    Each search is filed under one anchor that every matching job must
+    contain: a tag, else the least common of its stemmed query terms (by
+    `term_frequencies`, app.db.search.term_frequencies), else its job type
+    or its location prefix. A job is then verified only against the
+    searches filed under what it contains, so the cost per job follows the
+    job's own values and terms rather than the number of saved searches.
+    Only searches without any anchor (just min_salary, or nothing) are
+    checked against every job.
+    """
+
+    def __init__(
+        self, searches: Sequence[SearchCriteria], term_frequencies: Optional[Mapping[str, float]] = None
+    ) -> None:
+        frequencies = term_frequencies or {}
+        self.searches = {criteria.id: criteria for criteria in searches}
+        self._by_tag: Dict[str, List[SearchCriteria]] = {}
+        self._by_term: Dict[str, List[SearchCriteria]] = {}
+        self._by_job_type: Dict[str, List[SearchCriteria]] = {}
+        self._by_location: Dict[str, List[SearchCriteria]] = {}
+        self._unanchored: List[SearchCriteria] = []
+        for criteria in self.searches.values():
+            # Every token of a stem is a prefix the job has, phrases included.
+            tokens = {token for stem in criteria.stems or () for token in stem}
+            if criteria.tags:
+                self._by_tag.setdefault(criteria.tags[0], []).append(criteria)
+            elif tokens:
+                rarest = min(tokens, key=lambda token: (frequencies.get(token, 0), -len(token), token))
+                self._by_term.setdefault(rarest, []).append(criteria)
+            elif criteria.job_type:
+                self._by_job_type.setdefault(criteria.job_type, []).append(criteria)
+            elif criteria.location:
+                self._by_location.setdefault(criteria.location, []).append(criteria)
+            else:
+                self._unanchored.append(criteria)
+        self._term_lengths = sorted({len(term) for term in self._by_term})
+        self._location_lengths = sorted({len(location) for location in self._by_location})
+
+    def __len__(self) -> int:
+        return len(self.searches)
+
+    @staticmethod
+    def _by_prefix(index: Dict[str, List[SearchCriteria]], lengths: List[int], value: str) -> List[SearchCriteria]:
+        found: List[SearchCriteria] = []
+        for length in lengths:
+            if length > len(value):
+                break
+            found.extend(index.get(value[:length], ()))
+        return found
+
+    def _candidates(self, job: JobTerms) -> List[SearchCriteria]:
+        candidates = list(self._unanchored)
+        for tag in job.tags:
+            candidates.extend(self._by_tag.get(tag, ()))
+        for token in job.tokens:
+            candidates.extend(self._by_prefix(self._by_term, self._term_lengths, token))
+        if job.job_type:
+            candidates.extend(self._by_job_type.get(job.job_type, ()))
+        if job.location:
+            candidates.extend(self._by_prefix(self._by_location, self._location_lengths, job.location))
+        return candidates
+
+    def match(self, row: Mapping[str, Any], tokens: AbstractSet[str] = frozenset()) -> List[int]:
+        """
+        Ids of the saved searches the job row, with its indexed `tokens`,
+        matches, in ascending order. Searches whose query term_prefixes
+        cannot decide are included when their other filters match; the
+        caller confirms them with the database.
+        """
+        job = JobTerms.from_row(row, tokens)
+        return sorted({criteria.id for criteria in self._candidates(job) if matches(criteria, job)})
@@ -0,0 +1,126 @@
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import redis
+
+from app.services.cache import get_redis, mark_redis_unavailable
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on a scrape's run time. The in-flight claim expires after this
+# even if the worker died before releasing it.
+SCRAPE_LOCK_TTL = int(os.getenv("SCRAPE_LOCK_TTL", "900"))
+# How long a successful fetch of one source for a query is reused instead of
+# fetching that source again.
+SCRAPE_RESULT_TTL = int(os.getenv("SCRAPE_RESULT_TTL", "300"))
+
+LOCK_KEY_PREFIX = "scrape:inflight:"
+RESULT_KEY_PREFIX = "scrape:fetched:"
+SCHEDULED_KEY = "scrape:watchlist:scheduled"
+
+# Deletes the claim only if it still belongs to `task_id`, so a late release
+# cannot drop a newer scrape's claim.
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _query_key(search_query: Union[str, Sequence[str]]) -> str:
+    if not isinstance(search_query, str):
+        return ",".join(sorted({_query_key(query) for query in search_query}))
+    return (search_query or "").strip().lower()
+
+
+def claim_scrape(search_query: Union[str, Sequence[str]], task_id: str) -> Optional[str]:
+    """
+    Claims the scrape of `search_query` for `task_id` (single flight). Returns
+    None when the claim was taken, or the id of the scrape already in flight
+    for the same query. Without Redis every caller gets the claim.
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    key = LOCK_KEY_PREFIX + _query_key(search_query)
+    try:
+        for _ in range(2):
+            if client.set(key, task_id, nx=True, ex=SCRAPE_LOCK_TTL):
+                return None
+            existing = client.get(key)
+            if existing is not None:
+                return existing.decode()
+            # The claim expired between SET and GET; try once more.
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+    return None
+
+
+def release_scrape(search_query: Union[str, Sequence[str]], task_id: str) -> None:
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.eval(_RELEASE_SCRIPT, 1, LOCK_KEY_PREFIX + _query_key(search_query), task_id)
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+
+
+def get_recent_fetch(source_name: str, search_query: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the counts of a successful fetch of `source_name` for the query
+    within the last SCRAPE_RESULT_TTL seconds, if any.
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        raw = client.get(f"{RESULT_KEY_PREFIX}{source_name}:{_query_key(search_query)}")
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+        return None
+    return json.loads(raw) if raw is not None else None
+
+
+def remember_fetch(source_name: str, search_query: str, counts: Dict[str, int]) -> None:
+    client = get_redis()
+    if client is None or SCRAPE_RESULT_TTL <= 0:
+        return
+    try:
+        client.set(
+            f"{RESULT_KEY_PREFIX}{source_name}:{_query_key(search_query)}",
+            json.dumps(counts),
+            ex=SCRAPE_RESULT_TTL,
+        )
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+
+
+def get_scheduled_at(search_queries: Sequence[str]) -> Dict[str, float]:
+    """
+    Returns, per normalized query, when the watchlist scheduler last
+    dispatched it (epoch seconds). Empty without Redis.
+    """
+    client = get_redis()
+    keys: List[str] = list({_query_key(query) for query in search_queries})
+    if client is None or not keys:
+        return {}
+    try:
+        values = client.hmget(SCHEDULED_KEY, keys)
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+        return {}
+    return {key: float(value) for key, value in zip(keys, values) if value is not None}
+
+
+def mark_scheduled(search_queries: Sequence[str], timestamp: float) -> None:
+    client = get_redis()
+    if client is None or not search_queries:
+        return
+    try:
+        client.hset(SCHEDULED_KEY, mapping={_query_key(query): timestamp for query in search_queries})
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
@@ -0,0 +1,85 @@
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Sequence
+
+from sqlalchemy import func
+
+from app.db.database import SessionLocal
+from app.db.models import SourceState
+from app.scrapers.source_client import FetchResult, FetchState
+
+logger = logging.getLogger(__name__)
+
+
+def _state_query(search_query: str) -> str:
+    return (search_query or "").strip().lower()
+
+
+def load_fetch_states(search_query: str) -> Dict[str, FetchState]:
+    """
+    Loads the remembered state of every source for a query, keyed by source name.
+    """
+    db = SessionLocal()
+    try:
+        rows = db.query(SourceState).filter(SourceState.query == _state_query(search_query)).all()
+        return {
+            row.source: FetchState(
+                etag=row.etag,
+                last_modified=row.last_modified,
+                watermark=row.watermark.replace(tzinfo=timezone.utc) if row.watermark else None,
+                watermark_job_id=row.watermark_job_id,
+            )
+            for row in rows
+        }
+    finally:
+        db.close()
+
+
+def save_fetch_states(search_query: str, results: Dict[str, FetchResult]) -> None:
+    """
+    Persists the new state of every source that answered. Call only after the
+    fetched jobs are committed, otherwise the watermark would skip them.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        for source_name, result in results.items():
+            if result.failed:
+                continue
+            state = result.state
+            db.merge(SourceState(
+                source=source_name,
+                query=_state_query(search_query),
+                etag=state.etag,
+                last_modified=state.last_modified,
+                watermark=state.watermark,
+                watermark_job_id=state.watermark_job_id,
+                updated_at=now,
+            ))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Could not save source states for '{search_query}': {e}", exc_info=True)
+    finally:
+        db.close()
+
+
+def last_scraped_at(search_queries: Sequence[str]) -> Dict[str, float]:
+    """
+    Returns, per normalized query, the epoch seconds of its last successful
+    scrape of any source. Queries never scraped are missing.
+    """
+    keys = list({_state_query(query) for query in search_queries})
+    if not keys:
+        return {}
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(SourceState.query, func.max(SourceState.updated_at))
+            .filter(SourceState.query.in_(keys))
+            .group_by(SourceState.query)
+            .all()
+        )
+        return {query: updated_at.replace(tzinfo=timezone.utc).timestamp() for query, updated_at in rows}
+    finally:
+        db.close()
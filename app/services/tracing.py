@@ -0,0 +1,89 @@
+import logging
+import os
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Spans are recorded only when this is set and opentelemetry is installed,
+# which is imported by configure_tracing and nowhere else. The exporter
+# follows the standard OTEL_EXPORTER_OTLP_* variables.
+TRACING_ENABLED = os.getenv("OTEL_TRACING_ENABLED", "false").lower() == "true"
+
+# Set by configure_tracing; spans are no-ops until then.
+_tracer = None
+
+
+def configure_tracing(service_name: str) -> None:
+    """
+    Installs a tracer provider exporting over OTLP. Call once per process,
+    after forking (Celery runs it in every pool process).
+    """
+    global _tracer
+    if not TRACING_ENABLED or _tracer is not None:
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError as e:
+        logger.warning(f"⚠️ Tracing enabled but opentelemetry-sdk is missing: {e}")
+        return
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError:
+        try:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        except ImportError as e:
+            logger.warning(f"⚠️ Tracing enabled but no OTLP exporter is installed: {e}")
+            return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": os.getenv("OTEL_SERVICE_NAME", service_name)}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("job_aggregator")
+
+
+def instrument_fastapi(app) -> None:
+    """
+    Traces every request, continuing traces from incoming traceparent headers.
+    """
+    if not TRACING_ENABLED:
+        return
+    try:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    except ImportError as e:
+        logger.warning(f"⚠️ Tracing enabled but opentelemetry-instrumentation-fastapi is missing: {e}")
+        return
+    FastAPIInstrumentor.instrument_app(app)
+
+
+def instrument_celery() -> None:
+    """
+    Propagates the current trace into published tasks and continues it in
+    the worker. Needed on both sides: the API process and the worker.
+    """
+    if not TRACING_ENABLED:
+        return
+    try:
+        from opentelemetry.instrumentation.celery import CeleryInstrumentor
+    except ImportError as e:
+        logger.warning(f"⚠️ Tracing enabled but opentelemetry-instrumentation-celery is missing: {e}")
+        return
+    instrumentor = CeleryInstrumentor()
+    if not instrumentor.is_instrumented_by_opentelemetry:
+        instrumentor.instrument()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Any]]:
+    """
+    Runs the block in a child span of the current trace, or does nothing
+    when tracing is disabled or was not configured.
+    """
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
@@ -0,0 +1,82 @@
+import json
+import logging
+import os
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# JSON list of {"query": ..., "every_minutes": ..., "priority": ...} objects.
+# Without it, the comma-separated SCRAPE_QUERIES are watched with the defaults.
+SCRAPE_WATCHLIST_FILE = os.getenv("SCRAPE_WATCHLIST_FILE", "")
+SCRAPE_QUERIES = [query.strip() for query in os.getenv("SCRAPE_QUERIES", "job").split(",") if query.strip()]
+DEFAULT_EVERY_MINUTES = float(os.getenv("SCRAPE_DEFAULT_EVERY_MINUTES", "360"))
+# Most queries scraped together as one scrape (one fetch per source).
+WATCHLIST_BATCH_SIZE = int(os.getenv("WATCHLIST_BATCH_SIZE", "20"))
+# How often beat looks for due queries, and the share of that interval the
+# dispatched scrapes are spread over.
+WATCHLIST_TICK_MINUTES = int(os.getenv("WATCHLIST_TICK_MINUTES", "5"))
+WATCHLIST_SPREAD = float(os.getenv("WATCHLIST_SPREAD", "0.8"))
+
+
+@dataclass(frozen=True)
+class WatchEntry:
+    """
+    A query scraped on a schedule. Higher priorities are dispatched first
+    when several queries are due at once.
+    """
+    query: str
+    every_minutes: float = DEFAULT_EVERY_MINUTES
+    priority: int = 0
+
+    @property
+    def interval(self) -> float:
+        return self.every_minutes * 60
+
+
+def load_watchlist(path: Optional[str] = None) -> List[WatchEntry]:
+    """
+    Reads the watchlist from SCRAPE_WATCHLIST_FILE, falling back to
+    SCRAPE_QUERIES if it is not set or cannot be read. Duplicate queries
+    (ignoring case) keep their first entry.
+    """
+    path = SCRAPE_WATCHLIST_FILE if path is None else path
+    entries = [WatchEntry(query) for query in SCRAPE_QUERIES]
+    if path:
+        try:
+            with open(path) as f:
+                entries = [
+                    WatchEntry(
+                        query=str(item["query"]),
+                        every_minutes=float(item.get("every_minutes", DEFAULT_EVERY_MINUTES)),
+                        priority=int(item.get("priority", 0)),
+                    )
+                    for item in json.load(f)
+                ]
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.error(f"❌ Could not read the scrape watchlist '{path}', using SCRAPE_QUERIES: {e}")
+
+    unique: Dict[str, WatchEntry] = {}
+    for entry in entries:
+        entry = replace(entry, query=entry.query.strip())
+        if entry.query and entry.every_minutes > 0:
+            unique.setdefault(entry.query.lower(), entry)
+    return list(unique.values())
+
+
+def plan_batches(
+    entries: Sequence[WatchEntry],
+    last_run: Dict[str, float],
+    now: float,
+    batch_size: int = WATCHLIST_BATCH_SIZE,
+) -> List[List[WatchEntry]]:
+    """
+    Groups the entries that are due at `now` into batches of at most
+    `batch_size` queries, highest priority first and, within a priority, the
+    longest-overdue first. `last_run` maps lowercased queries to the epoch
+    seconds of their last scrape.
+    """
+    due = [entry for entry in entries if now - last_run.get(entry.query.lower(), 0) >= entry.interval]
+    due.sort(key=lambda entry: (-entry.priority, last_run.get(entry.query.lower(), 0)))
+    size = max(batch_size, 1)
+    return [due[start:start + size] for start in range(0, len(due), size)]
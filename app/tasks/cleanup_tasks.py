@@ -1,18 +1,103 @@
+import logging
+import os
+import time
 from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func, select
+
 from app.db.database import SessionLocal
+from app.db.facets import apply_facet_deltas, deletion_deltas, rebuild_facets
 from app.db.models import Job
+from app.services.cache import bump_generation
+from app.services.hot_index import publish_jobs_changed
+from app.services.metrics import CLEANUP_DELETED, CLEANUP_SECONDS, stage
 from celery import shared_task
 
+logger = logging.getLogger(__name__)
+
+# Jobs published longer ago than this are deleted by the daily cleanup.
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "14"))
+# Width of each primary-key range deleted in its own short transaction, and
+# the pause between ranges so replicas and concurrent writers keep up.
+CLEANUP_BATCH_SIZE = int(os.getenv("CLEANUP_BATCH_SIZE", "5000"))
+CLEANUP_BATCH_SLEEP = float(os.getenv("CLEANUP_BATCH_SLEEP", "0.1"))
+
+
+def delete_jobs_published_before(
+    cutoff: datetime, batch_size: int = CLEANUP_BATCH_SIZE, batch_sleep: float = CLEANUP_BATCH_SLEEP
+) -> int:
+    """
+    Deletes jobs published before `cutoff` one primary-key range at a time.
+
+    The id span of expired jobs comes from the (publication_date, id) index;
+    each range of `batch_size` ids is then deleted and committed on its own,
+    so no transaction holds locks on, or writes WAL for, more than
+    `batch_size` jobs (plus their cascaded tags and band keys). The range's
+    job_facets changes commit with it. Stops at the first failing range;
+    returns the number of jobs deleted until then.
+    """
+    cutoff = cutoff.astimezone(timezone.utc).replace(tzinfo=None) if cutoff.tzinfo else cutoff
+    session = SessionLocal()
+    try:
+        low, high = session.execute(
+            select(func.min(Job.id), func.max(Job.id)).where(Job.publication_date < cutoff)
+        ).one()
+    finally:
+        session.close()
+    if low is None:
+        return 0
+
+    deleted = 0
+    for start in range(low, high + 1, batch_size):
+        session = SessionLocal()
+        try:
+            in_range = (Job.id >= start, Job.id < start + batch_size, Job.publication_date < cutoff)
+            apply_facet_deltas(session, deletion_deltas(session, select(Job.id).where(*in_range)))
+            result = session.execute(
+                delete(Job).where(*in_range).execution_options(synchronize_session=False)
+            )
+            session.commit()
+            deleted += result.rowcount
+        except Exception as e:
+            session.rollback()
+            logger.error(f"❌ Error deleting old jobs with ids from {start}: {e}", exc_info=True)
+            break
+        finally:
+            session.close()
+        if batch_sleep and start + batch_size <= high:
+            time.sleep(batch_sleep)
+    return deleted
+
+
+@shared_task
+def delete_old_jobs(retention_days: Optional[int] = None):
+    retention_days = RETENTION_DAYS if retention_days is None else retention_days
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    with stage("delete_old_jobs", CLEANUP_SECONDS):
+        deleted_count = delete_jobs_published_before(cutoff_date)
+    CLEANUP_DELETED.inc(deleted_count)
+    if deleted_count:
+        bump_generation()
+        publish_jobs_changed(reload=True)
+    logger.info(f"🗑️ Deleted {deleted_count} jobs older than {retention_days} days.")
+
+
 @shared_task
-def delete_old_jobs():
+def rebuild_job_facets():
+    """
+    Recounts job_facets from the jobs table: fills it for data stored before
+    it existed and repairs any drift.
+    """
     session = SessionLocal()
     try:
-        cutoff_date = datetime.now(timezone.utc) - timedelta(weeks=2)
-        deleted_count = session.query(Job).filter(Job.publication_date < cutoff_date).delete()
+        values = rebuild_facets(session)
         session.commit()
-        print(f"🗑️ Deleted {deleted_count} jobs older than 2 weeks.")
     except Exception as e:
         session.rollback()
-        print(f"❌ Error deleting old jobs: {e}")
+        logger.error(f"❌ Error rebuilding job facets: {e}", exc_info=True)
+        raise
     finally:
         session.close()
+    bump_generation()
+    logger.info(f"📊 Rebuilt job facets: {values} values.")
@@ -1,10 +1,178 @@
+import logging
+import random
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from celery import chord, group
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.utils import uuid
+
 from app.celery_config import celery_app
-from app.services.aggregator import aggregate_jobs, save_jobs_to_db
+from app.scrapers.registry import get_source, get_sources
+from app.services.cache import bump_generation
+from app.services.feed_snapshots import refresh_snapshots_sync
+from app.services.hot_index import publish_jobs_changed
+from app.services.pipeline import run_queries_sync
+from app.services.scrape_coordination import (
+    claim_scrape,
+    get_recent_fetch,
+    get_scheduled_at,
+    mark_scheduled,
+    release_scrape,
+    remember_fetch,
+)
+from app.services.source_state import last_scraped_at, load_fetch_states, save_fetch_states
+from app.services.watchlist import WATCHLIST_SPREAD, WATCHLIST_TICK_MINUTES, load_watchlist, plan_batches
+
+logger = logging.getLogger(__name__)
+
+SearchTerms = Union[str, Sequence[str]]
+
+
+def _as_queries(search_term: SearchTerms) -> List[str]:
+    return [search_term] if isinstance(search_term, str) else list(search_term)
+
+
+@celery_app.task(name="app.tasks.scrape_tasks.scrape_source")
+def scrape_source(source_name: str, search_term: SearchTerms = "job", incremental: bool = True) -> Dict[str, Any]:
+    """
+    Streams one source straight into the database in batches, for one query
+    or a list of them, and once its batches are committed advances its state
+    per query. Never raises, so a failing source cannot block the chord; its
+    result is marked failed instead.
+
+    An incremental scrape skips the queries this source was fetched for
+    successfully within SCRAPE_RESULT_TTL; their jobs are already stored.
+    """
+    queries = _as_queries(search_term)
+    try:
+        if incremental:
+            queries = [query for query in queries if get_recent_fetch(source_name, query) is None]
+            if not queries:
+                return {"source": source_name, "failed": False, "not_modified": True, "reused": True, "counts": {}}
+
+        source = get_source(source_name)
+        states = {query: load_fetch_states(query) for query in queries} if incremental else {}
+        results = run_queries_sync(queries, sources=[source], states=states)
+        counts: Dict[str, int] = {}
+        for query, by_source in results.items():
+            save_fetch_states(query, by_source)
+            result = by_source[source_name]
+            if not result.failed:
+                remember_fetch(source_name, query, result.counts)
+            for key, value in result.counts.items():
+                counts[key] = counts.get(key, 0) + value
+    except SoftTimeLimitExceeded:
+        # Prefork pools only; on the threads pool no time limit interrupts
+        # the task (see TASK_TIME_LIMITS). Batches committed so far stay;
+        # the source state is not advanced.
+        logger.warning(f"⏱️ Scrape of {source_name} hit its soft time limit.")
+        return _failed_source(source_name)
+    except Exception as e:
+        # An unknown source or a database error before or after the fetch:
+        # still return, so finalize_scrape runs and releases the claim.
+        logger.error(f"❌ Scrape of {source_name} failed: {e}", exc_info=True)
+        return _failed_source(source_name)
+    source_results = [by_source[source_name] for by_source in results.values()]
+    return {
+        "source": source_name,
+        "failed": any(result.failed for result in source_results),
+        "not_modified": all(result.not_modified for result in source_results),
+        "counts": counts,
+    }
+
+
+def _failed_source(source_name: str) -> Dict[str, Any]:
+    return {"source": source_name, "failed": True, "not_modified": False, "counts": {}}
+
+
+@celery_app.task(name="app.tasks.scrape_tasks.refresh_feed_snapshots")
+def refresh_feed_snapshots() -> Dict[str, bool]:
+    """
+    Re-downloads the feed of every source that ignores the query server-side,
+    so query scrapes can be served from the snapshots without network I/O.
+    """
+    return refresh_snapshots_sync()
+
+
+@celery_app.task(bind=True, name="app.tasks.scrape_tasks.finalize_scrape")
+def finalize_scrape(self, source_results: List[Dict[str, Any]], search_term: SearchTerms = "job"):
+    """
+    Fan-in step: sums the per-source counts, invalidates cached listings if
+    anything changed and releases the query's in-flight claim. Its task id is
+    the scrape's id, so polling it tells when the whole scrape is done.
+    """
+    release_scrape(search_term, self.request.id)
+    totals = {"fetched": 0, "inserted": 0, "updated": 0, "skipped": 0, "duplicates": 0, "failed": 0}
+    for payload in source_results:
+        for key, value in payload.get("counts", {}).items():
+            totals[key] = totals.get(key, 0) + value
+
+    if totals["inserted"] or totals["updated"]:
+        bump_generation()
+        publish_jobs_changed(reload=bool(totals["updated"]))
+    failed_sources = [payload["source"] for payload in source_results if payload.get("failed")]
+    message = (
+        f"{totals['fetched']} jobs scraped for query: '{', '.join(_as_queries(search_term))}' "
+        f"({totals['inserted']} inserted, {totals['updated']} updated, {totals['skipped']} skipped, "
+        f"{totals['duplicates']} grouped as duplicates)"
+    )
+    if failed_sources:
+        message += f"; failed sources: {', '.join(failed_sources)}"
+    return message
+
 
 @celery_app.task(name="app.tasks.scrape_tasks.scrape_and_store_jobs")
-def scrape_and_store_jobs(search_term="job"):
-    jobs = aggregate_jobs(search_term)
-    if jobs:
-        save_jobs_to_db(jobs)
-        return f"{len(jobs)} jobs scraped and stored for query: '{search_term}'"
-    return "No jobs fetched."
+def scrape_and_store_jobs(search_term: SearchTerms = "job", incremental=True, task_id: Optional[str] = None):
+    """
+    Fans out one scrape_source task per registered source across the worker
+    pool and fans in to finalize_scrape, which runs under `task_id`. With a
+    list of queries, each source task serves all of them, so sources without
+    server-side search are still fetched at most once. Called
+    without one (e.g. by beat), it claims the query itself and does nothing
+    if a scrape for it is already in flight. Returns the scrape's id.
+    """
+    if task_id is None:
+        task_id = uuid()
+        in_flight = claim_scrape(search_term, task_id)
+        if in_flight is not None:
+            return in_flight
+
+    workflow = chord(
+        group(scrape_source.s(source.name, search_term, incremental) for source in get_sources()),
+        finalize_scrape.s(search_term).set(task_id=task_id),
+    )
+    try:
+        workflow.apply_async()
+    except Exception:
+        release_scrape(search_term, task_id)
+        raise
+    return task_id
+
+
+@celery_app.task(name="app.tasks.scrape_tasks.schedule_watchlist")
+def schedule_watchlist() -> List[List[str]]:
+    """
+    Beat entry point: dispatches the watchlist queries that are due as
+    batched scrapes, so each source is fetched once per batch, and spreads
+    the batches over the tick with random jitter, highest priority first.
+    Returns the dispatched batches.
+    """
+    entries = load_watchlist()
+    queries = [entry.query for entry in entries]
+    last_run = last_scraped_at(queries)
+    for query, scheduled_at in get_scheduled_at(queries).items():
+        last_run[query] = max(last_run.get(query, 0), scheduled_at)
+
+    now = time.time()
+    batches = plan_batches(entries, last_run, now)
+    slot = WATCHLIST_TICK_MINUTES * 60 * WATCHLIST_SPREAD / max(len(batches), 1)
+    dispatched = []
+    for index, batch in enumerate(batches):
+        batch_queries = [entry.query for entry in batch]
+        scrape_and_store_jobs.apply_async((batch_queries,), countdown=slot * index + random.uniform(0, slot))
+        mark_scheduled(batch_queries, now)
+        dispatched.append(batch_queries)
+    if dispatched:
+        logger.info(f"🗓️ Scheduled {sum(map(len, dispatched))} of {len(entries)} watched queries in {len(dispatched)} scrapes.")
+    return dispatched
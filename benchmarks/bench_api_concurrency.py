@@ -0,0 +1,157 @@
+"""
+Concurrent throughput of GET /api/jobs on a single uvicorn worker.
+
+Seeds a database with synthetic jobs, starts one uvicorn worker with the
+response cache disabled and drives it with many concurrent clients issuing
+a mix of listing, filtered and text-search requests. Prints requests per
+second and latency percentiles as JSON.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_api_concurrency --concurrency 64
+
+Without DATABASE_URL a temporary SQLite database is used.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REQUESTS = [
+    {"limit": 20},
+    {"limit": 50, "sort": "date"},
+    {"location": "berlin", "limit": 20},
+    {"job_type": "full time", "limit": 20},
+    {"tags": "python", "limit": 20},
+    {"min_salary": 100000, "limit": 20},
+    {"query": "python developer", "limit": 20},
+    {"query": "data", "location": "remote", "limit": 20},
+]
+
+
+def seed(jobs: int) -> None:
+    from app.db.crud import bulk_upsert_jobs
+    from app.db.database import SessionLocal, engine
+    from app.db.models import Base
+
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+    titles = ["Python Developer", "Data Engineer", "Frontend Engineer", "DevOps Engineer", "Product Manager"]
+    locations = ["Berlin, Germany", "Remote", "London", "New York", "Worldwide"]
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "title": f"{rng.choice(titles)} {i}",
+            "company_name": f"Company {i % 500}",
+            "location": rng.choice(locations),
+            "url": f"https://example.com/jobs/{i}",
+            "source": "bench",
+            "job_id": f"bench-{i}",
+            "publication_date": now - timedelta(minutes=i),
+            "tags": ",".join(rng.sample(["python", "django", "aws", "react", "sql", "go"], 3)),
+            "salary": f"${rng.randint(50, 150)}k - ${rng.randint(150, 200)}k",
+            "job_type": rng.choice(["Full-Time", "contract", "part time"]),
+        }
+        for i in range(jobs)
+    ]
+    db = SessionLocal()
+    try:
+        bulk_upsert_jobs(db, rows)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def load(base_url: str, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker(seed_value: int) -> None:
+            nonlocal errors
+            rng = random.Random(seed_value)
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get("/api/jobs", params=rng.choice(REQUESTS))
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 1),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 1),
+    }
+
+
+def wait_until_ready(base_url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/health").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("uvicorn did not start")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20_000, help="synthetic jobs to seed")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds of load")
+    parser.add_argument("--port", type=int, default=8798)
+    parser.add_argument("--seed-only", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed_only:
+        return seed(args.jobs)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "API_CACHE_ENABLED": "false",
+            "DATABASE_URL": os.getenv("DATABASE_URL", f"sqlite:///{tmp}/bench.db"),
+        }
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_api_concurrency", "--seed-only",
+                        "--jobs", str(args.jobs)], cwd=ROOT, env=env, check=True)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+             "--workers", "1", "--log-level", "warning"],
+            cwd=ROOT, env=env,
+        )
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            wait_until_ready(base_url)
+            print(json.dumps(asyncio.run(load(base_url, args.concurrency, args.duration))))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Cost of building one /api/jobs page body: Job entities validated through
+JobSchema and dumped by Pydantic (the previous path) versus the lean column
+projection dumped with orjson.
+
+Seeds a temporary SQLite database with synthetic jobs, checks that both
+paths produce identical JSON, then times each for a few page sizes.
+
+    python -m benchmarks.bench_listing_serialization --jobs 5000 --repeat 200
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(repeat: int) -> None:
+    from typing import List
+
+    from pydantic import TypeAdapter
+
+    from app.db.crud import LISTING_COLUMNS, search_jobs_page
+    from app.db.database import SessionLocal
+    from app.schemas.job import JobSchema, dump_job_rows
+
+    adapter = TypeAdapter(List[JobSchema])
+
+    def pydantic_page(db, limit):
+        jobs, _ = search_jobs_page(db, limit=limit)
+        return adapter.dump_json(adapter.validate_python(jobs, from_attributes=True))
+
+    def lean_page(db, limit):
+        rows, _ = search_jobs_page(db, limit=limit, columns=LISTING_COLUMNS)
+        return dump_job_rows(rows)
+
+    db = SessionLocal()
+    try:
+        for limit in (20, 100, 500):
+            if json.loads(pydantic_page(db, limit)) != json.loads(lean_page(db, limit)):
+                raise SystemExit(f"Bodies differ at limit={limit}")
+            report = {"limit": limit}
+            for name, build in (("pydantic", pydantic_page), ("lean_orjson", lean_page)):
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    build(db, limit)
+                    db.expunge_all()
+                report[f"{name}_ms"] = round((time.perf_counter() - started) / repeat * 1000, 3)
+            report["speedup"] = round(report["pydantic_ms"] / report["lean_orjson_ms"], 2)
+            print(json.dumps(report))
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--run", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        return run(args.repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp}/bench.db"}
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_api_concurrency", "--seed-only",
+                        "--jobs", str(args.jobs)], cwd=ROOT, env=env, check=True)
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_listing_serialization", "--run",
+                        "--repeat", str(args.repeat)], cwd=ROOT, env=env, check=True)
+
+
+if __name__ == "__main__":
+    main()
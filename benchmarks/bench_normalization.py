@@ -0,0 +1,101 @@
+"""
+Normalization throughput: per-job normalization versus the columnar stage.
+
+For each source, a synthetic feed (benchmarks.synthetic) is normalized into
+the rows bulk_upsert_jobs stores, twice:
+
+    per_job   normalize_job, then JobCreate validation and job_to_row for
+              every job (what the pipeline and save_jobs_to_db did before)
+    columnar  normalize_columns(...).rows() over batches of SAVE_BATCH_SIZE
+
+Prints jobs per second for each as JSON, and checks both produce the same
+rows, for the feed and for a few malformed jobs (EDGE_CASES) that both
+paths must drop.
+
+    python -m benchmarks.bench_normalization --jobs 100000
+"""
+import argparse
+import copy
+import json
+import time
+from typing import Any, Dict, List
+
+from app.db.crud import SAVE_BATCH_SIZE, job_to_row
+from app.scrapers.registry import get_sources
+from app.schemas.job import JobCreate
+from app.services.aggregator import _normalize_datetime_to_utc
+from app.services.columnar import naive_utc, np
+from benchmarks.synthetic import PAYLOADS
+
+# The raw field each source takes its publication date from.
+DATE_FIELDS = {"remotive": "publication_date", "remoteok": "epoch", "arbeitnow": "created_at"}
+# (field, value) edits applied to a copy of a feed job; "date" is the source's date field.
+EDGE_CASES = [("date", "not a date"), ("tags", ["a", 2])]
+
+
+def edge_cases(source, raw_jobs: List[Any]) -> List[Any]:
+    jobs = []
+    for name, value in EDGE_CASES:
+        job = copy.deepcopy(raw_jobs[-1])
+        job[DATE_FIELDS[source.name] if name == "date" else name] = value
+        jobs.append(job)
+    return jobs
+
+
+def per_job(source, raw_jobs: List[Any], search_query: str) -> List[Dict[str, Any]]:
+    rows = []
+    for raw_job in raw_jobs:
+        try:
+            job = source.normalize_job(raw_job, search_query)
+        except Exception:  # dropped, as normalize_batch does
+            continue
+        if not job:
+            continue
+        job["publication_date"] = _normalize_datetime_to_utc(job.get("publication_date"))
+        try:
+            rows.append(job_to_row(JobCreate(**job)))
+        except ValueError:
+            continue
+    return rows
+
+
+def columnar(source, raw_jobs: List[Any], search_query: str) -> List[Dict[str, Any]]:
+    rows = []
+    for start in range(0, len(raw_jobs), SAVE_BATCH_SIZE):
+        rows.extend(source.normalize_columns(raw_jobs[start:start + SAVE_BATCH_SIZE], search_query).rows())
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100_000, help="jobs per synthetic feed")
+    parser.add_argument("--query", default="", help="search query the full-feed boards filter by")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {"jobs": args.jobs, "numpy": np is not None, "sources": {}}
+    for source in get_sources():
+        if source.name not in PAYLOADS:
+            continue
+        raw_jobs = source.extract_jobs(PAYLOADS[source.name](args.jobs))
+        result: Dict[str, Any] = {}
+        outputs = {}
+        for name, normalize in (("per_job", per_job), ("columnar", columnar)):
+            started = time.perf_counter()
+            outputs[name] = normalize(source, raw_jobs, args.query)
+            elapsed = time.perf_counter() - started
+            result[name] = {"seconds": round(elapsed, 3), "jobs_per_second": round(len(raw_jobs) / elapsed)}
+        for row in outputs["per_job"]:
+            row["publication_date"] = naive_utc(row["publication_date"])
+        result["rows"] = len(outputs["columnar"])
+        result["identical"] = outputs["per_job"] == outputs["columnar"]
+        edge_jobs = edge_cases(source, raw_jobs)
+        result["edge_cases_identical"] = per_job(source, edge_jobs, args.query) == columnar(
+            source, edge_jobs, args.query
+        )
+        result["speedup"] = round(result["per_job"]["seconds"] / result["columnar"]["seconds"], 2)
+        report["sources"][source.name] = result
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
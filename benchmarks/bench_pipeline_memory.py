@@ -0,0 +1,109 @@
+"""
+Peak memory of a large scrape: the streaming pipeline versus the buffered
+fetch -> merge -> save path.
+
+Serves a synthetic Remotive-shaped feed of N jobs from a local stub that
+generates the body on the fly, then runs each path in its own subprocess
+against a fresh SQLite database and reports its peak RSS and wall time.
+
+    python -m benchmarks.bench_pipeline_memory --jobs 500000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def serve(port: int, jobs: int) -> None:
+    class FeedHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.0"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b'{"job-count": %d, "jobs": [' % jobs)
+            for i in range(jobs):
+                job = {
+                    "id": i + 1,
+                    "title": f"Python developer {i}",
+                    "company_name": f"Company {i % 997}",
+                    "candidate_required_location": "Worldwide",
+                    "url": f"https://remotive.example/jobs/{i}",
+                    "publication_date": "2026-01-01T00:00:00",
+                    "tags": ["python", "django", "postgres"],
+                    "salary": "$90k - $120k",
+                    "job_type": "full_time",
+                    "description": "x" * 512,
+                }
+                self.wfile.write((b"," if i else b"") + json.dumps(job).encode())
+            self.wfile.write(b"]}")
+
+        def log_message(self, *args):
+            pass
+
+    ThreadingHTTPServer(("127.0.0.1", port), FeedHandler).serve_forever()
+
+
+def run(mode: str) -> None:
+    from app.db.database import engine
+    from app.db.models import Base
+    from app.scrapers.fetch_remotive_jobs import RemotiveSource
+
+    Base.metadata.create_all(engine)
+    started = time.perf_counter()
+    if mode == "streaming":
+        from app.services.pipeline import run_pipeline_sync
+        results = run_pipeline_sync("python", sources=[RemotiveSource()])
+        stored = sum(r.counts.get("inserted", 0) for r in results.values())
+    else:
+        from app.services.aggregator import merge_results, save_jobs_to_db
+        from app.services.fetch_engine import fetch_all_sources_sync
+        results = fetch_all_sources_sync("python", sources=[RemotiveSource()], total_timeout=3600)
+        stored = save_jobs_to_db(merge_results(results))["inserted"]
+    elapsed = time.perf_counter() - started
+    # ru_maxrss is in KiB on Linux.
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"mode": mode, "stored": stored, "seconds": round(elapsed, 2), "peak_rss_mb": round(peak_mb, 1)}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=500_000)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--run", choices=["streaming", "buffered"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        return serve(args.port, args.jobs)
+    if args.run:
+        return run(args.run)
+
+    server = subprocess.Popen([sys.executable, "-m", "benchmarks.bench_pipeline_memory",
+                               "--serve", "--port", str(args.port), "--jobs", str(args.jobs)], cwd=ROOT)
+    time.sleep(1)
+    try:
+        for mode in ("streaming", "buffered"):
+            with tempfile.TemporaryDirectory() as tmp:
+                env = {
+                    **os.environ,
+                    "DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+                    "REMOTIVE_API_URL": f"http://127.0.0.1:{args.port}/",
+                    "API_CACHE_REDIS": "false",
+                }
+                subprocess.run([sys.executable, "-m", "benchmarks.bench_pipeline_memory", "--run", mode],
+                               cwd=ROOT, env=env, check=True)
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Cold-start cost of the API and worker processes.
+
+    import          `python -X importtime -c "import <module>"` for the API
+                    (app.main) and the worker / beat entry point
+                    (app.celery_config): total import time, the packages
+                    that take the longest, and whether heavy dependencies
+                    that one side should not need were loaded
+    first_request   a fresh uvicorn process, timed from spawn to its first
+                    answered GET /api/health, and then its first GET /api/jobs
+
+Every measurement is a new process, repeated --repeat times; medians are
+reported in the benchmarks.run_suite format, so benchmarks.compare can
+check two reports against each other.
+
+    python -m benchmarks.bench_startup --output startup.json
+    python -m benchmarks.compare before.json startup.json --threshold 0.2 --min-delta-ms 20
+
+Without DATABASE_URL a temporary SQLite database is used; a given one has
+jobs added to it, so never point it at real data. The default REDIS_URL
+points at a closed port, so the timings do not include Redis.
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from benchmarks.run_suite import ROOT, git_commit
+from benchmarks.synthetic import job_rows
+
+MODULES = ["app.main", "app.celery_config"]
+# Packages the API should not import until a request needs them.
+HEAVY = ["celery", "kombu", "httpx", "numpy", "app.tasks.scrape_tasks", "app.scrapers.base"]
+
+
+def summary(timings: List[float]) -> Dict[str, Any]:
+    timings = sorted(timings)
+    return {
+        "runs": len(timings),
+        "median_s": round(statistics.median(timings), 6),
+        "min_s": round(timings[0], 6),
+        "max_s": round(timings[-1], 6),
+    }
+
+
+def package(module: str) -> str:
+    # app.* is split one level further (app.db, app.services, ...).
+    parts = module.split(".")
+    return ".".join(parts[:2]) if parts[0] == "app" else parts[0]
+
+
+def import_profile(module: str, env: Dict[str, str]) -> Dict[str, Any]:
+    """
+    One `-X importtime` run: the module's cumulative import time and the
+    self time summed per top-level package.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+    ).stderr
+    packages: Counter = Counter()
+    loaded = set()
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        loaded.add(name)
+        packages[package(name)] += int(self_us)
+        if name == module:
+            total = int(cumulative_us)
+    return {"seconds": total / 1e6, "packages": packages, "loaded": loaded}
+
+
+def bench_imports(modules: List[str], repeat: int, top: int, env: Dict[str, str]) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for module in modules:
+        profiles = [import_profile(module, env) for _ in range(repeat)]
+        packages: Counter = Counter()
+        for profile in profiles:
+            packages.update(profile["packages"])
+        results[module] = {
+            **summary([profile["seconds"] for profile in profiles]),
+            "top_packages_ms": {
+                name: round(us / repeat / 1000, 1) for name, us in packages.most_common(top)
+            },
+            "heavy_loaded": [name for name in HEAVY if name in profiles[0]["loaded"]],
+        }
+    return results
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url: str, deadline: float) -> None:
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                response.read()
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{url} did not answer in time")
+            time.sleep(0.005)
+
+
+def bench_first_request(repeat: int, timeout: float, env: Dict[str, str]) -> Dict[str, Any]:
+    health, jobs = [], []
+    for _ in range(repeat):
+        port = free_port()
+        base = f"http://127.0.0.1:{port}"
+        started = time.monotonic()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=ROOT, env=env,
+        )
+        try:
+            wait_for(f"{base}/api/health", started + timeout)
+            health.append(time.monotonic() - started)
+            wait_for(f"{base}/api/jobs?limit=20", started + timeout)
+            jobs.append(time.monotonic() - started)
+        finally:
+            server.terminate()
+            server.wait()
+    return {"health": summary(health), "jobs": summary(jobs)}
+
+
+def seed(jobs: int) -> None:
+    from app.db.crud import SAVE_BATCH_SIZE, bulk_upsert_jobs
+    from app.db.database import SessionLocal, engine
+    from app.db.models import Base
+
+    Base.metadata.create_all(engine)
+    rows = job_rows(jobs)
+    session = SessionLocal()
+    try:
+        for start in range(0, len(rows), SAVE_BATCH_SIZE):
+            bulk_upsert_jobs(session, rows[start:start + SAVE_BATCH_SIZE])
+        session.commit()
+    finally:
+        session.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", action="append", help=f"repeatable; default: {' '.join(MODULES)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12, help="packages listed per module")
+    parser.add_argument("--db-jobs", type=int, default=1000, help="jobs seeded into the temporary database")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds a server may take to answer")
+    parser.add_argument("--skip-server", action="store_true", help="only measure imports")
+    parser.add_argument("--output", help="write the report here instead of stdout")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    env = {
+        **os.environ,
+        "PYTHONPATH": ROOT,
+        "DATABASE_URL": os.getenv("DATABASE_URL") or f"sqlite:///{tmp.name}/startup.db",
+        "REDIS_URL": os.getenv("REDIS_URL") or "redis://127.0.0.1:1/0",
+        "ENVIRONMENT": "benchmark",
+    }
+    report: Dict[str, Any] = {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {key: value for key, value in vars(args).items() if key != "output"},
+        },
+        "results": {},
+    }
+    try:
+        report["results"]["import"] = bench_imports(args.module or MODULES, args.repeat, args.top, env)
+        if not args.skip_server:
+            os.environ.update(env)
+            seed(args.db_jobs)
+            report["results"]["first_request"] = bench_first_request(args.repeat, args.timeout, env)
+    finally:
+        tmp.cleanup()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
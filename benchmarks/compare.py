@@ -0,0 +1,64 @@
+"""
+Compares two benchmarks.run_suite reports and flags regressions.
+
+A benchmark regresses when its median time grows by more than --threshold
+(relative) and by more than --min-delta-ms (absolute, to ignore noise on
+very fast operations). Exits with status 1 if any benchmark regressed.
+
+    python -m benchmarks.compare before.json after.json --threshold 0.1
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Tuple
+
+
+def compare(
+    base: Dict[str, Any], head: Dict[str, Any], threshold: float, min_delta: float
+) -> Tuple[List[List[str]], int]:
+    rows = []
+    regressions = 0
+    for database, results in head["results"].items():
+        baseline = base["results"].get(database, {})
+        for name, result in results.items():
+            before = baseline.get(name)
+            if before is None:
+                rows.append([database, name, "-", f"{result['median_s'] * 1000:.2f}", "new", ""])
+                continue
+            old, new = before["median_s"], result["median_s"]
+            change = (new - old) / old if old else 0.0
+            regressed = change > threshold and (new - old) > min_delta
+            regressions += regressed
+            rows.append([
+                database, name, f"{old * 1000:.2f}", f"{new * 1000:.2f}", f"{change:+.1%}",
+                "REGRESSION" if regressed else "",
+            ])
+    return rows, regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base", help="report of the reference commit")
+    parser.add_argument("head", help="report to check")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown allowed")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="absolute slowdown ignored")
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    rows, regressions = compare(base, head, args.threshold, args.min_delta_ms / 1000)
+    print(f"{base['meta']['commit']} -> {head['meta']['commit']}")
+    header = ["database", "benchmark", "base ms", "head ms", "change", ""]
+    widths = [max(len(str(row[i])) for row in rows + [header]) for i in range(len(header))]
+    for row in [header] + rows:
+        print("  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip())
+    if regressions:
+        print(f"\n{regressions} benchmark(s) regressed by more than {args.threshold:.0%}.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
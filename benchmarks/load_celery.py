@@ -0,0 +1,225 @@
+"""
+Load test of the Celery worker profiles: many concurrent scrapes, optionally
+while a long cleanup runs, against a local Redis and the stub upstream.
+
+    split    a thread-pool worker on the scrape queue and a prefork worker on
+             the maintenance queue (the start.sh profiles)
+    single   one prefork worker consuming every queue
+
+For each profile it seeds expired jobs for the cleanup to delete, starts the
+workers, enqueues --scrapes scrapes of distinct queries (through
+start_scrape, as POST /api/scrape does) and reports their time to
+completion, percentiles and throughput, and how long the cleanup took.
+
+    python -m benchmarks.load_celery --redis-url redis://localhost:6379/15 --cleanup
+    python -m benchmarks.load_celery --profile single --profile split --latency 0.2 --output load.json
+
+The given Redis database is flushed and the given database emptied, so
+never point this at real data. Without --database-url a temporary SQLite
+database is used; prefer PostgreSQL for realistic write concurrency.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from benchmarks.run_suite import ROOT, git_commit
+from benchmarks.stub_upstream import start_stub, stub_env
+from benchmarks.synthetic import EPOCH, TITLES, job_rows
+
+# Seeded jobs are this old; the stub's jobs are no older than a year before EPOCH.
+EXPIRED_BEFORE = EPOCH - timedelta(days=400)
+
+PROFILES = {
+    "split": [
+        ["--hostname", "scrape@load", "--queues", "scrape,celery", "--pool", "threads"],
+        ["--hostname", "maintenance@load", "--queues", "maintenance,celery", "--pool", "prefork",
+         "--concurrency", "1"],
+    ],
+    "single": [
+        ["--hostname", "single@load", "--queues", "scrape,maintenance,celery", "--pool", "prefork"],
+    ],
+}
+
+
+def queries(count: int) -> List[str]:
+    words = sorted({word.lower() for title in TITLES for word in title.split() if word.isalpha()})
+    return [f"{words[i % len(words)]} {i // len(words) + 1}" for i in range(count)]
+
+
+def seed_expired_jobs(count: int) -> None:
+    from app.db.crud import SAVE_BATCH_SIZE, bulk_upsert_jobs
+    from app.db.database import SessionLocal, engine
+    from app.db.models import Base
+    from app.db.search import install_search_index
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        install_search_index(connection)
+    rows = job_rows(count, source="expired")
+    for index, row in enumerate(rows):
+        row["publication_date"] = EXPIRED_BEFORE - timedelta(minutes=index)
+    session = SessionLocal()
+    try:
+        for start in range(0, len(rows), SAVE_BATCH_SIZE):
+            bulk_upsert_jobs(session, rows[start:start + SAVE_BATCH_SIZE])
+        session.commit()
+    finally:
+        session.close()
+
+
+def start_workers(profile: str, args: argparse.Namespace, env: Dict[str, str]) -> List[subprocess.Popen]:
+    workers = []
+    for options in PROFILES[profile]:
+        if "--concurrency" not in options:
+            concurrency = args.scrape_concurrency if "threads" in options else args.prefork_concurrency
+            options = options + ["--concurrency", str(concurrency)]
+        workers.append(subprocess.Popen(
+            [sys.executable, "-m", "celery", "-A", "app.celery_config.celery_app", "worker",
+             "--loglevel", "WARNING", "--prefetch-multiplier", "1", *options],
+            cwd=ROOT, env=env,
+        ))
+    return workers
+
+
+def wait_for_workers(celery_app, count: int, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if len(celery_app.control.ping(timeout=1)) >= count:
+            return
+    raise RuntimeError("workers did not start")
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_profile(profile: str, args: argparse.Namespace, env: Dict[str, str]) -> Dict[str, Any]:
+    import redis
+
+    from app.celery_config import celery_app
+    from app.tasks.cleanup_tasks import delete_old_jobs
+    from app.celery_client import start_scrape
+
+    redis.Redis.from_url(args.redis_url).flushdb()
+    seed_expired_jobs(args.expired_jobs if args.cleanup else 0)
+    workers = start_workers(profile, args, env)
+    try:
+        wait_for_workers(celery_app, len(workers))
+        started = time.monotonic()
+        cleanup = None
+        if args.cleanup:
+            cutoff = EXPIRED_BEFORE + timedelta(days=1)
+            retention_days = (datetime.now(timezone.utc) - cutoff).days
+            cleanup = delete_old_jobs.delay(retention_days)
+            # Let the cleanup take its slot first, as the midnight run would.
+            time.sleep(0.5)
+
+        enqueued = {}
+        for query in queries(args.scrapes):
+            task_id, _ = start_scrape(query, incremental=False)
+            enqueued[task_id] = time.monotonic()
+
+        latencies = []
+        cleanup_seconds = None
+        pending = dict(enqueued)
+        deadline = time.monotonic() + args.timeout
+        while (pending or (cleanup is not None and cleanup_seconds is None)) and time.monotonic() < deadline:
+            for task_id in list(pending):
+                if celery_app.AsyncResult(task_id).ready():
+                    latencies.append(time.monotonic() - pending.pop(task_id))
+            if cleanup is not None and cleanup_seconds is None and cleanup.ready():
+                cleanup_seconds = time.monotonic() - started
+            time.sleep(0.05)
+        elapsed = time.monotonic() - started
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait()
+
+    result: Dict[str, Any] = {
+        "scrapes": args.scrapes,
+        "completed": len(latencies),
+        "timed_out": len(pending),
+        "seconds": round(elapsed, 3),
+        "scrapes_per_second": round(len(latencies) / elapsed, 3) if elapsed else None,
+        "cleanup_seconds": round(cleanup_seconds, 3) if cleanup_seconds is not None else None,
+    }
+    if latencies:
+        result.update({
+            "latency_p50_s": round(statistics.median(latencies), 3),
+            "latency_p95_s": round(percentile(latencies, 0.95), 3),
+            "latency_max_s": round(max(latencies), 3),
+        })
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15", help="flushed before each profile")
+    parser.add_argument("--database-url", help="emptied before each profile; default: temporary SQLite")
+    parser.add_argument("--profile", action="append", choices=sorted(PROFILES), help="repeatable; default: all")
+    parser.add_argument("--scrapes", type=int, default=40, help="scrapes enqueued at once")
+    parser.add_argument("--cleanup", action="store_true", help="run delete_old_jobs alongside the scrapes")
+    parser.add_argument("--expired-jobs", type=int, default=20_000, help="jobs seeded for the cleanup")
+    parser.add_argument("--cleanup-batch-sleep", type=float, default=0.2, help="CLEANUP_BATCH_SLEEP of the run")
+    parser.add_argument("--scrape-concurrency", type=int, default=32, help="threads of the scrape worker")
+    parser.add_argument("--prefork-concurrency", type=int, default=4, help="processes of the single worker")
+    parser.add_argument("--feed-jobs", type=int, default=500, help="jobs in each stub feed")
+    parser.add_argument("--latency", type=float, default=0.1, help="stub response delay in seconds")
+    parser.add_argument("--timeout", type=float, default=600, help="give up on scrapes after this long")
+    parser.add_argument("--port", type=int, default=8791)
+    parser.add_argument("--output", help="write the report here instead of stdout")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    env = {
+        **os.environ,
+        **stub_env(args.port),
+        "REDIS_URL": args.redis_url,
+        "DATABASE_URL": args.database_url or f"sqlite:///{tmp.name}/load.db",
+        "ENVIRONMENT": "benchmark",
+        "SCRAPER_RATE_LIMIT_PER_MINUTE": "0",
+        "CLEANUP_BATCH_SIZE": "500",
+        "CLEANUP_BATCH_SLEEP": str(args.cleanup_batch_sleep),
+        "CELERY_METRICS_PORT": "0",
+    }
+    # This process enqueues and seeds through the app, so it needs the same settings.
+    os.environ.update(env)
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "params": {key: value for key, value in vars(args).items() if key not in ("output", "database_url")},
+        },
+        "results": {},
+    }
+    server = start_stub(args.port, args.feed_jobs, args.latency)
+    try:
+        for profile in args.profile or sorted(PROFILES):
+            report["results"][profile] = run_profile(profile, args, env)
+    finally:
+        server.terminate()
+        server.wait()
+        tmp.cleanup()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Reproducible benchmark suite for the scrape, store and query hot paths.
+
+Runs, against the local stub upstream (benchmarks.stub_upstream) and a
+fixture database seeded with synthetic jobs:
+
+    aggregate_jobs         fetch all sources, normalize, merge
+    save_jobs_to_db        insert new jobs, then re-save them unchanged
+    search_jobs            listing, filtered and text searches
+    api_jobs               GET /api/jobs in-process, response cache off
+
+and writes a JSON report (timings per benchmark, plus the commit and
+parameters) that benchmarks.compare checks against another run.
+
+    python -m benchmarks.run_suite --output before.json
+    python -m benchmarks.run_suite --database-url postgresql://bench@localhost/bench --output pg.json
+
+Without --database-url a temporary SQLite database is used. Pass it more
+than once to benchmark several databases in one report. A given database is
+emptied and recreated, so never point this at real data.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from benchmarks.stub_upstream import start_stub, stub_env
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SEARCHES = {
+    "listing": {},
+    "filtered": {"location": "berlin", "job_type": "full time"},
+    "tags": {"tags": "python"},
+    "text": {"query": "python developer"},
+}
+
+
+def measure(func: Callable[[], Any], repeat: int, warmup: int = 1) -> Dict[str, Any]:
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {
+        "runs": repeat,
+        "median_s": round(statistics.median(timings), 6),
+        "min_s": round(timings[0], 6),
+        "max_s": round(timings[-1], 6),
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    The benchmarks themselves, in a process whose environment already points
+    at the stub and the fixture database.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.db.crud import SAVE_BATCH_SIZE, bulk_upsert_jobs, search_jobs
+    from app.db.database import SessionLocal, engine
+    from app.db.models import Base
+    from app.db.search import install_search_index
+    from app.main import app
+    from app.services.aggregator import aggregate_jobs, save_jobs_to_db
+    from benchmarks.synthetic import job_rows
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        install_search_index(connection)
+
+    seed_rows = job_rows(args.db_jobs, source="seed")
+    session = SessionLocal()
+    try:
+        for start in range(0, len(seed_rows), SAVE_BATCH_SIZE):
+            bulk_upsert_jobs(session, seed_rows[start:start + SAVE_BATCH_SIZE])
+        session.commit()
+    finally:
+        session.close()
+
+    results: Dict[str, Any] = {}
+    results["aggregate_jobs"] = measure(lambda: aggregate_jobs("developer"), args.repeat)
+    results["aggregate_jobs"]["jobs"] = len(aggregate_jobs("developer"))
+
+    session = SessionLocal()
+    try:
+        for name, params in SEARCHES.items():
+            results[f"search_jobs.{name}"] = measure(lambda: search_jobs(session, limit=50, **params), args.repeat)
+    finally:
+        session.close()
+
+    client = TestClient(app)
+    for name, params in SEARCHES.items():
+        results[f"api_jobs.{name}"] = measure(
+            lambda: client.get("/api/jobs", params={**params, "limit": 50}).raise_for_status(), args.repeat
+        )
+
+    # Each insert run stores jobs no earlier run has seen.
+    batches = iter(range(args.repeat + 1))
+
+    def insert_batch() -> None:
+        offset = next(batches) * args.save_jobs
+        for start in range(0, args.save_jobs, SAVE_BATCH_SIZE):
+            save_jobs_to_db(job_rows(min(SAVE_BATCH_SIZE, args.save_jobs - start), offset=offset + start, source="save"))
+
+    results["save_jobs_to_db.insert"] = measure(insert_batch, args.repeat)
+    unchanged = job_rows(min(SAVE_BATCH_SIZE, args.save_jobs), source="save")
+    results["save_jobs_to_db.unchanged"] = measure(lambda: save_jobs_to_db(unchanged), args.repeat)
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feed-jobs", type=int, default=2000, help="jobs in each stub feed")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub response delay in seconds")
+    parser.add_argument("--replay", help="directory of recorded <source>.json responses")
+    parser.add_argument("--db-jobs", type=int, default=20_000, help="jobs seeded for the search benchmarks")
+    parser.add_argument("--save-jobs", type=int, default=2000, help="jobs saved per save_jobs_to_db run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", action="append", help="fixture database (repeatable)")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--output", help="write the report here instead of stdout")
+    parser.add_argument("--run", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run(args)))
+        return
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {key: value for key, value in vars(args).items()
+                       if key not in ("run", "output", "database_url", "port")},
+        },
+        "results": {},
+    }
+    child_args: List[str] = [
+        "--run", "--db-jobs", str(args.db_jobs), "--save-jobs", str(args.save_jobs), "--repeat", str(args.repeat),
+    ]
+    server = start_stub(args.port, args.feed_jobs, args.latency, args.replay)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for database_url in args.database_url or [f"sqlite:///{tmp}/bench.db"]:
+                env = {
+                    **os.environ,
+                    **stub_env(args.port),
+                    "DATABASE_URL": database_url,
+                    "ENVIRONMENT": "benchmark",
+                    "API_CACHE_ENABLED": "false",
+                    "SCRAPER_RATE_LIMIT_PER_MINUTE": "0",
+                    "SCRAPE_SOURCE_TIMEOUT": "300",
+                    "SCRAPE_TOTAL_TIMEOUT": "300",
+                }
+                output = subprocess.run([sys.executable, "-m", "benchmarks.run_suite", *child_args],
+                                        cwd=ROOT, env=env, check=True, capture_output=True, text=True).stdout
+                dialect = database_url.split(":", 1)[0].split("+", 1)[0]
+                report["results"][dialect] = json.loads(output.strip().splitlines()[-1])
+    finally:
+        server.terminate()
+        server.wait()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Local stand-in for the Remotive, RemoteOK and Arbeitnow APIs.
+
+Serves /remotive, /remoteok and /arbeitnow with synthetic payloads of a
+configurable size (see benchmarks.synthetic), or replays recorded responses
+from a directory holding remotive.json, remoteok.json and arbeitnow.json.
+Every response is delayed by --latency seconds before its headers are sent.
+Query parameters are ignored, like the full-feed boards do.
+
+    python -m benchmarks.stub_upstream --port 8790 --jobs 5000 --latency 0.2
+
+Point the scrapers at it with the environment from stub_env().
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+import httpx
+
+from benchmarks.synthetic import PAYLOADS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_bodies(jobs: int, replay_dir: Optional[str] = None) -> Dict[str, bytes]:
+    bodies = {}
+    for name, build in PAYLOADS.items():
+        recorded = os.path.join(replay_dir, f"{name}.json") if replay_dir else None
+        if recorded and os.path.exists(recorded):
+            with open(recorded, "rb") as f:
+                bodies[name] = f.read()
+        else:
+            bodies[name] = json.dumps(build(jobs)).encode()
+    return bodies
+
+
+def serve(port: int, jobs: int, latency: float, replay_dir: Optional[str] = None) -> None:
+    bodies = load_bodies(jobs, replay_dir)
+
+    class UpstreamHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = bodies.get(self.path.split("?", 1)[0].strip("/"))
+            if latency:
+                time.sleep(latency)
+            if body is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    ThreadingHTTPServer(("127.0.0.1", port), UpstreamHandler).serve_forever()
+
+
+def stub_env(port: int) -> Dict[str, str]:
+    base_url = f"http://127.0.0.1:{port}"
+    return {
+        "REMOTIVE_API_URL": f"{base_url}/remotive",
+        "REMOTEOK_API_URL": f"{base_url}/remoteok",
+        "ARBEITNOW_API_URL": f"{base_url}/arbeitnow",
+    }
+
+
+def start_stub(port: int, jobs: int, latency: float = 0.0, replay_dir: Optional[str] = None) -> subprocess.Popen:
+    """
+    Starts the stub in a subprocess and waits until it answers.
+    """
+    command = [sys.executable, "-m", "benchmarks.stub_upstream", "--port", str(port),
+               "--jobs", str(jobs), "--latency", str(latency)]
+    if replay_dir:
+        command += ["--replay", replay_dir]
+    server = subprocess.Popen(command, cwd=ROOT)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/ready", timeout=1)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("stub upstream did not start")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--jobs", type=int, default=1000, help="synthetic jobs per feed")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each response")
+    parser.add_argument("--replay", help="directory of recorded <source>.json responses")
+    args = parser.parse_args()
+    serve(args.port, args.jobs, args.latency, args.replay)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Deterministic synthetic data shaped like the upstream feeds and like stored
+jobs, shared by the stub upstream and the benchmarks.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+TITLES = [
+    "Python Developer", "Senior Python Developer", "Data Engineer", "Frontend Engineer (React)",
+    "DevOps Engineer", "Backend Developer (Go)", "Product Manager", "Machine Learning Engineer",
+]
+LOCATIONS = ["Berlin, Germany", "Remote", "London", "New York", "Worldwide", "Munich", "Amsterdam"]
+TAGS = ["python", "django", "aws", "react", "sql", "go", "kubernetes", "postgres", "typescript"]
+JOB_TYPES = ["full_time", "contract", "part_time", "freelance"]
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _fields(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        "title": f"{rng.choice(TITLES)} {i}",
+        "company": f"Company {i % 997}",
+        "location": rng.choice(LOCATIONS),
+        "tags": rng.sample(TAGS, 3),
+        "salary": f"${rng.randint(50, 150)}k - ${rng.randint(150, 220)}k",
+        "job_type": rng.choice(JOB_TYPES),
+        "published": EPOCH - timedelta(minutes=i),
+        "description": "<p>" + "Lorem ipsum dolor sit amet. " * rng.randint(10, 40) + "</p>",
+    }
+
+
+def remotive_payload(jobs: int, seed: int = 1) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    items = []
+    for i in range(jobs):
+        job = _fields(rng, i)
+        items.append({
+            "id": i + 1,
+            "url": f"https://remotive.example/jobs/{i}",
+            "title": job["title"],
+            "company_name": job["company"],
+            "category": "Software Development",
+            "tags": job["tags"],
+            "job_type": job["job_type"],
+            "publication_date": job["published"].strftime("%Y-%m-%dT%H:%M:%S"),
+            "candidate_required_location": job["location"],
+            "salary": job["salary"],
+            "description": job["description"],
+        })
+    return {"job-count": jobs, "jobs": items}
+
+
+def remoteok_payload(jobs: int, seed: int = 2) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    items: List[Dict[str, Any]] = [{"last_updated": int(EPOCH.timestamp()), "legal": "Synthetic feed."}]
+    for i in range(jobs):
+        job = _fields(rng, i)
+        items.append({
+            "id": str(i + 1),
+            "epoch": int(job["published"].timestamp()),
+            "position": job["title"],
+            "company": job["company"],
+            "location": job["location"],
+            "tags": job["tags"],
+            "salary": job["salary"],
+            "type": job["job_type"],
+            "url": f"https://remoteok.example/jobs/{i}",
+            "description": job["description"],
+        })
+    return items
+
+
+def arbeitnow_payload(jobs: int, seed: int = 3) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    items = []
+    for i in range(jobs):
+        job = _fields(rng, i)
+        items.append({
+            "slug": f"job-{i}",
+            "company_name": job["company"],
+            "company": job["company"],
+            "title": job["title"],
+            "description": job["description"],
+            "remote": job["location"] == "Remote",
+            "url": f"https://arbeitnow.example/jobs/{i}",
+            "tags": job["tags"],
+            "job_types": [job["job_type"]],
+            "location": job["location"],
+            "created_at": int(job["published"].timestamp()),
+        })
+    return {"data": items, "links": {}, "meta": {}}
+
+
+PAYLOADS: Dict[str, Callable[[int], Any]] = {
+    "remotive": remotive_payload,
+    "remoteok": remoteok_payload,
+    "arbeitnow": arbeitnow_payload,
+}
+
+
+def job_rows(jobs: int, seed: int = 42, offset: int = 0, source: str = "bench") -> List[Dict[str, Any]]:
+    """
+    Normalized jobs, as the scrapers hand them to save_jobs_to_db.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(offset, offset + jobs):
+        job = _fields(rng, i)
+        rows.append({
+            "title": job["title"],
+            "company_name": job["company"],
+            "location": job["location"],
+            "url": f"https://example.com/jobs/{source}/{i}",
+            "source": source,
+            "job_id": f"{source}-{i}",
+            "publication_date": job["published"],
+            "tags": ", ".join(job["tags"]),
+            "salary": job["salary"],
+            "job_type": job["job_type"],
+        })
+    return rows
@@ -0,0 +1,51 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.db.database import DATABASE_URL, engine
+from app.db.models import Base
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# For --autogenerate. The search structures (app.db.search) are not part of
+# the metadata and are installed by the migrations themselves.
+target_metadata = Base.metadata
+
+
+def _include_object(obj, name, type_, reflected, compare_to):
+    # jobs_fts and its shadow tables (SQLite), search_vector and its index (PostgreSQL).
+    return not (name or "").startswith("jobs_fts") and name not in ("search_vector", "ix_jobs_search_vector")
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        include_object=_include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=_include_object,
+            # SQLite cannot ALTER most of a table; batch mode recreates it.
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,46 @@
+"""initial schema
+
+The jobs table as the app's original create_all built it, before any of
+the columns, tables and search structures 0002 adds. Databases created by
+that create_all already have it: mark them with `alembic stamp 0001`, then
+`alembic upgrade head` brings them up to date like any other.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=512), nullable=False),
+        sa.Column("company_name", sa.Text(), nullable=True),
+        sa.Column("location", sa.Text(), nullable=True),
+        sa.Column("url", sa.Text(), nullable=False),
+        sa.Column("source", sa.String(length=512), nullable=False),
+        sa.Column("job_id", sa.String(length=512), nullable=False),
+        sa.Column("publication_date", sa.DateTime(), nullable=False),
+        sa.Column("tags", sa.Text(), nullable=True),
+        sa.Column("salary", sa.Text(), nullable=True),
+        sa.Column("job_type", sa.String(length=512), nullable=True),
+        sa.Column("scraped_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("url"),
+    )
+    op.create_index("ix_jobs_id", "jobs", ["id"])
+    op.create_index("ix_jobs_job_id", "jobs", ["job_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("jobs")
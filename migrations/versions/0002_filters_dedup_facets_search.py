@@ -0,0 +1,246 @@
+"""filter columns, near-duplicates, facets, saved searches and full-text search
+
+Everything the app added to the original jobs table: the derived filter
+columns and canonical_id, a unique job_id, the job_tags, job_lsh_bands,
+job_facets, saved_searches, saved_search_matches and source_states tables,
+and the full-text search structures. Existing jobs are backfilled: their
+filter columns, tags and LSH band keys as bulk_upsert_jobs would have
+written them, then the search index and the facet counts. They all start
+out canonical; near-duplicates are grouped as new jobs arrive.
+
+Jobs sharing a job_id (possible before it was unique) are reduced to the
+first one stored.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.db.crud import DERIVED_COLUMNS, with_filter_columns
+from app.db.facets import rebuild_facets
+from app.db.search import install_search_index
+from app.services.dedup import band_keys, company_key, job_features
+from app.services.normalization import split_tags
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Jobs read, updated and fanned out into job_tags / job_lsh_bands per round trip.
+BACKFILL_BATCH_SIZE = 1000
+
+jobs = sa.table(
+    "jobs",
+    sa.column("id"),
+    sa.column("title"),
+    sa.column("company_name"),
+    sa.column("location"),
+    sa.column("tags"),
+    sa.column("salary"),
+    sa.column("job_type"),
+    *(sa.column(name) for name in DERIVED_COLUMNS),
+)
+job_tags = sa.table("job_tags", sa.column("job_pk"), sa.column("tag"))
+job_lsh_bands = sa.table("job_lsh_bands", sa.column("band_key"), sa.column("job_pk"))
+
+
+def _backfill(bind) -> None:
+    """
+    Fills the derived columns, job_tags and job_lsh_bands of every job, in
+    primary-key batches.
+    """
+    set_derived = jobs.update().where(jobs.c.id == sa.bindparam("pk"))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(
+                jobs.c.id, jobs.c.title, jobs.c.company_name, jobs.c.location,
+                jobs.c.tags, jobs.c.salary, jobs.c.job_type,
+            )
+            .where(jobs.c.id > last_id)
+            .order_by(jobs.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).mappings().all()
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+        updates, tag_rows, band_rows = [], [], []
+        for row in rows:
+            derived = with_filter_columns(dict(row))
+            updates.append({"pk": row["id"], **{name: derived[name] for name in DERIVED_COLUMNS}})
+            # As _replace_tags and _replace_lsh_bands store them.
+            tags = dict.fromkeys(tag[:128] for tag in split_tags(row["tags"]))
+            tag_rows.extend({"job_pk": row["id"], "tag": tag} for tag in tags)
+            company = company_key(row["company_name"])
+            keys = band_keys(job_features(row["title"], row["company_name"], row["location"]), company)
+            band_rows.extend({"band_key": key, "job_pk": row["id"]} for key in set(keys))
+        bind.execute(set_derived, updates)
+        if tag_rows:
+            bind.execute(job_tags.insert(), tag_rows)
+        if band_rows:
+            bind.execute(job_lsh_bands.insert(), band_rows)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.add_column(sa.Column("location_normalized", sa.String(length=512), nullable=True))
+        batch_op.add_column(sa.Column("job_type_normalized", sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column("salary_min", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("salary_max", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("canonical_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_jobs_canonical_id_jobs", "jobs", ["canonical_id"], ["id"], ondelete="SET NULL"
+        )
+
+    op.execute(
+        "DELETE FROM jobs WHERE EXISTS "
+        "(SELECT 1 FROM jobs AS first WHERE first.job_id = jobs.job_id AND first.id < jobs.id)"
+    )
+    op.drop_index("ix_jobs_job_id", table_name="jobs")
+    op.create_index("ix_jobs_job_id", "jobs", ["job_id"], unique=True)
+
+    op.create_table(
+        "job_tags",
+        sa.Column("job_pk", sa.Integer(), nullable=False),
+        sa.Column("tag", sa.String(length=128), nullable=False),
+        sa.ForeignKeyConstraint(["job_pk"], ["jobs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("job_pk", "tag"),
+    )
+    op.create_table(
+        "job_lsh_bands",
+        sa.Column("band_key", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("job_pk", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["job_pk"], ["jobs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("band_key", "job_pk"),
+    )
+    op.create_table(
+        "job_facets",
+        sa.Column("facet", sa.String(length=16), nullable=False),
+        sa.Column("value", sa.String(length=512), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("facet", "value"),
+    )
+    op.create_table(
+        "saved_searches",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=True),
+        sa.Column("query", sa.String(length=512), nullable=True),
+        sa.Column("location", sa.String(length=512), nullable=True),
+        sa.Column("job_type", sa.String(length=64), nullable=True),
+        sa.Column("tags", sa.String(length=512), nullable=True),
+        sa.Column("min_salary", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True,
+    )
+    op.create_table(
+        "saved_search_matches",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("saved_search_id", sa.Integer(), nullable=False),
+        sa.Column("job_pk", sa.Integer(), nullable=False),
+        sa.Column("matched_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["saved_search_id"], ["saved_searches.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["job_pk"], ["jobs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_saved_search_matches_search_id", "saved_search_matches", ["saved_search_id", "id"])
+    op.create_index(
+        "ix_saved_search_matches_search_job", "saved_search_matches", ["saved_search_id", "job_pk"], unique=True
+    )
+    op.create_index("ix_saved_search_matches_job_pk", "saved_search_matches", ["job_pk"])
+    op.create_table(
+        "source_states",
+        sa.Column("source", sa.String(length=64), nullable=False),
+        sa.Column("query", sa.String(length=512), nullable=False),
+        sa.Column("etag", sa.Text(), nullable=True),
+        sa.Column("last_modified", sa.String(length=64), nullable=True),
+        sa.Column("watermark", sa.DateTime(), nullable=True),
+        sa.Column("watermark_job_id", sa.String(length=512), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("source", "query"),
+    )
+
+    _backfill(bind)
+
+    # Built after the backfill rather than maintained row by row during it.
+    op.create_index("ix_jobs_publication_date_id", "jobs", ["publication_date", "id"])
+    op.create_index(
+        "ix_jobs_location_normalized_publication_date", "jobs", ["location_normalized", "publication_date"]
+    )
+    op.create_index(
+        "ix_jobs_job_type_normalized_publication_date", "jobs", ["job_type_normalized", "publication_date"]
+    )
+    op.create_index(
+        "ix_jobs_job_type_normalized_location_normalized", "jobs", ["job_type_normalized", "location_normalized"]
+    )
+    op.create_index("ix_jobs_salary_max", "jobs", ["salary_max"])
+    op.create_index(
+        "ix_jobs_canonical_id",
+        "jobs",
+        ["canonical_id"],
+        postgresql_where=sa.text("canonical_id IS NOT NULL"),
+        sqlite_where=sa.text("canonical_id IS NOT NULL"),
+    )
+    op.create_index("ix_job_tags_tag_job_pk", "job_tags", ["tag", "job_pk"])
+    op.create_index("ix_job_lsh_bands_job_pk", "job_lsh_bands", ["job_pk"])
+    op.create_index("ix_job_facets_facet_count", "job_facets", ["facet", "count"])
+
+    # The tsvector column is computed for existing rows as it is added; the
+    # new FTS5 table is rebuilt from the jobs table.
+    install_search_index(bind)
+
+    db = Session(bind=bind)
+    try:
+        rebuild_facets(db)
+        db.flush()
+    finally:
+        db.close()
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for trigger in ("jobs_fts_ai", "jobs_fts_ad", "jobs_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS jobs_fts")
+    elif bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_jobs_search_vector")
+        op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector")
+
+    for table in (
+        "source_states",
+        "saved_search_matches",
+        "saved_searches",
+        "job_facets",
+        "job_lsh_bands",
+        "job_tags",
+    ):
+        op.drop_table(table)
+
+    for index in (
+        "ix_jobs_canonical_id",
+        "ix_jobs_salary_max",
+        "ix_jobs_job_type_normalized_location_normalized",
+        "ix_jobs_job_type_normalized_publication_date",
+        "ix_jobs_location_normalized_publication_date",
+        "ix_jobs_publication_date_id",
+    ):
+        op.drop_index(index, table_name="jobs")
+    op.drop_index("ix_jobs_job_id", table_name="jobs")
+    op.create_index("ix_jobs_job_id", "jobs", ["job_id"])
+
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_constraint("fk_jobs_canonical_id_jobs", type_="foreignkey")
+        batch_op.drop_column("canonical_id")
+        batch_op.drop_column("salary_max")
+        batch_op.drop_column("salary_min")
+        batch_op.drop_column("job_type_normalized")
+        batch_op.drop_column("location_normalized")
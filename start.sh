@@ -1,7 +1,80 @@
 #!/bin/bash
+#
+# Container entry point. The first argument (or SERVICE_ROLE) picks what
+# this container runs:
+#
+#   api                  uvicorn only (the default)
+#   worker-scrape        Celery worker for the "scrape" queue: a thread pool,
+#                        since scrapes mostly wait on the network
+#   worker-maintenance   Celery worker for the "maintenance" queue: a small
+#                        prefork pool for long database jobs (cleanup, recounts)
+#   beat                 the Celery beat scheduler
+#   migrate              apply pending schema migrations, then exit
+#   all                  both workers in the background plus uvicorn, for
+#                        single-container deployments such as Cloud Run
+#
+# The api and all roles apply migrations first when RUN_MIGRATIONS=true;
+# otherwise run the migrate role once per deploy before starting them.
+set -e
 
-# Start Celery worker in background
-celery -A app.celery_config.celery_app worker --loglevel=INFO &
+ROLE="${1:-${SERVICE_ROLE:-api}}"
 
-# Start dummy web server (required for Cloud Run)
-uvicorn app.main:app --host 0.0.0.0 --port $PORT 
\ No newline at end of file
+SCRAPE_CONCURRENCY="${SCRAPE_WORKER_CONCURRENCY:-32}"
+MAINTENANCE_CONCURRENCY="${MAINTENANCE_WORKER_CONCURRENCY:-2}"
+
+migrate() {
+    alembic upgrade head
+}
+
+maybe_migrate() {
+    if [ "${RUN_MIGRATIONS:-false}" = "true" ]; then
+        migrate
+    fi
+}
+
+worker_scrape() {
+    # Every thread can hold a database connection while it stores a batch,
+    # so the per-process SQLAlchemy pool gets one connection per thread
+    # (plus DB_MAX_OVERFLOW). Size the database's max_connections for it.
+    export DB_POOL_SIZE="${DB_POOL_SIZE:-$SCRAPE_CONCURRENCY}"
+    exec celery -A app.celery_config.celery_app worker --loglevel=INFO \
+        --hostname "scrape@%h" --queues scrape,celery \
+        --pool threads --concurrency "$SCRAPE_CONCURRENCY" --prefetch-multiplier 1
+}
+
+worker_maintenance() {
+    exec celery -A app.celery_config.celery_app worker --loglevel=INFO \
+        --hostname "maintenance@%h" --queues maintenance,celery \
+        --pool prefork --concurrency "$MAINTENANCE_CONCURRENCY" --prefetch-multiplier 1
+}
+
+case "$ROLE" in
+    api)
+        maybe_migrate
+        exec uvicorn app.main:app --host 0.0.0.0 --port "${PORT:-8000}"
+        ;;
+    worker-scrape)
+        worker_scrape
+        ;;
+    worker-maintenance)
+        worker_maintenance
+        ;;
+    beat)
+        exec celery -A app.celery_config.celery_app beat --loglevel=INFO
+        ;;
+    migrate)
+        migrate
+        ;;
+    all)
+        maybe_migrate
+        # Only the scrape worker serves CELERY_METRICS_PORT; the maintenance
+        # worker's samples reach it through PROMETHEUS_MULTIPROC_DIR, if set.
+        worker_scrape &
+        CELERY_METRICS_PORT=0 worker_maintenance &
+        exec uvicorn app.main:app --host 0.0.0.0 --port "${PORT:-8000}"
+        ;;
+    *)
+        echo "Unknown role '$ROLE' (expected api, worker-scrape, worker-maintenance, beat, migrate or all)" >&2
+        exit 1
+        ;;
+esac
@@ -0,0 +1,83 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+# The app reads its settings at import time: point it at a throwaway SQLite
+# database and an unreachable Redis before anything imports it.
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp.name}/test.db"
+os.environ["REDIS_URL"] = "redis://127.0.0.1:1/0"
+os.environ["API_CACHE_ENABLED"] = "false"
+os.environ["HOT_INDEX_ENABLED"] = "false"
+
+# Titles whose words the database stems: "developers" finds "Developer",
+# "runs" finds "Running".
+JOBS = [
+    ("Senior Developer", "Acme", "Berlin, Germany", "python, django", "Full Time", "€60,000 - €80,000"),
+    ("Running coach", "Fit Co", "Remote", "sports", "Part Time", None),
+    ("Software Engineer", "Initech", "London", "python, aws", "Full Time", "$120k - $150k"),
+    ("Data Engineering Lead", "Globex", "Remote, Worldwide", "sql, python", "Contract", None),
+    ("Developer Advocate", "Hooli", "New York", "devrel", "Full Time", "$90,000"),
+    ("Product Manager", "Umbrella", "Berlin", "product", "Full Time", None),
+]
+
+# GET /api/jobs parameters checked against the database in the tests.
+SEARCHES = [
+    {"query": "developers"},
+    {"query": "developer"},
+    {"query": "runs"},
+    {"query": "engineering"},
+    {"query": "engineer python"},
+    {"query": "full_time"},
+    {"query": "developers", "location": "berlin"},
+    {"tags": "python"},
+    {"location": "remote"},
+    {"job_type": "full time", "min_salary": 80000},
+    {},
+]
+
+
+def job_row(index: int, title: str, company: str, location: str, tags: str, job_type: str, salary) -> dict:
+    return {
+        "title": title,
+        "company_name": company,
+        "location": location,
+        "url": f"https://example.com/jobs/{index}",
+        "source": "test",
+        "job_id": f"test-{index}",
+        "publication_date": datetime(2026, 1, 1) + timedelta(hours=index),
+        "tags": tags,
+        "salary": salary,
+        "job_type": job_type,
+    }
+
+
+@pytest.fixture
+def db():
+    from app.db.database import SessionLocal, engine
+    from app.db.models import Base
+
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
+        with engine.begin() as connection:
+            connection.exec_driver_sql("DROP TABLE IF EXISTS jobs_fts")
+
+
+@pytest.fixture
+def stored_jobs(db):
+    """
+    JOBS stored as a scrape would store them; (pk, row) of each.
+    """
+    from app.db.crud import bulk_upsert_jobs
+
+    new_jobs = []
+    bulk_upsert_jobs(db, [job_row(i, *job) for i, job in enumerate(JOBS)], new_jobs=new_jobs)
+    db.commit()
+    return new_jobs
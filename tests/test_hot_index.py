@@ -0,0 +1,74 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import jobs as jobs_api
+from app.db.crud import LISTING_COLUMNS, search_jobs_page
+from app.main import app
+from app.schemas.job import JOB_LISTING_FIELDS
+from app.services.hot_index import HotIndex, hot_index
+
+from conftest import SEARCHES
+
+# Queries the stemmed terms cannot decide alone: FTS5 reads "full_time" as
+# the phrase "full time". These still go to the database.
+PHRASES = {"full_time"}
+
+
+@pytest.fixture
+def client(stored_jobs):
+    with TestClient(app) as client:
+        yield client
+    hot_index.ready = False
+
+
+@pytest.mark.parametrize("params", SEARCHES)
+def test_listing_is_the_same_with_the_hot_index(client, monkeypatch, params):
+    params = {**params, "sort": "date"}
+    hot_index.ready = False
+    from_database = client.get("/api/jobs", params=params)
+    hot_index.reload()
+    assert hot_index.ready
+    if params.get("query") not in PHRASES:
+        async def no_database(*args, **kwargs):
+            raise AssertionError("served from the database")
+        monkeypatch.setattr(jobs_api, "search_jobs_page_async", no_database)
+    from_index = client.get("/api/jobs", params=params)
+
+    assert from_index.status_code == from_database.status_code == 200
+    assert from_index.json() == from_database.json()
+    if params.get("query") in ("developers", "runs"):
+        assert from_database.json()
+
+
+@pytest.mark.parametrize("params", SEARCHES)
+def test_hot_index_answers_searches_like_the_database(db, stored_jobs, params):
+    index = HotIndex()
+    index.reload()
+    page = index.search(**params, sort="date", limit=20)
+    if params.get("query") in PHRASES:
+        assert page is None
+        return
+    expected, _ = search_jobs_page(db, **params, sort="date", limit=20, columns=LISTING_COLUMNS)
+    assert page is not None
+    assert page[0] == [tuple(row) for row in expected]
+
+
+def test_new_jobs_are_searchable_after_a_refresh(db, stored_jobs):
+    from app.db.crud import bulk_upsert_jobs
+    from conftest import job_row
+
+    index = HotIndex()
+    index.reload()
+    assert index.search(query="apprentices", sort="date") == ([], None)
+    bulk_upsert_jobs(db, [job_row(100, "Plumbing apprentice", "Pipes", "Leeds", "", "Full Time", None)])
+    db.commit()
+
+    assert index.refresh() == 1
+    rows, _ = index.search(query="apprentices", sort="date")
+    assert [row[JOB_LISTING_FIELDS.index("title")] for row in rows] == ["Plumbing apprentice"]
+
+
+def test_relevance_ranked_searches_go_to_the_database(stored_jobs):
+    index = HotIndex()
+    index.reload()
+    assert index.search(query="developers") is None
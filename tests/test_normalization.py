@@ -0,0 +1,34 @@
+import pytest
+
+from app.services.normalization import parse_salary_range
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("$100k - $120k", (100000, 120000)),
+    ("50.000 - 60.000 EUR", (50000, 60000)),
+    ("100,000", (100000, 100000)),
+    ("$1.5k", (1500, 1500)),
+    ("€60.000,50", (60000, 60000)),
+    ("USD 85,000 per annum", (85000, 85000)),
+    ("Senior role (2024) $100k", (100000, 100000)),
+    ("Since 2015, 80000 - 95000", (80000, 95000)),
+    ("2000 EUR", (2000, 2000)),
+])
+def test_annual_salaries(value, expected):
+    assert parse_salary_range(value) == expected
+
+
+@pytest.mark.parametrize("value", [
+    None,
+    "",
+    "Competitive",
+    "$45.50/hr",
+    "$45 - $60 per hour",
+    "€400 a day",
+    "5,000 monthly",
+    "$3k/mo",
+    "45.50",
+    "Founded in 2019",
+])
+def test_no_annual_salary(value):
+    assert parse_salary_range(value) == (None, None)
@@ -0,0 +1,31 @@
+import asyncio
+import time
+
+import httpx
+
+from app.scrapers.registry import get_source
+from app.services.pipeline import run_queries
+from benchmarks.synthetic import remotive_payload
+
+
+def failing_write(batch):
+    raise RuntimeError("database is gone")
+
+
+def test_a_failing_writer_fails_the_source_instead_of_hanging():
+    payload = remotive_payload(50)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=payload))
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await run_queries(
+                ["developer"], sources=[get_source("remotive")], write_batch=failing_write,
+                batch_size=5, queue_size=1, timeout=3, client=client,
+            )
+
+    started = time.monotonic()
+    results = asyncio.run(run())
+    assert time.monotonic() - started < 3
+    result = results["developer"]["remotive"]
+    assert result.failed
+    assert result.counts["failed"] == 50
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import pytest
+
+from app.db import saved_searches
+from app.db.crud import search_jobs_page
+from app.db.models import SavedSearch, SavedSearchMatch
+
+from conftest import SEARCHES
+
+
+@pytest.fixture(autouse=True)
+def fresh_matcher(monkeypatch):
+    # Every test recreates the tables, so search ids (the matcher's version) repeat.
+    monkeypatch.setattr(saved_searches, "_matcher", None)
+
+
+def test_saved_searches_match_what_the_listing_finds(db, stored_jobs):
+    searches = [SavedSearch(**params, created_at=datetime(2026, 1, 1)) for params in SEARCHES]
+    db.add_all(searches)
+    db.commit()
+
+    saved_searches.record_matches(db, stored_jobs)
+    db.commit()
+
+    for search, params in zip(searches, SEARCHES):
+        matched = {match.job_pk for match in db.query(SavedSearchMatch).filter_by(saved_search_id=search.id)}
+        listed, _ = search_jobs_page(db, **params, limit=100)
+        assert matched == {job.id for job in listed}, params
+
+
+def test_stemmed_terms_match(db, stored_jobs):
+    search = SavedSearch(query="developers", created_at=datetime(2026, 1, 1))
+    db.add(search)
+    db.commit()
+
+    assert saved_searches.record_matches(db, stored_jobs) == 2
+
+
+def test_query_searches_are_anchored_on_their_stemmed_terms(db, stored_jobs, monkeypatch):
+    db.add_all([SavedSearch(query="developers", created_at=datetime(2026, 1, 1)),
+                SavedSearch(query="engineer python", created_at=datetime(2026, 1, 1))])
+    db.commit()
+    confirmed = []
+    monkeypatch.setattr(saved_searches, "_confirm_query", lambda *args: confirmed.append(args) or set())
+
+    assert saved_searches.record_matches(db, stored_jobs) == 4
+    assert not saved_searches.get_matcher(db)._unanchored
+    assert not confirmed